@@ -0,0 +1,40 @@
+"""Compare the HTML parsers behind the article extractors.
+
+Runs each publisher's extractor on the sample pages stored with the tests,
+once per parser, and prints the mean time per page:
+
+    python benchmarks/extractors.py [--repeat N]
+"""
+
+import argparse
+import pathlib
+import timeit
+
+from biofeed.feeds import extractors
+
+PAGES = pathlib.Path(__file__).resolve().parent.parent / "tests" / "feeds" / "fixtures" / "pages"
+
+# Sample page -> what is extracted from it, given the parser to use
+CASES = {
+    "plos_abstract.html": lambda page, parser: extractors.clean_plos_content(page.decode()),
+    "oxford_abstract.html": lambda page, parser: extractors.html_text(page.decode(), parser),
+    "nature_article.html": lambda page, parser: extractors.class_text(
+        page, "c-article-section__content", parser=parser
+    ),
+}
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--repeat", type=int, default=500, help="Extractions per page and parser")
+    args = parser.parse_args()
+
+    print(f"{'page':<24}{'parser':<8}{'us/page':>10}{'chars':>8}")
+    for name, extract in CASES.items():
+        page = (PAGES / name).read_bytes()
+        for html_parser in extractors.PARSERS:
+            text = extract(page, html_parser)
+            seconds = timeit.timeit(lambda: extract(page, html_parser), number=args.repeat)
+            print(f"{name:<24}{html_parser:<8}{seconds / args.repeat * 1e6:>10.1f}{len(text or ''):>8}")
+
+if __name__ == "__main__":
+    main()
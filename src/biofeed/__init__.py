@@ -6,15 +6,36 @@ various bioinformatics feeds (RSS, Atom, JSON).
 
 __version__ = "0.1.0"
 
-# Core components
-from biofeed.core.controller import ReaderController
-from biofeed.feeds.article import Article
-from biofeed.feeds.feed_source import FeedSource
-from biofeed.feeds.registry import FeedRegistry
+import importlib
+
+# Core components, imported on first access (PEP 562) so that importing
+# biofeed, e.g. for its CLI, doesn't load every submodule and dependency
+_LAZY_ATTRIBUTES = {
+  "ReaderController": "biofeed.core.controller",
+  "Article": "biofeed.feeds.article",
+  "FeedSource": "biofeed.feeds.feed_source",
+  "FeedRegistry": "biofeed.feeds.registry",
+}
+
+__all__ = [
+  "ReaderController", "Article", "FeedSource", "FeedRegistry",
+  "get_controller", "get_available_feeds", "get_articles", "add_feed",
+]
+
+def __getattr__(name):
+  if name in _LAZY_ATTRIBUTES:
+      value = getattr(importlib.import_module(_LAZY_ATTRIBUTES[name]), name)
+      globals()[name] = value  # Later lookups skip __getattr__
+      return value
+  raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+def __dir__():
+  return sorted(set(globals()) | set(_LAZY_ATTRIBUTES))
 
 # Convenience functions
 def get_controller():
   """Get a pre-configured ReaderController instance."""
+  from biofeed.core.controller import ReaderController
   return ReaderController()
 
 def get_available_feeds():
@@ -1,14 +1,23 @@
 """Command-line interface for BioFeed."""
-import re 
-from urllib.request import urlopen
 import argparse
+import signal
+import subprocess
 import sys
-from typing import List, Optional
+import time
+from itertools import chain, islice
+from typing import List, Optional, Tuple
 
-from biofeed.core.controller import ReaderController
+from biofeed.core.controller import ReaderController, RefreshResult
 from biofeed.core.formatter import ArticleFormatter
-from bs4 import BeautifulSoup
-from urllib.error import URLError, HTTPError
+from biofeed.feeds.article import Article
+from biofeed.feeds.feed_source import FeedSource
+from biofeed.utils.dates import format_timestamp, parse_timestamp
+from biofeed.utils.config import DEFAULT_CONFIG
+
+# Heavy dependencies (bs4, requests, fastfeedparser) are imported only by the
+# commands that need them, so startup stays fast for everything else
+
+PREFETCH_COUNT = DEFAULT_CONFIG.get("prefetch", {}).get("count", 5)
 
 def handle_feeds_command(controller: ReaderController, args: argparse.Namespace) -> None:
     """Handle the 'feeds' command."""
@@ -40,6 +49,24 @@ def handle_feeds_command(controller: ReaderController, args: argparse.Namespace)
 
 def handle_list_command(controller: ReaderController, formatter: ArticleFormatter, args: argparse.Namespace) -> None:
     """Handle the 'list' command."""
+    if args.new:
+        handle_new_listing(controller, formatter, args)
+        return
+    
+    if args.archive or args.since or args.until:
+        handle_archive_listing(controller, formatter, args)
+        return
+    
+    if args.all or args.category:
+        # Timeline merged across all feeds, or the feeds of one category
+        scope = f"category '{args.category}'" if args.category else "all feeds"
+        print(f"\nArticles from {scope}:")
+        articles = controller.get_timeline(count=args.count, category=args.category)
+        print(formatter.format_article_list(articles, include_summary=args.summary, show_feed=True))
+        if args.prefetch:
+            start_background_prefetch(controller, articles[:args.prefetch])
+        return
+    
     # Select feed if specified
     if args.feed:
         controller.select_feed(args.feed)
@@ -52,6 +79,198 @@ def handle_list_command(controller: ReaderController, formatter: ArticleFormatte
     print(f"\nArticles from {active_feed.name}:")
     articles = controller.get_recent_articles(count=args.count)
     print(formatter.format_article_list(articles, include_summary=args.summary))
+    if args.prefetch:
+        start_background_prefetch(controller, articles[:args.prefetch])
+
+def handle_archive_listing(controller: ReaderController, formatter: ArticleFormatter, args: argparse.Namespace) -> None:
+    """List archived articles, including those that have left their feed."""
+    bounds = {}
+    for name in ("since", "until"):
+        value = getattr(args, name)
+        if value:
+            bounds[name] = parse_timestamp(value)
+            if bounds[name] is None:
+                print(f"Error: Invalid date for --{name}: {value}")
+                return
+    
+    listing_scope = resolve_scope(controller, args)
+    if listing_scope is None:
+        return
+    scope, feed_ids = listing_scope
+    
+    print(f"\nArchived articles from {scope}:")
+    articles = controller.get_archived_articles(count=args.count, feed_ids=feed_ids, **bounds)
+    print(formatter.format_article_list(articles, include_summary=args.summary, show_feed=True))
+
+def handle_new_listing(controller: ReaderController, formatter: ArticleFormatter, args: argparse.Namespace) -> None:
+    """List the articles that arrived since the last 'list --new', marking them read."""
+    listing_scope = resolve_scope(controller, args)
+    if listing_scope is None:
+        return
+    scope, feed_ids = listing_scope
+    
+    articles = controller.get_new_articles(count=args.count, feed_ids=feed_ids)
+    if not articles:
+        print(f"\nNo new articles from {scope}")
+        return
+    print(f"\nNew articles from {scope}:")
+    print(formatter.format_article_list(articles, include_summary=args.summary, show_feed=True))
+    if args.prefetch:
+        start_background_prefetch(controller, articles[:args.prefetch])
+
+def resolve_scope(controller: ReaderController, args: argparse.Namespace) -> Optional[Tuple[str, Optional[List[str]]]]:
+    """Get the description and feed IDs (None for all) of a listing's --all/--category/--feed scope.
+    
+    Prints why and returns None if the feed is not found or none is selected.
+    """
+    if args.all:
+        return "all feeds", None
+    if args.category:
+        in_category = {id(feed) for feed in controller.registry.get_feeds_by_category(args.category)}
+        feed_ids = [feed_id for feed_id, feed in controller.registry.feeds.items() if id(feed) in in_category]
+        return f"category '{args.category}'", feed_ids
+    
+    feed = controller.registry.feeds.get(args.feed) if args.feed else controller.get_active_feed()
+    if not feed:
+        print(f"Feed not found: {args.feed}" if args.feed else
+              "No feed selected. Use 'feeds --select FEED_ID' to select a feed.")
+        return None
+    return feed.name, [feed_id for feed_id, candidate in controller.registry.feeds.items() if candidate is feed]
+
+def handle_archive_command(controller: ReaderController, args: argparse.Namespace) -> None:
+    """Handle the 'archive' command."""
+    if args.compact:
+        dropped = controller.compact_archive(args.retention_days, args.max_per_feed)
+        print(f"Dropped {dropped} articles")
+    
+    stats = controller.archive.stats()
+    for feed_id, (count, oldest, newest) in sorted(stats.items()):
+        print(f"{feed_id}\t\t{count} articles ({format_timestamp(oldest)} to {format_timestamp(newest)})")
+    print(f"\n{sum(count for count, _, _ in stats.values())} archived articles")
+
+def article_source(controller: ReaderController, article: Article) -> Optional[FeedSource]:
+    """Get the feed an article was listed from, whose URL finds the publisher's extractor.
+    
+    Articles listed from the active feed carry no feed ID. An archived
+    article may belong to a feed that has since been removed (None).
+    """
+    return controller.registry.feeds.get(article.feed_id) if article.feed_id else controller.get_active_feed()
+
+def start_background_prefetch(controller: ReaderController, articles: List[Article]) -> None:
+    """Fetch the full texts of listed articles in a detached process.
+    
+    The listing returns immediately; by the time one of the articles is
+    read, its text is usually cached.
+    """
+    from biofeed.core.fulltext import fulltext_cache, full_text_extractor
+    
+    pending = []
+    for article in articles:
+        source = article_source(controller, article)
+        feed_url = source.url if source else None
+        if full_text_extractor(article.link, feed_url) and article.link not in fulltext_cache:
+            pending.append((article.link, feed_url))
+    if not pending:
+        return
+    subprocess.Popen(
+        [sys.executable, "-c", "import sys; from biofeed.cli.commands import main; sys.exit(main())",
+         "prefetch", *(link for link, _ in pending),
+         *chain.from_iterable(("--feed-url", feed_url or "") for _, feed_url in pending)],
+        stdin=subprocess.DEVNULL, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+        start_new_session=True
+    )
+
+def handle_prefetch_command(controller: ReaderController, args: argparse.Namespace) -> None:
+    """Handle the 'prefetch' command."""
+    from biofeed.core.fulltext import prefetch_full_texts
+    
+    if args.links:
+        # One feed URL for all links, or one per link
+        feed_urls = args.feed_url or [None]
+        if len(feed_urls) == 1:
+            feed_urls = feed_urls * len(args.links)
+        elif len(feed_urls) != len(args.links):
+            print("Error: Give --feed-url once, or once per link")
+            return
+        links = [(link, feed_url or None) for link, feed_url in zip(args.links, feed_urls)]
+    else:
+        active_feed = controller.get_active_feed()
+        if not active_feed:
+            print("No feed selected. Use 'feeds --select FEED_ID' to select a feed.")
+            return
+        links = [(article.link, active_feed.url) for article in controller.get_recent_articles(count=args.count)]
+    
+    fetched = prefetch_full_texts(links, max_workers=args.workers, max_per_host=args.per_host)
+    print(f"Prefetched {fetched} full texts")
+
+def handle_search_command(controller: ReaderController, formatter: ArticleFormatter, args: argparse.Namespace) -> None:
+    """Handle the 'search' command."""
+    articles = controller.search_articles(" ".join(args.query), count=args.count)
+    print(f"\nSearch results for '{' '.join(args.query)}':")
+    print(formatter.format_article_list(articles, include_summary=args.summary, show_feed=True))
+    if not articles:
+        print("Only refreshed or listed feeds are searched; run 'biofeed refresh' to index every feed.")
+
+def handle_refresh_command(controller: ReaderController, args: argparse.Namespace) -> None:
+    """Handle the 'refresh' command."""
+    try:
+        results = controller.refresh(
+            args.feed_ids or None,
+            force_refresh=args.force,
+            max_workers=args.workers,
+            max_per_host=args.per_host
+        )
+    except ValueError as e:
+        print(f"Error: {e}")
+        return
+    
+    for result in results:
+        if result.ok:
+            print(f"{result.feed_id}\t\t{result.article_count} articles, {result.new_count} new ({result.duration:.2f}s)")
+        else:
+            print(f"{result.feed_id}\t\tfailed: {result.error}")
+    
+    failed = sum(1 for result in results if not result.ok)
+    print(f"\nRefreshed {len(results) - failed} of {len(results)} feeds")
+    
+    if args.prefetch:
+        from biofeed.core.fulltext import prefetch_full_texts
+        
+        # The newest articles of each refreshed feed, fetched in parallel
+        links = [
+            (article.link, feed.url)
+            for feed in (controller.registry.get_feed(result.feed_id) for result in results if result.ok)
+            for article in islice(feed.iter_articles(), args.prefetch)
+        ]
+        fetched = prefetch_full_texts(links, max_workers=args.workers, max_per_host=args.per_host)
+        print(f"Prefetched {fetched} full texts")
+
+def handle_daemon_command(controller: ReaderController, args: argparse.Namespace) -> None:
+    """Handle the 'daemon' command."""
+    from biofeed.core.scheduler import RefreshScheduler
+    
+    def report(result: RefreshResult) -> None:
+        stamp = time.strftime("%Y-%m-%d %H:%M:%S")
+        if result.ok:
+            print(f"{stamp}  {result.feed_id}\t\t{result.article_count} articles, {result.new_count} new ({result.duration:.2f}s)", flush=True)
+        else:
+            print(f"{stamp}  {result.feed_id}\t\tfailed: {result.error}", flush=True)
+    
+    scheduler = RefreshScheduler(
+        controller,
+        max_concurrent=args.workers,
+        max_per_host=args.per_host,
+        lead_time=args.lead,
+        on_result=report
+    )
+    
+    # Finish the refreshes in flight, then exit
+    for signum in (signal.SIGINT, signal.SIGTERM):
+        signal.signal(signum, lambda *_: scheduler.stop())
+    
+    print(f"Keeping {len(controller.registry.feeds)} feeds warm (Ctrl+C to stop)", flush=True)
+    scheduler.run()
+    print("Stopped")
 
 def handle_read_command(controller: ReaderController, formatter: ArticleFormatter, args: argparse.Namespace) -> None:
     """Handle the 'read' command."""
@@ -60,47 +279,26 @@ def handle_read_command(controller: ReaderController, formatter: ArticleFormatte
       print("No feed selected. Use 'feeds --select FEED_ID' to select a feed.")
       return  
     
+    from biofeed.core.fulltext import full_text_extractor, get_full_text
+    
     try:
-      article = controller.get_article(args.article_id)
+      article = controller.get_article(args.article_id, offline=args.offline)
       
-      # Clean article content based on feed source
-      feed_name = controller.get_active_feed().name
-      
-      try:
-        if 'PLOS' in feed_name:
-          # Handle PLOS articles
-          p = re.compile('<p>(.*?)</p>')
-          m = p.match(article.content)
-          if m:  # Did we find a match? FIXME: Raise error if not
-            text = article.content[m.span()[1]:]
-            article.content = text.replace('\n', '')
-            
-        elif 'Oxford' in feed_name:
-          # Handle Oxford articles
-          soup = BeautifulSoup(article.content, "html.parser")
-          for data in soup(['style', 'script']):
-            data.decompose()
-          article.content = ' '.join(soup.stripped_strings)
-          
-          # Remove prefix if present
-          prefix_to_remove = "Abstract Motivation"
-          if article.content.startswith(prefix_to_remove):
-            article.content = article.content[len(prefix_to_remove):].lstrip()
-            
-        elif 'Nature' in feed_name:
-          # Handle Nature articles with error handling
+      # The feed content was already cleaned when the feed was parsed; some
+      # publishers' full texts come from the article page, which is only
+      # downloaded and extracted the first time it is read
+      # An archived article may belong to a feed that has since been removed
+      source = article_source(controller, article)
+      extract = full_text_extractor(article.link, source.url if source else None)
+      if extract is not None:
           try:
-            html = urlopen(article.link, timeout=10).read()
-            soup = BeautifulSoup(html, features="html.parser")
-            content_div = soup.find('div', attrs={'class':'c-article-section__content'})
-            if content_div:
-                article.content = content_div.text
-          except (URLError, HTTPError) as e:
-            print(f"Warning: Could not fetch full content from Nature: {e}")
-                  
-      except Exception as parse_error:
-        print(f"Warning: Error cleaning content: {parse_error}")
-        # Continue with original content if parsing fails
+            text = get_full_text(article.link, extract, offline=args.offline, refresh=args.refresh)
+            if text:
+                article.content = text
+            elif args.offline:
+                print("Warning: Full text not cached, showing the feed's summary")
+          except ValueError as e:
+            print(f"Warning: Could not fetch full content from {source.name if source else article.link}: {e}")
           
       print(formatter.format_article_detail(article))
         
@@ -125,9 +323,50 @@ def parse_args(args: Optional[List[str]] = None) -> argparse.Namespace:
     list_parser.add_argument("--count", type=int, default=10, help="Number of articles to list")
     list_parser.add_argument("--feed", help="Feed to list articles from")
     list_parser.add_argument("--summary", action="store_true", help="Include article summaries")
+    list_parser.add_argument("--all", action="store_true", help="Merge the newest articles from all feeds")
+    list_parser.add_argument("--category", help="Merge the newest articles from the feeds in a category")
+    list_parser.add_argument("--prefetch", type=int, nargs="?", const=PREFETCH_COUNT, default=0, metavar="N",
+                             help=f"Fetch the full texts of the first N articles in the background (default N: {PREFETCH_COUNT})")
+    list_parser.add_argument("--archive", action="store_true", help="List from the archive, including articles no longer in their feed")
+    list_parser.add_argument("--since", metavar="DATE", help="Only list archived articles published on or after DATE")
+    list_parser.add_argument("--until", metavar="DATE", help="Only list archived articles published before DATE")
+    list_parser.add_argument("--new", action="store_true", help="Only list articles that arrived since the last 'list --new', and mark them read")
     
     read_parser = subparsers.add_parser("read", help="Read an article")
     read_parser.add_argument("article_id", help="ID of the article to read")
+    read_parser.add_argument("--offline", action="store_true", help="Only use cached feeds and full texts")
+    read_parser.add_argument("--refresh", action="store_true", help="Check the publisher for a newer full text")
+    
+    search_parser = subparsers.add_parser("search", help="Search articles from all refreshed feeds")
+    search_parser.add_argument("query", nargs="+", help="Search terms, optionally prefixed with title:, author: or category:")
+    search_parser.add_argument("--count", type=int, default=10, help="Number of results to list")
+    search_parser.add_argument("--summary", action="store_true", help="Include article summaries")
+    
+    refresh_parser = subparsers.add_parser("refresh", help="Refresh feeds concurrently")
+    refresh_parser.add_argument("feed_ids", nargs="*", metavar="FEED_ID", help="Feeds to refresh (default: all)")
+    refresh_parser.add_argument("--force", action="store_true", help="Refresh even if the cached data is fresh")
+    refresh_parser.add_argument("--workers", type=int, help="Maximum number of feeds fetched at once")
+    refresh_parser.add_argument("--per-host", type=int, help="Maximum concurrent requests to one host")
+    refresh_parser.add_argument("--prefetch", type=int, nargs="?", const=PREFETCH_COUNT, default=0, metavar="N",
+                                help=f"Also fetch the full texts of each feed's first N articles (default N: {PREFETCH_COUNT})")
+    
+    prefetch_parser = subparsers.add_parser("prefetch", help="Fetch full texts ahead of reading")
+    prefetch_parser.add_argument("links", nargs="*", metavar="URL", help="Article pages to fetch (default: the newest articles of the active feed)")
+    prefetch_parser.add_argument("--feed-url", action="append", metavar="URL",
+                                 help="Feed of the given links, to find their publisher's extractor (once, or once per link)")
+    prefetch_parser.add_argument("--count", type=int, default=PREFETCH_COUNT, help="Number of newest articles to fetch")
+    prefetch_parser.add_argument("--workers", type=int, help="Maximum number of pages fetched at once")
+    prefetch_parser.add_argument("--per-host", type=int, help="Maximum concurrent requests to one host")
+    
+    daemon_parser = subparsers.add_parser("daemon", help="Keep all feeds cached by refreshing them before they expire")
+    daemon_parser.add_argument("--workers", type=int, help="Maximum number of feeds refreshed at once")
+    daemon_parser.add_argument("--per-host", type=int, help="Maximum concurrent requests to one host")
+    daemon_parser.add_argument("--lead", type=float, help="Seconds before expiry at which feeds are refreshed")
+    
+    archive_parser = subparsers.add_parser("archive", help="Show or compact the archive of past articles")
+    archive_parser.add_argument("--compact", action="store_true", help="Drop old articles and reclaim disk space")
+    archive_parser.add_argument("--retention-days", type=float, help="With --compact, drop articles published more than this many days ago")
+    archive_parser.add_argument("--max-per-feed", type=int, help="With --compact, keep only this many of the newest articles of each feed")
     
     return parser.parse_args(args)
 
@@ -143,6 +382,16 @@ def main(args: Optional[List[str]] = None) -> int:
         handle_list_command(controller, formatter, parsed_args)
     elif parsed_args.command == "read":
         handle_read_command(controller, formatter, parsed_args)
+    elif parsed_args.command == "search":
+        handle_search_command(controller, formatter, parsed_args)
+    elif parsed_args.command == "refresh":
+        handle_refresh_command(controller, parsed_args)
+    elif parsed_args.command == "prefetch":
+        handle_prefetch_command(controller, parsed_args)
+    elif parsed_args.command == "daemon":
+        handle_daemon_command(controller, parsed_args)
+    elif parsed_args.command == "archive":
+        handle_archive_command(controller, parsed_args)
     else:
         # Default action: list articles from active feed
         active_feed = controller.get_active_feed()
@@ -0,0 +1,307 @@
+"""Append-only archive of every article seen in the feeds."""
+
+from pathlib import Path
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple, Union
+import logging
+import pickle
+import sqlite3
+import threading
+import time
+
+from biofeed.feeds.article import Article
+from biofeed.utils.config import DEFAULT_CONFIG, get_config_dir
+
+logger = logging.getLogger(__name__)
+
+# Name of the archive database inside the config directory
+ARCHIVE_FILE = DEFAULT_CONFIG.get("archive_file", "archive.db")
+
+ARCHIVE_LIMITS = DEFAULT_CONFIG.get("archive_limits", {})
+
+class ArticleArchive:
+    """Persistent, append-only store of the articles of each feed.
+
+    Feeds only carry their latest entries; the archive keeps every article
+    once it has been seen, so it can still be listed, read and searched
+    after it has left its feed. Articles are identified by feed and stable
+    article ID: an article that is seen again is not stored twice, and the
+    first version seen is kept. Articles are ordered by publish time (or,
+    without one, the time they were first seen), and scans read them in
+    batches, so the archive can grow far beyond what fits in memory.
+    """
+
+    def __init__(self, path: Optional[Union[str, Path]] = None):
+        """Initialize the archive.
+
+        Args:
+            path: Path to the database file. If None, ARCHIVE_FILE inside
+                the configuration directory is used, resolved on first access.
+        """
+        self.path = Path(path) if path else None
+        self._conn: Optional[sqlite3.Connection] = None
+        self._lock = threading.RLock()
+
+    def _connect(self) -> sqlite3.Connection:
+        """Open the database on first use and make sure the schema exists."""
+        if self._conn is None:
+            path = self.path or get_config_dir() / ARCHIVE_FILE
+            conn = sqlite3.connect(str(path), timeout=10, check_same_thread=False)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS articles ("
+                "id INTEGER PRIMARY KEY, feed_id TEXT NOT NULL, article_id TEXT NOT NULL, "
+                "ts INTEGER NOT NULL, first_seen REAL NOT NULL, data BLOB NOT NULL, "
+                "UNIQUE (feed_id, article_id))"
+            )
+            conn.execute("CREATE INDEX IF NOT EXISTS articles_ts ON articles (ts, id)")
+            conn.execute(
+                "CREATE INDEX IF NOT EXISTS articles_feed_ts ON articles (feed_id, ts, id)"
+            )
+            conn.execute(
+                "CREATE INDEX IF NOT EXISTS articles_feed_seen ON articles (feed_id, first_seen)"
+            )
+            conn.commit()
+            self._conn = conn
+        return self._conn
+
+    def append(self, feed_id: str, articles: Iterable[Article]) -> int:
+        """Add the articles of a feed that are not archived yet.
+
+        Args:
+            feed_id: ID of the feed the articles belong to
+            articles: Articles as currently found in the feed
+
+        Returns:
+            Number of newly archived articles
+        """
+        now = time.time()
+
+        def rows() -> Iterator[Tuple[str, str, int, float, bytes]]:
+            for article in articles:
+                ts = article.published_ts if article.published_ts is not None else int(now)
+                yield (
+                    feed_id, article.id, ts, now,
+                    pickle.dumps(article, protocol=pickle.HIGHEST_PROTOCOL)
+                )
+
+        with self._lock:
+            conn = self._connect()
+            before = conn.total_changes
+            with conn:
+                conn.executemany(
+                    "INSERT OR IGNORE INTO articles (feed_id, article_id, ts, first_seen, data) "
+                    "VALUES (?, ?, ?, ?, ?)", rows()
+                )
+            added = conn.total_changes - before
+        if added:
+            logger.debug(f"Archived {added} new articles of {feed_id}")
+        return added
+
+    def get(self, feed_id: str, article_id: str) -> Optional[Article]:
+        """Get an archived article, or None if it was never seen."""
+        with self._lock:
+            row = self._connect().execute(
+                "SELECT data FROM articles WHERE feed_id = ? AND article_id = ?",
+                (feed_id, article_id)
+            ).fetchone()
+        return None if row is None else self._load(feed_id, row[0])
+
+    def scan(
+        self,
+        feed_ids: Optional[Iterable[str]] = None,
+        since: Optional[float] = None,
+        until: Optional[float] = None,
+        newest_first: bool = True,
+        batch_size: int = 500
+    ) -> Iterator[Article]:
+        """Iterate over archived articles in order of publish time.
+
+        Articles are read batch_size at a time, so stopping early (e.g. with
+        islice) never reads the rest of the archive.
+
+        Args:
+            feed_ids: Only return articles of these feeds (default: all)
+            since: Only return articles published at or after this POSIX time
+            until: Only return articles published before this POSIX time
+            newest_first: Order from newest to oldest, else oldest to newest
+            batch_size: Number of articles read per query
+
+        Returns:
+            Iterator of Article objects with feed_id set
+        """
+        where, params = [], []
+        if feed_ids is not None:
+            feed_ids = list(feed_ids)
+            if not feed_ids:
+                return
+            where.append(f"feed_id IN ({', '.join('?' * len(feed_ids))})")
+            params.extend(feed_ids)
+        if since is not None:
+            where.append("ts >= ?")
+            params.append(int(since))
+        if until is not None:
+            where.append("ts < ?")
+            params.append(int(until))
+
+        # Keyset pagination: each batch continues after the last row of the previous one
+        after = "(ts < ? OR (ts = ? AND id < ?))" if newest_first else "(ts > ? OR (ts = ? AND id > ?))"
+        order = "DESC" if newest_first else "ASC"
+        position: Optional[Tuple[int, int]] = None
+        while True:
+            conditions, values = list(where), list(params)
+            if position is not None:
+                conditions.append(after)
+                values.extend((position[0], position[0], position[1]))
+            sql = "SELECT id, ts, feed_id, data FROM articles"
+            if conditions:
+                sql += " WHERE " + " AND ".join(conditions)
+            sql += f" ORDER BY ts {order}, id {order} LIMIT ?"
+            values.append(batch_size)
+
+            with self._lock:
+                rows = self._connect().execute(sql, values).fetchall()
+            for _, _, feed_id, data in rows:
+                yield self._load(feed_id, data)
+            if len(rows) < batch_size:
+                return
+            position = (rows[-1][1], rows[-1][0])
+
+    def arrivals(
+        self,
+        feed_id: str,
+        after: Optional[float] = None,
+        until: Optional[float] = None,
+        batch_size: int = 500
+    ) -> Iterator[Article]:
+        """Iterate over the articles of a feed first seen in a time range, newest first.
+
+        Like scan, articles are read batch_size at a time, so the first
+        listing of a feed (which covers everything archived for it) never
+        holds all of them at once when the caller only keeps the newest.
+
+        Args:
+            feed_id: ID of the feed
+            after: Only return articles first seen after this POSIX time
+            until: Only return articles first seen at or before this POSIX time
+            batch_size: Number of articles read per query
+
+        Returns:
+            Iterator of Article objects with feed_id set
+        """
+        where, params = ["feed_id = ?"], [feed_id]
+        if after is not None:
+            where.append("first_seen > ?")
+            params.append(after)
+        if until is not None:
+            where.append("first_seen <= ?")
+            params.append(until)
+
+        position: Optional[Tuple[int, int]] = None
+        while True:
+            conditions, values = list(where), list(params)
+            if position is not None:
+                conditions.append("(ts < ? OR (ts = ? AND id < ?))")
+                values.extend((position[0], position[0], position[1]))
+            sql = (
+                f"SELECT id, ts, data FROM articles WHERE {' AND '.join(conditions)} "
+                f"ORDER BY ts DESC, id DESC LIMIT ?"
+            )
+            values.append(batch_size)
+
+            with self._lock:
+                rows = self._connect().execute(sql, values).fetchall()
+            for _, _, data in rows:
+                yield self._load(feed_id, data)
+            if len(rows) < batch_size:
+                return
+            position = (rows[-1][1], rows[-1][0])
+
+    def count(self, feed_id: Optional[str] = None) -> int:
+        """Number of archived articles, of one feed or of all feeds."""
+        with self._lock:
+            conn = self._connect()
+            if feed_id is None:
+                return conn.execute("SELECT COUNT(*) FROM articles").fetchone()[0]
+            return conn.execute(
+                "SELECT COUNT(*) FROM articles WHERE feed_id = ?", (feed_id,)
+            ).fetchone()[0]
+
+    def __len__(self) -> int:
+        return self.count()
+
+    def stats(self) -> Dict[str, Tuple[int, Optional[int], Optional[int]]]:
+        """Get the number of articles and oldest and newest publish time of each feed."""
+        with self._lock:
+            rows = self._connect().execute(
+                "SELECT feed_id, COUNT(*), MIN(ts), MAX(ts) FROM articles GROUP BY feed_id"
+            ).fetchall()
+        return {feed_id: (count, oldest, newest) for feed_id, count, oldest, newest in rows}
+
+    def compact(
+        self,
+        retention_days: Optional[float] = None,
+        max_per_feed: Optional[int] = None
+    ) -> Dict[str, List[str]]:
+        """Drop old articles and reclaim the space they used.
+
+        Args:
+            retention_days: Drop articles published more than this many days
+                ago (0 keeps them all; defaults to the configured value)
+            max_per_feed: Keep only this many of the newest articles of each
+                feed (0 keeps them all; defaults to the configured value)
+
+        Returns:
+            The IDs of the dropped articles, by feed
+        """
+        if retention_days is None:
+            retention_days = ARCHIVE_LIMITS.get("retention_days", 0)
+        if max_per_feed is None:
+            max_per_feed = ARCHIVE_LIMITS.get("max_per_feed", 0)
+
+        conditions, params = [], []
+        if retention_days:
+            conditions.append("ts < ?")
+            params.append(int(time.time() - retention_days * 86400))
+        if max_per_feed:
+            conditions.append(
+                "id IN (SELECT id FROM (SELECT id, ROW_NUMBER() OVER "
+                "(PARTITION BY feed_id ORDER BY ts DESC, id DESC) AS position "
+                "FROM articles) WHERE position > ?)"
+            )
+            params.append(max_per_feed)
+
+        removed: Dict[str, List[str]] = {}
+        with self._lock:
+            conn = self._connect()
+            if conditions:
+                where = " OR ".join(conditions)
+                with conn:
+                    for feed_id, article_id in conn.execute(
+                        f"SELECT feed_id, article_id FROM articles WHERE {where}", params
+                    ).fetchall():
+                        removed.setdefault(feed_id, []).append(article_id)
+                    conn.execute(f"DELETE FROM articles WHERE {where}", params)
+            # Rewrite the file without the free pages left by deleted rows
+            conn.execute("VACUUM")
+        logger.info(f"Compacted the archive: dropped {sum(map(len, removed.values()))} articles")
+        return removed
+
+    def remove_feed(self, feed_id: str) -> int:
+        """Drop all archived articles of a feed, returning how many there were."""
+        with self._lock:
+            conn = self._connect()
+            with conn:
+                return conn.execute("DELETE FROM articles WHERE feed_id = ?", (feed_id,)).rowcount
+
+    @staticmethod
+    def _load(feed_id: str, data: bytes) -> Article:
+        article = pickle.loads(data)
+        article.feed_id = feed_id
+        return article
+
+    def close(self) -> None:
+        """Close the database connection (it is reopened on next use)."""
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
@@ -0,0 +1,159 @@
+"""Asyncio-native controller for embedding BioFeed in an event loop."""
+
+from contextlib import closing
+from itertools import islice
+from typing import Dict, Iterable, List, Optional
+import asyncio
+import time
+
+from biofeed.core.controller import REFRESH_CONFIG, ReaderController, RefreshResult
+from biofeed.feeds.article import Article
+from biofeed.feeds.async_source import AsyncFeedSource, create_session, require_aiohttp
+from biofeed.feeds.feed_source import FeedSource
+
+class AsyncReaderController:
+    """Asyncio counterpart of ReaderController.
+
+    Feed management (selecting, adding, removing feeds) is delegated to a
+    regular ReaderController; article retrieval uses one shared aiohttp
+    session, so many feeds can be polled concurrently without a thread per
+    feed. Use it as an async context manager, or call close() when done.
+    """
+
+    def __init__(
+        self,
+        controller: Optional[ReaderController] = None,
+        max_connections: Optional[int] = None,
+        max_per_host: Optional[int] = None
+    ):
+      """Initialize the async controller.
+
+      Args:
+          controller: Optional ReaderController to delegate feed management to.
+              If None, a new ReaderController is created.
+          max_connections: Maximum number of concurrent connections overall
+          max_per_host: Maximum number of concurrent connections per host
+      """
+      require_aiohttp()
+      self.controller = controller or ReaderController()
+      self.registry = self.controller.registry
+      self.max_connections = max_connections or REFRESH_CONFIG.get("max_connections", 100)
+      self.max_per_host = max_per_host or REFRESH_CONFIG.get("max_per_host", 2)
+      self._session = None
+
+    async def __aenter__(self) -> "AsyncReaderController":
+      return self
+
+    async def __aexit__(self, *exc_info) -> None:
+      await self.close()
+
+    async def close(self) -> None:
+      """Close the shared HTTP session."""
+      if self._session is not None:
+          await self._session.close()
+          self._session = None
+
+    def _source(self, feed: FeedSource) -> AsyncFeedSource:
+      """Wrap a feed source so it downloads through the shared session."""
+      if self._session is None:
+          self._session = create_session(self.max_connections, self.max_per_host)
+      return AsyncFeedSource(feed, self._session)
+
+    def get_available_feeds(self) -> List[Dict[str, str]]:
+      """Get list of all available feeds."""
+      return self.controller.get_available_feeds()
+
+    def select_feed(self, feed_id: str) -> FeedSource:
+      """Select a feed as the active feed.
+
+      Raises:
+          ValueError: If the feed ID is not found
+      """
+      return self.controller.select_feed(feed_id)
+
+    def get_active_feed(self) -> Optional[FeedSource]:
+      """Get the currently active feed."""
+      return self.controller.get_active_feed()
+
+    async def get_recent_articles(self, count: int = 10, force_refresh: bool = False) -> List[Article]:
+      """Get the most recent articles from the active feed.
+
+      Args:
+          count: Maximum number of articles to retrieve
+          force_refresh: Whether to force a refresh of the feed data
+
+      Returns:
+          List of Article objects
+
+      Raises:
+          ValueError: If no active feed is selected
+      """
+      # Restoring the active feed reads the settings file
+      active_feed = await asyncio.to_thread(self.get_active_feed)
+      if not active_feed:
+          raise ValueError("No active feed selected")
+
+      parsed = await self._source(active_feed).get_feed(force_refresh=force_refresh)
+      articles = active_feed.iter_storing(parsed)
+
+      def first_articles() -> List[Article]:
+          # Closing the iterator stores the normalized articles in the cache
+          with closing(articles):
+              return list(islice(articles, count))
+
+      # Only the entries that are returned get normalized, off the event loop
+      articles = await asyncio.to_thread(first_articles)
+      await asyncio.to_thread(self.controller.record_listing, active_feed, articles, parsed.version)
+      return articles
+
+    async def get_article(self, article_id: str) -> Article:
+      """Get a specific article by ID from the active feed.
+
+      Raises:
+          ValueError: If no active feed is selected or if the article is not found
+      """
+      active_feed = await asyncio.to_thread(self.get_active_feed)
+      if not active_feed:
+          raise ValueError("No active feed selected")
+
+      return await self._source(active_feed).get_article(article_id)
+
+    async def refresh(
+        self, feed_ids: Optional[Iterable[str]] = None, force_refresh: bool = False
+    ) -> List[RefreshResult]:
+      """Refresh several feeds concurrently.
+
+      Concurrency is bounded by the session's connection limits. Like
+      ReaderController.refresh, only the entries new since each feed's
+      watermark are normalized, archived and indexed, in worker threads.
+
+      Args:
+          feed_ids: IDs of the feeds to refresh (defaults to all feeds)
+          force_refresh: Whether to bypass fresh cache entries
+
+      Returns:
+          One RefreshResult per feed, in the order the feeds were given
+
+      Raises:
+          ValueError: If one of the feed IDs is not found
+      """
+      feeds = await asyncio.to_thread(self.controller.resolve_feeds, feed_ids)
+
+      async def refresh_one(feed_id: str, feed: FeedSource) -> RefreshResult:
+          start = time.perf_counter()
+          try:
+              parsed = await self._source(feed).get_feed(force_refresh=force_refresh)
+              articles = await asyncio.to_thread(self.controller.ingest_new, feed_id, parsed)
+              return RefreshResult(
+                  feed_id, len(parsed), None, time.perf_counter() - start, len(articles)
+              )
+          except Exception as e:
+              return RefreshResult(feed_id, 0, str(e), time.perf_counter() - start)
+
+      results = list(await asyncio.gather(*(refresh_one(*item) for item in feeds)))
+      await asyncio.to_thread(self.controller.save_refresh_intervals)
+      return results
+
+    async def refresh_all(self, force_refresh: bool = False) -> List[RefreshResult]:
+      """Refresh every feed in the registry concurrently."""
+      return await self.refresh(None, force_refresh=force_refresh)
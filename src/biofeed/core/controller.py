@@ -1,31 +1,98 @@
 """Controller for coordinating feed selection and article retrieval."""
 
-from typing import Dict, List, Optional
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from itertools import chain, islice, zip_longest
+from typing import Dict, Iterable, List, Optional, Tuple
+import heapq
+import logging
 import re
+import time
 
+from biofeed.core.archive import ArticleArchive
+from biofeed.core.search import SearchIndex
+from biofeed.core.watermarks import Watermark, WatermarkStore
 from biofeed.feeds.registry import FeedRegistry
+from biofeed.feeds.feed_parser import ParsedFeed
 from biofeed.feeds.feed_source import FeedSource
 from biofeed.feeds.article import Article
-from biofeed.utils.config import load_config, save_config
+from biofeed.feeds.dedup import deduplicate, unique_articles
+from biofeed.utils.config import DEFAULT_CONFIG, read_config, update_config
+from biofeed.utils.dates import parse_timestamp
+from biofeed.utils.http_client import HostLimiter, get_host
+
+logger = logging.getLogger(__name__)
+
+REFRESH_CONFIG = DEFAULT_CONFIG.get("refresh", {})
+
+@dataclass
+class RefreshResult:
+  """Outcome of refreshing a single feed."""
+  feed_id: str
+  article_count: int = 0
+  error: Optional[str] = None
+  duration: float = 0.0
+  new_count: int = 0  # articles that were not ingested before
+
+  @property
+  def ok(self) -> bool:
+      return self.error is None
+
+def _newest_first(article: Article) -> float:
+  """Sort key ordering articles by publish time, undated ones last."""
+  timestamp = article.published_ts
+  if timestamp is None:
+      # Articles cached before dates were normalized at ingest
+      timestamp = parse_timestamp(article.published)
+  return timestamp if timestamp is not None else float("-inf")
 
 class ReaderController:
     """Coordinates feed selection and article retrieval."""
     
-    def __init__(self, registry: Optional[FeedRegistry] = None):
+    def __init__(
+        self,
+        registry: Optional[FeedRegistry] = None,
+        search_index: Optional[SearchIndex] = None,
+        archive: Optional[ArticleArchive] = None,
+        watermarks: Optional[WatermarkStore] = None
+    ):
       """Initialize the reader controller.
       
       Args:
           registry: Optional FeedRegistry instance to use.
               If None, a new FeedRegistry is created.
+          search_index: Optional SearchIndex instance to use.
+              If None, the default persistent index is used.
+          archive: Optional ArticleArchive instance to use.
+              If None, the default persistent archive is used.
+          watermarks: Optional WatermarkStore instance to use.
+              If None, the default persistent store is used.
       """
       self.registry = registry or FeedRegistry()
-      self.active_feed: Optional[FeedSource] = None
-      self._initialize()
+      # Compared with None: empty indexes and archives are falsy
+      self.search_index = SearchIndex() if search_index is None else search_index
+      self.archive = ArticleArchive() if archive is None else archive
+      self.watermarks = WatermarkStore() if watermarks is None else watermarks
+      self._active_feed: Optional[FeedSource] = None
+      self._settings_loaded = False  # settings.json is only read when needed
+    
+    @property
+    def active_feed(self) -> Optional[FeedSource]:
+      """The active feed, restored from the settings on first access."""
+      if not self._settings_loaded:
+          self._settings_loaded = True
+          self._initialize()
+      return self._active_feed
+    
+    @active_feed.setter
+    def active_feed(self, feed: Optional[FeedSource]) -> None:
+      self._settings_loaded = True
+      self._active_feed = feed
     
     def _initialize(self) -> None:
       """Set up initial state."""
-      # Try to load the last used feed from settings
-      settings = load_config("settings.json", default={"last_feed": None})
+      # Try to load the last used feed from settings (without creating the file)
+      settings = read_config("settings.json", default={"last_feed": None})
       last_feed = settings.get("last_feed")
       
       if last_feed:
@@ -41,15 +108,22 @@ class ReaderController:
           self.active_feed = self.registry.get_feed(feeds[0]["id"])
     
     def _save_last_feed(self) -> None:
-      """Save the active feed to settings."""
+      """Save the active feed to settings (only written if it changed)."""
       if self.active_feed:
-          settings = load_config("settings.json", default={})
-          settings["last_feed"] = next(
-              (feed_id for feed_id, feed in self.registry.feeds.items() 
-                if feed is self.active_feed),
-              None
-          )
-          save_config("settings.json", settings)
+          feed_id = self._active_feed_id()
+          update_config("settings.json", lambda settings: settings.__setitem__("last_feed", feed_id))
+    
+    def _active_feed_id(self) -> Optional[str]:
+      """Get the registry ID of the active feed."""
+      return self._feed_id(self.active_feed)
+    
+    def _feed_id(self, feed: Optional[FeedSource]) -> Optional[str]:
+      """Get the registry ID of a feed source."""
+      return next(
+          (feed_id for feed_id, candidate in self.registry.feeds.items() 
+            if candidate is feed),
+          None
+      )
     
     def get_available_feeds(self) -> List[Dict[str, str]]:
       """Get list of all available feeds.
@@ -114,7 +188,7 @@ class ReaderController:
       feed_id = re.sub(r'[^a-z0-9_]', '', name.lower().replace(' ', '_'))
       
       # Handle duplicate IDs
-      existing_ids = {feed["id"] for feed in self.registry.list_feeds()}
+      existing_ids = self.registry.feeds
       if feed_id in existing_ids:
           counter = 1
           while f"{feed_id}_{counter}" in existing_ids:
@@ -134,6 +208,133 @@ class ReaderController:
           self.active_feed = None
           
       self.registry.remove_feed(feed_id)
+      # Each store is cleaned up even if another one fails
+      for name, store in (
+          ("search index", self.search_index), ("archive", self.archive), ("watermarks", self.watermarks)
+      ):
+          try:
+              store.remove_feed(feed_id)
+          except Exception as e:
+              logger.warning(f"Failed to remove feed {feed_id} from the {name}: {e}")
+    
+    def refresh(
+        self,
+        feed_ids: Optional[Iterable[str]] = None,
+        force_refresh: bool = False,
+        max_workers: Optional[int] = None,
+        max_per_host: Optional[int] = None
+    ) -> List[RefreshResult]:
+      """Refresh several feeds concurrently.
+      
+      Refreshing is incremental: only entries that are not in a feed's
+      watermark are normalized, archived and indexed, so the work grows
+      with the new content rather than with the length of the feeds.
+      
+      Args:
+          feed_ids: IDs of the feeds to refresh (defaults to all feeds)
+          force_refresh: Whether to bypass fresh cache entries
+          max_workers: Maximum number of feeds fetched at once
+          max_per_host: Maximum number of concurrent requests to one host
+          
+      Returns:
+          One RefreshResult per feed, in the order the feeds were given
+          
+      Raises:
+          ValueError: If one of the feed IDs is not found
+      """
+      fetched = self._fetch_feeds(
+          self.resolve_feeds(feed_ids), force_refresh, max_workers, max_per_host, incremental=True
+      )
+      return [result for result, _ in fetched]
+    
+    def resolve_feeds(self, feed_ids: Optional[Iterable[str]]) -> List[Tuple[str, FeedSource]]:
+      """Look up feeds by ID, defaulting to every feed in the registry.
+      
+      Raises:
+          ValueError: If one of the feed IDs is not found
+      """
+      if feed_ids is None:
+          return list(self.registry.feeds.items())
+      return [(feed_id, self.registry.get_feed(feed_id)) for feed_id in feed_ids]
+    
+    def _fetch_feeds(
+        self,
+        feeds: List[Tuple[str, FeedSource]],
+        force_refresh: bool = False,
+        max_workers: Optional[int] = None,
+        max_per_host: Optional[int] = None,
+        incremental: bool = False
+    ) -> List[Tuple[RefreshResult, List[Article]]]:
+      """Get the articles of several feeds on a bounded thread pool.
+      
+      Args:
+          feeds: (feed ID, FeedSource) pairs to fetch
+          force_refresh: Whether to bypass fresh cache entries
+          max_workers: Maximum number of feeds fetched at once
+          max_per_host: Maximum number of concurrent requests to one host
+          incremental: Only normalize and ingest the entries that are new
+              since the feed's watermark, and return only those
+          
+      Returns:
+          A RefreshResult and the articles (empty on error) for each feed,
+          in the order the feeds were given
+      """
+      if not feeds:
+          return []
+      
+      max_workers = max_workers or REFRESH_CONFIG.get("max_workers", 8)
+      limiter = HostLimiter(max_per_host or REFRESH_CONFIG.get("max_per_host", 2))
+      
+      def fetch_one(feed_id: str, feed: FeedSource) -> Tuple[RefreshResult, List[Article]]:
+          start = time.perf_counter()
+          try:
+              with limiter.limit(feed.url):
+                  if incremental:
+                      parsed = feed.get_feed(force_refresh=force_refresh)
+                  else:
+                      articles = feed.get_articles(force_refresh=force_refresh)
+              if incremental:
+                  articles = self.ingest_new(feed_id, parsed)
+                  return RefreshResult(
+                      feed_id, len(parsed), None, time.perf_counter() - start, len(articles)
+                  ), articles
+              
+              for article in articles:
+                  article.feed_id = feed_id
+              added = self._archive_articles(feed_id, articles)
+              # Browsing leaves the watermark alone: only refresh advances it
+              self._index_articles(feed_id, articles)
+              return RefreshResult(
+                  feed_id, len(articles), None, time.perf_counter() - start, added
+              ), articles
+          except Exception as e:
+              return RefreshResult(feed_id, 0, str(e), time.perf_counter() - start), []
+      
+      # Interleave hosts so that workers don't all queue up behind one host
+      by_host: Dict[str, List[Tuple[str, FeedSource]]] = {}
+      for feed_id, feed in feeds:
+          by_host.setdefault(get_host(feed.url), []).append((feed_id, feed))
+      ordered = [item for item in chain(*zip_longest(*by_host.values())) if item]
+      
+      with ThreadPoolExecutor(max_workers=min(max_workers, len(ordered))) as executor:
+          fetched = {
+              result.feed_id: (result, articles)
+              for result, articles in executor.map(lambda item: fetch_one(*item), ordered)
+          }
+      self.save_refresh_intervals()
+      return [fetched[feed_id] for feed_id, _ in feeds]
+    
+    def refresh_all(self, force_refresh: bool = False, **kwargs) -> List[RefreshResult]:
+      """Refresh every feed in the registry concurrently.
+      
+      Args:
+          force_refresh: Whether to bypass fresh cache entries
+          **kwargs: Concurrency limits passed on to refresh()
+          
+      Returns:
+          One RefreshResult per feed
+      """
+      return self.refresh(None, force_refresh=force_refresh, **kwargs)
     
     def get_recent_articles(self, count: int = 10, force_refresh: bool = False) -> List[Article]:
       """Get the most recent articles from the active feed.
@@ -151,54 +352,340 @@ class ReaderController:
       if not self.active_feed:
           raise ValueError("No active feed selected")
       
-      articles = self.active_feed.get_articles(force_refresh=force_refresh)
-      return articles[:min(count, len(articles))]
+      # Only the entries that are returned get normalized. Not deduplicated:
+      # positions shown must stay the positions the read command resolves
+      parsed = self.active_feed.get_feed(force_refresh=force_refresh)
+      articles = list(islice(self.active_feed.iter_storing(parsed), count))
+      self.record_listing(self.active_feed, articles, parsed.version)
+      return articles
     
-    def get_article(self, article_id: str) -> Article:
-      """Get a specific article by ID.
+    def record_listing(self, feed: FeedSource, articles: List[Article], version: str = '') -> None:
+      """Archive and index articles listed from a feed, and save its refresh interval.
+      
+      Browsing leaves the watermark alone: only refresh advances it. Listing
+      the same feed version again writes nothing, unless more of its
+      articles are listed than before.
+      
+      Args:
+          feed: The feed the articles were listed from
+          articles: The listed articles, from the start of the feed
+          version: Hash of the feed body the articles came from, if known
+      """
+      self.save_refresh_intervals()
+      feed_id = self._feed_id(feed)
+      if not feed_id:
+          return
+      
+      if version:
+          try:
+              listed_version, listed_count = self.watermarks.listed(feed_id)
+          except Exception as e:
+              logger.warning(f"Failed to read the last listing of feed {feed_id}: {e}")
+              listed_version, listed_count = None, 0
+          if listed_version == version and len(articles) <= listed_count:
+              return
+      
+      self._archive_articles(feed_id, articles)
+      self._index_articles(feed_id, articles)
+      if version:
+          try:
+              self.watermarks.mark_listed(feed_id, version, len(articles))
+          except Exception as e:
+              # Without it the listing is only archived again, which is harmless
+              logger.warning(f"Failed to record the listing of feed {feed_id}: {e}")
+    
+    def get_archived_articles(
+        self,
+        count: int = 10,
+        feed_ids: Optional[Iterable[str]] = None,
+        since: Optional[float] = None,
+        until: Optional[float] = None
+    ) -> List[Article]:
+      """Get the newest archived articles, including those no longer in their feed.
       
       Args:
-          article_id: ID of the article to retrieve
+          count: Maximum number of articles to retrieve
+          feed_ids: Only return articles of these feeds (default: all feeds)
+          since: Only return articles published at or after this POSIX time
+          until: Only return articles published before this POSIX time
           
       Returns:
-          The requested Article object
+          List of Article objects, newest first, with feed_id set; a paper
+          archived for several feeds is listed once, with the others in also_in
+      """
+      return list(islice(unique_articles(self.archive.scan(feed_ids, since=since, until=until)), count))
+    
+    def compact_archive(
+        self, retention_days: Optional[float] = None, max_per_feed: Optional[int] = None
+    ) -> int:
+      """Drop old articles from the archive and the search index.
+      
+      Args:
+          retention_days: Drop articles published more than this many days ago
+          max_per_feed: Keep only this many of the newest articles of each feed
+          
+      Returns:
+          Number of articles dropped
+      """
+      removed = self.archive.compact(retention_days, max_per_feed)
+      for feed_id, article_ids in removed.items():
+          self.search_index.remove_articles(feed_id, article_ids)
+      return sum(len(article_ids) for article_ids in removed.values())
+    
+    def get_timeline(
+        self,
+        count: int = 10,
+        feed_ids: Optional[Iterable[str]] = None,
+        category: Optional[str] = None,
+        force_refresh: bool = False
+    ) -> List[Article]:
+      """Get the most recent articles across several feeds.
+      
+      Feeds are fetched concurrently and the newest articles are picked with
+      a heap-based top-N selection, so the merged entries are never fully sorted.
+      Articles without a parseable date come last. A paper found in several
+      feeds (by DOI, URL or near-identical title) is listed once, with the
+      other feeds in its also_in.
+      
+      Args:
+          count: Maximum number of articles to retrieve
+          feed_ids: IDs of the feeds to merge (defaults to all feeds)
+          category: Only merge feeds in this category
+          force_refresh: Whether to force a refresh of the feed data
+          
+      Returns:
+          List of Article objects, newest first, with feed_id set
           
       Raises:
-          ValueError: If no active feed is selected or if the article is not found
+          ValueError: If one of the feed IDs is not found
       """
-      if not self.active_feed:
-          raise ValueError("No active feed selected")
+      feeds = self.resolve_feeds(feed_ids)
+      if category is not None:
+          in_category = {id(feed) for feed in self.registry.get_feeds_by_category(category)}
+          feeds = [(feed_id, feed) for feed_id, feed in feeds if id(feed) in in_category]
+      
+      fetched = self._fetch_feeds(feeds, force_refresh=force_refresh)
+      for result, _ in fetched:
+          if not result.ok:
+              logger.warning(f"Skipping feed {result.feed_id}: {result.error}")
       
-      return self.active_feed.get_article(article_id)
+      return heapq.nlargest(
+          count,
+          deduplicate(chain.from_iterable(articles for _, articles in fetched)),
+          key=_newest_first
+      )
     
-    def search_articles(self, query: str, count: int = 10) -> List[Article]:
-      """Search for articles matching a query.
+    def get_new_articles(
+        self,
+        count: int = 10,
+        feed_ids: Optional[Iterable[str]] = None,
+        force_refresh: bool = False,
+        mark_read: bool = True
+    ) -> List[Article]:
+      """Get the articles that arrived since new articles were last listed.
+      
+      The feeds are refreshed incrementally first, then the articles the
+      archive first saw after each feed's read mark are merged. Every
+      article arrived the first time a feed is listed.
       
       Args:
-          query: Search query
           count: Maximum number of articles to return
+          feed_ids: IDs of the feeds to list (defaults to all feeds)
+          force_refresh: Whether to bypass fresh cache entries
+          mark_read: Move the read marks past these arrivals, so the next
+              listing only shows later ones
           
       Returns:
-          List of Article objects matching the query
+          List of Article objects, newest first, with feed_id set; a paper
+          that arrived in several feeds is listed once
           
       Raises:
-          ValueError: If no active feed is selected
+          ValueError: If one of the feed IDs is not found
       """
+      feeds = self.resolve_feeds(feed_ids)
+      for result, _ in self._fetch_feeds(feeds, force_refresh=force_refresh, incremental=True):
+          if not result.ok:
+              logger.warning(f"Could not refresh feed {result.feed_id}: {result.error}")
+      
+      until = time.time()
+      read_marks = self.watermarks.read_marks(feed_id for feed_id, _ in feeds)
+      arrivals = chain.from_iterable(
+          self.archive.arrivals(feed_id, after=read_at, until=until)
+          for feed_id, read_at in read_marks.items()
+      )
+      articles = heapq.nlargest(count, deduplicate(arrivals), key=_newest_first)
+      if mark_read:
+          self.watermarks.mark_read(read_marks, until)
+      return articles
+    
+    def get_article(self, article_id: str, offline: bool = False) -> Article:
+      """Get a specific article by ID.
+      
+      Args:
+          article_id: Stable ID or position of an article of the active feed,
+              or "feed_id:article_id" for an article of any feed
+          offline: Only look in cached feed data, however old it is
+          
+      Returns:
+          The requested Article object
+          
+      Raises:
+          ValueError: If no active feed is selected or if the article is not found
+      """
+      feed_id, sep, feed_article_id = article_id.partition(":")
+      if sep and feed_id in self.registry.feeds:
+          article = self._find_article(
+              feed_id, self.registry.get_feed(feed_id), feed_article_id, offline
+          )
+          article.feed_id = feed_id
+          return article
+      
       if not self.active_feed:
           raise ValueError("No active feed selected")
       
-      articles = self.active_feed.get_articles()
+      return self._find_article(self._active_feed_id(), self.active_feed, article_id, offline)
+    
+    def _find_article(
+        self, feed_id: Optional[str], feed: FeedSource, article_id: str, offline: bool
+    ) -> Article:
+      """Get an article from its feed, or from the archive once it left the feed.
       
-      # Simple search implementation - can be improved later
-      query = query.lower()
-      results = []
+      Raises:
+          ValueError: If the article is in neither
+      """
+      try:
+          return feed.get_article(article_id, offline=offline)
+      except ValueError:
+          archived = None
+          if feed_id:
+              try:
+                  archived = self.archive.get(feed_id, article_id)
+              except Exception as e:
+                  logger.warning(f"Failed to look up article {article_id} in the archive: {e}")
+          if archived is None:
+              raise
+          return archived
+    
+    def save_refresh_intervals(self) -> None:
+      """Store the refresh intervals feeds adapted while being fetched."""
+      try:
+          self.registry.update_refresh_intervals()
+      except Exception as e:
+          logger.warning(f"Failed to save refresh intervals: {e}")
+    
+    def _archive_articles(self, feed_id: str, articles: List[Article]) -> int:
+      """Add the articles of a feed that are new to the archive, returning how many."""
+      try:
+          return self.archive.append(feed_id, articles)
+      except Exception as e:
+          # Like the index, never fail a fetch because of the archive
+          logger.warning(f"Failed to archive articles of feed {feed_id}: {e}")
+          return 0
+    
+    def ingest_new(self, feed_id: str, parsed: ParsedFeed) -> List[Article]:
+      """Archive and index the entries of a feed that its watermark has not seen.
+      
+      Returns:
+          The new articles, with feed_id set
+      """
+      try:
+          watermark = self.watermarks.get(feed_id)
+      except Exception as e:
+          logger.warning(f"Failed to read the watermark of feed {feed_id}: {e}")
+          watermark = None
+      
+      if watermark is None:
+          articles = parsed.articles
+      elif parsed.version and parsed.version == watermark.version:
+          return []  # This very feed body was ingested before
+      else:
+          articles = parsed.new_articles(watermark.seen)
       
       for article in articles:
-          if (query in article.title.lower() or 
-              (article.summary and query in article.summary.lower()) or
-              (article.content and query in article.content.lower())):
-              results.append(article)
-              if len(results) >= count:
-                  break
-      
-      return results
\ No newline at end of file
+          article.feed_id = feed_id
+      self._archive_articles(feed_id, articles)
+      self._index_articles(feed_id, articles)
+      if watermark is not None:
+          watermark.advance(articles, parsed.version or None, parsed.entry_ids)
+          self._save_watermark(watermark)
+      return articles
+    
+    def _save_watermark(self, watermark: Watermark) -> None:
+      try:
+          self.watermarks.save(watermark)
+      except Exception as e:
+          # Without it the entries are only ingested again, which is harmless
+          logger.warning(f"Failed to save the watermark of feed {watermark.feed_id}: {e}")
+    
+    def _index_articles(self, feed_id: str, articles: List[Article]) -> None:
+      """Update the search index with a feed's current articles.
+      
+      Articles that left the feed stay indexed, as they stay archived.
+      """
+      try:
+          self.search_index.update_feed(feed_id, articles, drop_stale=False)
+      except Exception as e:
+          # The index is only an accelerator: never fail a fetch because of it
+          logger.warning(f"Failed to index articles of feed {feed_id}: {e}")
+    
+    def _index_cached(self, feed_ids: Optional[List[str]]) -> None:
+      """Index the cached articles of feeds that have nothing indexed, e.g. on a fresh install.
+      
+      Covers the given feeds, or the active feed by default. Only cached
+      data is used: feeds that were never downloaded stay unindexed.
+      """
+      if feed_ids is None:
+          feed_id = self._active_feed_id()
+          feed_ids = [feed_id] if feed_id else []
+      try:
+          if not feed_ids or self.search_index.has_documents(feed_ids):
+              return
+      except Exception as e:
+          logger.warning(f"Failed to read the search index: {e}")
+          return
+      for feed_id in feed_ids:
+          feed = self.registry.feeds.get(feed_id)
+          if feed is None:
+              continue
+          try:
+              articles = feed.all_articles(feed.as_parsed(feed.fetch(offline=True)))
+          except ValueError:
+              continue  # Not cached
+          self._index_articles(feed_id, articles)
+    
+    def search_articles(
+        self, query: str, count: int = 10, feed_ids: Optional[Iterable[str]] = None
+    ) -> List[Article]:
+      """Search for articles matching a query.
+      
+      Searches the full-text index, which covers every article that has
+      been refreshed or listed, including archived articles that have since
+      left their feed. Feeds are not fetched, so a search never waits on
+      the network; if nothing of the searched feeds (or, by default, of
+      the active feed) is indexed yet, their cached articles are indexed
+      first.
+      Queries may restrict terms to a field (title:, author:, category:,
+      summary:, content:) and quote phrases. All terms must match, and
+      results are ranked by BM25.
+      
+      Args:
+          query: Search query
+          count: Maximum number of articles to return
+          feed_ids: Only search these feeds (default: all indexed feeds)
+          
+      Returns:
+          List of Article objects matching the query, best match first; a
+          paper found in several feeds is listed once, with the others in also_in
+      """
+      if feed_ids is not None:
+          feed_ids = list(feed_ids)
+      self._index_cached(feed_ids)
+      # Copies of a hit usually rank close to it, so look a little further ahead
+      limit = count * 2
+      while True:
+          results = self.search_index.search(query, count=limit, feed_ids=feed_ids)
+          papers = deduplicate(results)
+          # Ask for more hits while duplicates leave fewer papers than requested
+          if len(papers) >= count or len(results) < limit:
+              return papers[:count]
+          limit *= 2
@@ -1,40 +1,55 @@
 # src/reader/formatter.py
-from typing import List
-from datetime import datetime
+from typing import List, Optional, Sequence
 import textwrap
 from biofeed.feeds.article import Article
+from biofeed.utils.dates import format_timestamp, parse_timestamp
 
 class ArticleFormatter:
     """Formats articles for display in terminal."""
     
     @staticmethod
-    def format_date(date_str: str) -> str:
-      """Format date string to a consistent format."""
-      try:
-          # Try different date formats
-          for fmt in ("%Y-%m-%dT%H:%M:%S%z", "%Y-%m-%dT%H:%M:%S", "%Y-%m-%d"):
-              try:
-                  dt = datetime.strptime(date_str[:19], fmt)  # Only use first 19 chars to avoid timezone issues
-                  return dt.strftime("%Y-%m-%d")
-              except ValueError:
-                  continue
-      except Exception:
-          # If all parsing fails, return the original string
+    def format_date(date_str: str, timestamp: Optional[float] = None) -> str:
+      """Format a date to a consistent YYYY-MM-DD form.
+      
+      Uses the epoch timestamp FeedParser stored on the article when given,
+      and only parses the date string for articles that lack one. Dates that
+      cannot be parsed are shown as (the start of) the original string.
+      """
+      if timestamp is None:
+          timestamp = parse_timestamp(date_str)
+      if timestamp is None:
+          date_str = date_str or ""
           return date_str[:10] if len(date_str) >= 10 else date_str
+      return format_timestamp(timestamp)
     
     @staticmethod
-    def format_article_list(articles: List[Article], include_summary: bool = False) -> str:
-      """Format a list of articles for display."""
+    def format_article_list(
+        articles: Sequence[Article], include_summary: bool = False, show_feed: bool = False
+    ) -> str:
+      """Format a list of articles for display.
+      
+      Each line ends with the article's stable ID, which `read` accepts and
+      which stays valid after the feed is refreshed. If show_feed is set, the
+      ID is prefixed with the feed the article came from (for timelines
+      merged across feeds). Papers found in several feeds list the others.
+      """
       if not articles:
           return "No articles found."
       
       result = []
       for i, article in enumerate(articles):
           # Format the date
-          date = ArticleFormatter.format_date(article.published)
+          date = ArticleFormatter.format_date(article.published, article.published_ts)
           
           # Create the line
           line = f"{i:>3}. {article.title} ({date})"
+          if show_feed and article.feed_id:
+              line += f" [{article.feed_id}:{article.id}]"
+          else:
+              line += f" [{article.id}]"
+          if article.also_in:
+              # The same paper was found in other feeds too
+              line += f" (also in {', '.join(article.also_in)})"
           result.append(line)
           
           # Add summary if requested
@@ -54,7 +69,7 @@ class ArticleFormatter:
     def format_article_detail(article: Article) -> str:
       """Format an article for detailed display."""
       # Format the date
-      date = ArticleFormatter.format_date(article.published)
+      date = ArticleFormatter.format_date(article.published, article.published_ts)
       
       # Format authors
       authors = article.author or "Unknown"
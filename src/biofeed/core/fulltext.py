@@ -0,0 +1,295 @@
+"""Persistent cache of article full texts fetched from publisher pages."""
+
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Callable, Dict, Iterable, Optional, Tuple, Union
+import logging
+import sqlite3
+import threading
+import time
+
+from biofeed.feeds.extractors import find_extractor
+from biofeed.utils import http_client
+from biofeed.utils.config import DEFAULT_CONFIG, get_config_dir
+
+logger = logging.getLogger(__name__)
+
+# Name of the full-text cache database inside the config directory
+FULLTEXT_CACHE_FILE = DEFAULT_CONFIG.get("fulltext_cache_file", "fulltext.db")
+
+FULLTEXT_LIMITS = DEFAULT_CONFIG.get("fulltext_limits", {})
+
+PREFETCH_CONFIG = DEFAULT_CONFIG.get("prefetch", {})
+
+@dataclass
+class FullTextEntry:
+  """Extracted full text of an article page with the validators of its response."""
+  link: str
+  text: str
+  etag: Optional[str] = None
+  last_modified: Optional[str] = None
+  fetched_at: float = 0.0
+
+class FullTextCache:
+    """Persistent, size-bounded cache of extracted article texts keyed by link.
+
+    Only the extracted text is stored, not the page, so a repeat read needs
+    neither a download nor an HTML parse. When the cache grows beyond
+    max_entries or max_bytes, the least recently read texts are evicted.
+    """
+
+    def __init__(
+        self,
+        path: Optional[Union[str, Path]] = None,
+        max_entries: Optional[int] = None,
+        max_bytes: Optional[int] = None
+    ):
+      """Initialize the cache.
+
+      Args:
+          path: Path to the database file. If None, FULLTEXT_CACHE_FILE inside
+              the configuration directory is used, resolved on first access.
+          max_entries: Maximum number of texts kept (0 means unlimited)
+          max_bytes: Maximum total size of the texts kept, in bytes of
+              UTF-8 (0 means unlimited)
+      """
+      self.path = Path(path) if path else None
+      self.max_entries = FULLTEXT_LIMITS.get("max_entries", 0) if max_entries is None else max_entries
+      self.max_bytes = FULLTEXT_LIMITS.get("max_bytes", 0) if max_bytes is None else max_bytes
+      self._conn: Optional[sqlite3.Connection] = None
+      self._lock = threading.RLock()
+
+    def _connect(self) -> sqlite3.Connection:
+      """Open the database on first use and make sure the schema exists."""
+      if self._conn is None:
+          path = self.path or get_config_dir() / FULLTEXT_CACHE_FILE
+          conn = sqlite3.connect(str(path), timeout=10, check_same_thread=False)
+          conn.execute("PRAGMA journal_mode=WAL")
+          conn.execute(
+              "CREATE TABLE IF NOT EXISTS fulltext ("
+              "link TEXT PRIMARY KEY, text TEXT NOT NULL, etag TEXT, last_modified TEXT, "
+              "fetched_at REAL NOT NULL, accessed_at REAL NOT NULL, size INTEGER NOT NULL)"
+          )
+          conn.execute(
+              "CREATE INDEX IF NOT EXISTS fulltext_accessed ON fulltext (accessed_at)"
+          )
+          conn.commit()
+          self._conn = conn
+      return self._conn
+
+    def get(self, link: str) -> Optional[FullTextEntry]:
+      """Get the cached text of a page, marking it as recently read."""
+      with self._lock:
+          conn = self._connect()
+          row = conn.execute(
+              "SELECT text, etag, last_modified, fetched_at FROM fulltext WHERE link = ?",
+              (link,)
+          ).fetchone()
+          if row is None:
+              return None
+          conn.execute(
+              "UPDATE fulltext SET accessed_at = ? WHERE link = ?", (time.time(), link)
+          )
+          conn.commit()
+      return FullTextEntry(link, *row)
+
+    def __contains__(self, link: str) -> bool:
+      with self._lock:
+          return self._connect().execute(
+              "SELECT 1 FROM fulltext WHERE link = ?", (link,)
+          ).fetchone() is not None
+
+    def store(self, entry: FullTextEntry) -> None:
+      """Store the text of a page, then evict old texts if over the limits."""
+      now = time.time()
+      with self._lock:
+          conn = self._connect()
+          with conn:
+              conn.execute(
+                  "INSERT OR REPLACE INTO fulltext "
+                  "(link, text, etag, last_modified, fetched_at, accessed_at, size) "
+                  "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                  (
+                      entry.link, entry.text, entry.etag, entry.last_modified,
+                      entry.fetched_at or now, now, len(entry.text.encode("utf-8"))
+                  )
+              )
+              self._evict(conn)
+
+    def touch(self, link: str) -> None:
+      """Record that a cached text was confirmed current by the publisher."""
+      with self._lock:
+          conn = self._connect()
+          now = time.time()
+          conn.execute(
+              "UPDATE fulltext SET fetched_at = ?, accessed_at = ? WHERE link = ?",
+              (now, now, link)
+          )
+          conn.commit()
+
+    def _evict(self, conn: sqlite3.Connection) -> None:
+      """Delete the least recently read texts until within the limits."""
+      if self.max_entries:
+          conn.execute(
+              "DELETE FROM fulltext WHERE link IN (SELECT link FROM fulltext "
+              "ORDER BY accessed_at DESC LIMIT -1 OFFSET ?)", (self.max_entries,)
+          )
+      if self.max_bytes:
+          total = conn.execute("SELECT COALESCE(SUM(size), 0) FROM fulltext").fetchone()[0]
+          if total > self.max_bytes:
+              evicted = []
+              for link, size in conn.execute(
+                  "SELECT link, size FROM fulltext ORDER BY accessed_at"
+              ).fetchall():
+                  if total <= self.max_bytes:
+                      break
+                  evicted.append((link,))
+                  total -= size
+              conn.executemany("DELETE FROM fulltext WHERE link = ?", evicted)
+
+    def stats(self) -> Dict[str, int]:
+      """Get the number of cached texts and their total size in bytes."""
+      with self._lock:
+          entries, size = self._connect().execute(
+              "SELECT COUNT(*), COALESCE(SUM(size), 0) FROM fulltext"
+          ).fetchone()
+      return {
+          "entries": entries, "bytes": size,
+          "max_entries": self.max_entries, "max_bytes": self.max_bytes,
+      }
+
+    def clear(self) -> None:
+      """Delete all cached texts."""
+      with self._lock:
+          conn = self._connect()
+          conn.execute("DELETE FROM fulltext")
+          conn.commit()
+
+    def close(self) -> None:
+      """Close the database connection (it is reopened on next use)."""
+      with self._lock:
+          if self._conn is not None:
+              self._conn.close()
+              self._conn = None
+
+def get_full_text(
+    link: str,
+    extract: Callable[[bytes], Optional[str]],
+    cache: Optional[FullTextCache] = None,
+    offline: bool = False,
+    refresh: bool = False
+) -> Optional[str]:
+  """Get the extracted full text of an article page, from the cache if possible.
+
+  Args:
+      link: URL of the article page
+      extract: Function extracting the text from the page body, returning
+          None if the page has no recognizable text
+      cache: Cache to use (defaults to the shared full-text cache)
+      offline: Never download; only return cached texts
+      refresh: Revalidate a cached text with the publisher (a conditional
+          request, so an unchanged page costs a 304)
+
+  Returns:
+      The text, or None if it is not cached (offline) or cannot be extracted
+
+  Raises:
+      ValueError: If the page cannot be downloaded
+  """
+  cache = cache or fulltext_cache
+  entry = cache.get(link)
+  if entry is not None and (offline or not refresh):
+      return entry.text
+  if offline:
+      return None
+
+  import requests
+
+  headers = {}
+  if entry is not None:
+      if entry.etag:
+          headers["If-None-Match"] = entry.etag
+      if entry.last_modified:
+          headers["If-Modified-Since"] = entry.last_modified
+  try:
+      response = http_client.get(link, headers=headers)
+      response.raise_for_status()
+  except requests.RequestException as e:
+      raise ValueError(f"Failed to fetch full text from {link}: {e}")
+
+  if response.status_code == 304 and entry is not None:
+      cache.touch(link)
+      return entry.text
+
+  text = extract(response.content)
+  if text:
+      cache.store(FullTextEntry(
+          link, text, response.headers.get("ETag"), response.headers.get("Last-Modified")
+      ))
+  return text
+
+def full_text_extractor(*urls: Optional[str]) -> Optional[Callable[[bytes], Optional[str]]]:
+  """Get the page extractor for an article, or None if its publisher has none.
+
+  Args:
+      urls: The article's link, optionally followed by its feed's URL
+  """
+  extractor = find_extractor(*urls)
+  return extractor.extract_page if extractor is not None else None
+
+def prefetch_full_texts(
+    links: Iterable[Tuple[str, Optional[str]]],
+    cache: Optional[FullTextCache] = None,
+    max_workers: Optional[int] = None,
+    max_per_host: Optional[int] = None
+) -> int:
+  """Fetch and cache the full texts of several articles in parallel.
+
+  Links that are already cached, or whose host has no extractor, are
+  skipped. Failures are logged and otherwise ignored, since prefetching is
+  only an optimization for a later read.
+
+  Args:
+      links: (URL of the article page, URL of its feed) pairs, most likely
+          to be read first. The feed URL finds the extractor of articles
+          whose links point elsewhere, as when reading them.
+      cache: Cache to fill (defaults to the shared full-text cache)
+      max_workers: Maximum number of pages fetched at once
+      max_per_host: Maximum number of concurrent requests to one host
+
+  Returns:
+      Number of texts newly cached
+  """
+  cache = cache or fulltext_cache
+  feed_urls: Dict[str, Optional[str]] = {}
+  for link, feed_url in links:
+      feed_urls.setdefault(link, feed_url)
+  pending = [
+      (link, extract) for link, extract in (
+          (link, full_text_extractor(link, feed_url)) for link, feed_url in feed_urls.items()
+      )
+      if extract is not None and link not in cache
+  ]
+  if not pending:
+      return 0
+
+  limiter = http_client.HostLimiter(max_per_host or PREFETCH_CONFIG.get("max_per_host", 2))
+
+  def fetch_one(task: Tuple[str, Callable[[bytes], Optional[str]]]) -> bool:
+      link, extract = task
+      try:
+          with limiter.limit(link):
+              return get_full_text(link, extract, cache) is not None
+      except Exception as e:
+          logger.warning(f"Failed to prefetch {link}: {e}")
+          return False
+
+  max_workers = max_workers or PREFETCH_CONFIG.get("max_workers", 4)
+  with ThreadPoolExecutor(max_workers=min(max_workers, len(pending))) as executor:
+      fetched = sum(executor.map(fetch_one, pending))
+  logger.info(f"Prefetched {fetched} of {len(pending)} full texts")
+  return fetched
+
+# Shared cache instance, persisted under the configuration directory
+fulltext_cache = FullTextCache()
@@ -0,0 +1,178 @@
+"""Background scheduler that keeps cached feeds warm."""
+
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Dict, Optional, Set
+import logging
+import random
+import threading
+import time
+
+from biofeed.core.controller import ReaderController, RefreshResult
+from biofeed.feeds.feed_source import FeedSource
+from biofeed.utils.config import DEFAULT_CONFIG
+from biofeed.utils.http_client import HostLimiter
+
+logger = logging.getLogger(__name__)
+
+DAEMON_CONFIG = DEFAULT_CONFIG.get("daemon", {})
+
+SCHEDULE_CONFIG = DEFAULT_CONFIG.get("schedule", {})
+
+class RefreshScheduler:
+    """Refreshes every feed of the registry shortly before its cache entry expires.
+
+    Refreshed feeds are written to the shared persistent cache (and search
+    index), so commands run in other processes find them fresh. Each feed is
+    scheduled lead_time seconds before it goes stale, minus a random jitter,
+    so feeds cached at the same moment don't all come due together; the
+    lead time is capped at half the feed's cache duration, and a refreshed
+    feed is not due again for at least min_interval seconds. At most
+    max_concurrent feeds are refreshed at once, and at most max_per_host per
+    host. Failed refreshes are retried after retry_delay seconds.
+    """
+
+    def __init__(
+        self,
+        controller: Optional[ReaderController] = None,
+        max_concurrent: Optional[int] = None,
+        max_per_host: Optional[int] = None,
+        lead_time: Optional[float] = None,
+        jitter: Optional[float] = None,
+        retry_delay: Optional[float] = None,
+        poll_interval: Optional[float] = None,
+        min_interval: Optional[float] = None,
+        on_result: Optional[Callable[[RefreshResult], None]] = None
+    ):
+      """Initialize the scheduler.
+
+      Args:
+          controller: Controller used to refresh and index feeds.
+              If None, a new ReaderController is created.
+          max_concurrent: Maximum number of feeds refreshed at once
+          max_per_host: Maximum number of concurrent requests to one host
+          lead_time: Seconds before expiry at which a feed is refreshed
+          jitter: Fraction of a feed's cache duration by which its refresh
+              may randomly be brought forward
+          retry_delay: Seconds to wait before retrying a failed refresh
+          poll_interval: Maximum seconds between checks for feeds added to or
+              removed from the registry
+          min_interval: Minimum seconds between two refreshes of a feed
+              (defaults to the schedule's min_interval)
+          on_result: Optional callback invoked with each RefreshResult
+      """
+      self.controller = controller or ReaderController()
+      self.max_concurrent = max_concurrent or DAEMON_CONFIG.get("max_concurrent", 4)
+      self.lead_time = DAEMON_CONFIG.get("lead_time", 120) if lead_time is None else lead_time
+      self.jitter = DAEMON_CONFIG.get("jitter", 0.1) if jitter is None else jitter
+      self.retry_delay = DAEMON_CONFIG.get("retry_delay", 300) if retry_delay is None else retry_delay
+      self.poll_interval = poll_interval or DAEMON_CONFIG.get("poll_interval", 60)
+      self.min_interval = (
+          SCHEDULE_CONFIG.get("min_interval", 300) if min_interval is None else min_interval
+      )
+      self.on_result = on_result
+      self._limiter = HostLimiter(max_per_host or DAEMON_CONFIG.get("max_per_host", 2))
+      self._due: Dict[str, float] = {}  # Feed ID -> time.time() at which to refresh it
+      self._running: Set[str] = set()
+      self._lock = threading.Lock()
+      self._wake = threading.Event()
+      self._stop = threading.Event()
+
+    def _next_due(self, feed: FeedSource, refreshed: bool = False) -> float:
+      """Compute when a feed should next be refreshed.
+
+      Args:
+          feed: The feed to schedule
+          refreshed: Whether the feed was just refreshed, in which case it
+              is not due again before min_interval has passed
+      """
+      now = time.time()
+      earliest = now + self.min_interval if refreshed else now
+      expires_in = feed.expires_in()
+      if expires_in is None:
+          return earliest
+      # A lead time as long as the cache duration would make the feed due
+      # again as soon as it is refreshed
+      lead_time = min(self.lead_time, 0.5 * feed.cache_duration)
+      early = lead_time + random.uniform(0, self.jitter * feed.cache_duration)
+      return max(earliest, now + expires_in - early)
+
+    def _sync_feeds(self) -> None:
+      """Schedule new feeds of the registry and forget removed ones."""
+      self.controller.registry.reload()
+      feeds = self.controller.registry.feeds
+      with self._lock:
+          for feed_id in set(self._due) - set(feeds):
+              del self._due[feed_id]
+          for feed_id, feed in feeds.items():
+              if feed_id not in self._due and feed_id not in self._running:
+                  self._due[feed_id] = self._next_due(feed)
+
+    def _refresh(self, feed_id: str) -> None:
+      """Refresh one feed and schedule its next refresh."""
+      try:
+          feed = self.controller.registry.get_feed(feed_id)
+          with self._limiter.limit(feed.url):
+              # Forced so the feed is revalidated before it goes stale
+              result = self.controller.refresh([feed_id], force_refresh=True, max_workers=1)[0]
+      except Exception as e:
+          feed, result = None, RefreshResult(feed_id, 0, str(e))
+
+      if result.ok:
+          logger.info(f"Refreshed {feed_id}: {result.article_count} articles")
+      else:
+          logger.warning(f"Failed to refresh {feed_id}: {result.error}")
+
+      with self._lock:
+          self._running.discard(feed_id)
+          if feed is not None and feed_id in self.controller.registry.feeds:
+              if result.ok:
+                  self._due[feed_id] = self._next_due(feed, refreshed=True)
+              else:
+                  self._due[feed_id] = time.time() + self.retry_delay * random.uniform(1, 1 + self.jitter)
+      if self.on_result is not None:
+          self.on_result(result)
+      self._wake.set()
+
+    def run(self) -> None:
+      """Refresh feeds as they come due until stop() is called.
+
+      Refreshes that are in progress when stop() is called are finished
+      before run() returns.
+      """
+      logger.info(f"Refresh scheduler started ({self.max_concurrent} concurrent refreshes)")
+      last_sync = 0.0
+      with ThreadPoolExecutor(max_workers=self.max_concurrent) as executor:
+          while not self._stop.is_set():
+              self._wake.clear()
+              if time.monotonic() - last_sync >= self.poll_interval:
+                  self._sync_feeds()
+                  last_sync = time.monotonic()
+
+              now = time.time()
+              with self._lock:
+                  slots = max(0, self.max_concurrent - len(self._running))
+                  due = sorted((at, feed_id) for feed_id, at in self._due.items() if at <= now)
+                  for _, feed_id in due[:slots]:
+                      del self._due[feed_id]
+                      self._running.add(feed_id)
+                      executor.submit(self._refresh, feed_id)
+                  next_at = min(self._due.values(), default=now + self.poll_interval)
+
+              if self._stop.is_set():
+                  break
+              if len(due) > slots:
+                  # More feeds are due than there are free slots: wait for one to finish
+                  self._wake.wait(self.poll_interval)
+              else:
+                  self._wake.wait(min(max(0.0, next_at - time.time()), self.poll_interval))
+      logger.info("Refresh scheduler stopped")
+
+    def stop(self) -> None:
+      """Ask run() to return; safe to call from signal handlers and other threads."""
+      self._stop.set()
+      self._wake.set()
+
+    def next_refreshes(self) -> Dict[str, float]:
+      """Get the time (as from time.time()) at which each idle feed is next refreshed."""
+      with self._lock:
+          return dict(self._due)
@@ -0,0 +1,291 @@
+"""Full-text search index over articles from all feeds."""
+
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Tuple, Union
+import logging
+import pickle
+import re
+import shlex
+import sqlite3
+import threading
+
+from biofeed.feeds.article import Article
+from biofeed.utils.config import DEFAULT_CONFIG, get_config_dir
+
+logger = logging.getLogger(__name__)
+
+# Name of the search index database inside the config directory
+SEARCH_INDEX_FILE = DEFAULT_CONFIG.get("search_index_file", "search.db")
+
+# Indexed fields, in column order, with their BM25 weights
+FIELDS = {
+    "title": 10.0,
+    "author": 5.0,
+    "category": 5.0,
+    "summary": 2.0,
+    "content": 1.0,
+}
+
+# Field names accepted in queries, e.g. "title:crispr author:smith"
+FIELD_ALIASES = {
+    "title": "title",
+    "author": "author",
+    "category": "category",
+    "tag": "category",
+    "summary": "summary",
+    "abstract": "summary",
+    "content": "content",
+}
+
+_TAG_RE = re.compile(r"<[^>]+>")
+
+def _plain_text(value: Optional[str]) -> str:
+    """Strip markup so tags don't end up in the index."""
+    return _TAG_RE.sub(" ", value) if value else ""
+
+def _indexed_fields(article: Article) -> Tuple[str, ...]:
+    """The text of an article as stored in the index, in column order."""
+    return (
+        article.title or "",
+        article.author or "",
+        " ".join(article.categories or []),
+        _plain_text(article.summary),
+        _plain_text(article.content),
+    )
+
+def document_key(feed_id: str, article: Article) -> str:
+    """Key identifying an article of a feed in the index."""
+    return f"{feed_id}:{article.id}"
+
+def build_match_expression(query: str) -> str:
+    """Translate a user query into an FTS5 MATCH expression.
+
+    Terms are ANDed together. A term may be restricted to one field with a
+    prefix (title:, author:, category:, summary:, content:) and quoted to
+    search for a phrase. Everything is quoted so user input can never be
+    interpreted as FTS5 syntax.
+
+    Args:
+        query: User query, e.g. 'title:"single cell" author:smith atlas'
+
+    Returns:
+        The MATCH expression, or an empty string if the query has no terms
+    """
+    try:
+        tokens = shlex.split(query)
+    except ValueError:
+        # Unbalanced quotes: fall back to plain whitespace splitting
+        tokens = query.replace('"', " ").split()
+
+    terms = []
+    for token in tokens:
+        field = None
+        name, sep, value = token.partition(":")
+        if sep and name.lower() in FIELD_ALIASES and value:
+            field, token = FIELD_ALIASES[name.lower()], value
+        if not re.search(r"\w", token):
+            continue
+        phrase = '"' + token.replace('"', '""') + '"'
+        terms.append(f"{field} : {phrase}" if field else phrase)
+    return " AND ".join(terms)
+
+class SearchIndex:
+    """Persistent inverted index with BM25 ranking, backed by SQLite FTS5.
+
+    Each feed's articles are indexed under the feed ID; updating a feed only
+    inserts articles that are new, re-indexes those whose text changed (e.g.
+    a corrected title) and removes those that left the feed, so refreshing
+    an unchanged feed writes nothing.
+    """
+
+    def __init__(self, path: Optional[Union[str, Path]] = None):
+        """Initialize the index.
+
+        Args:
+            path: Path to the database file. If None, SEARCH_INDEX_FILE inside
+                the configuration directory is used, resolved on first access.
+        """
+        self.path = Path(path) if path else None
+        self._conn: Optional[sqlite3.Connection] = None
+        self._lock = threading.RLock()
+
+    def _connect(self) -> sqlite3.Connection:
+        """Open the database on first use and make sure the schema exists."""
+        if self._conn is None:
+            path = self.path or get_config_dir() / SEARCH_INDEX_FILE
+            conn = sqlite3.connect(str(path), timeout=10, check_same_thread=False)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS documents ("
+                "id INTEGER PRIMARY KEY, doc_key TEXT UNIQUE NOT NULL, "
+                "feed_id TEXT NOT NULL, data BLOB NOT NULL)"
+            )
+            conn.execute(
+                "CREATE INDEX IF NOT EXISTS documents_feed ON documents (feed_id)"
+            )
+            conn.execute(
+                f"CREATE VIRTUAL TABLE IF NOT EXISTS article_fts USING fts5("
+                f"{', '.join(FIELDS)}, tokenize='porter unicode61')"
+            )
+            conn.commit()
+            self._conn = conn
+        return self._conn
+
+    def update_feed(self, feed_id: str, articles: Iterable[Article], drop_stale: bool = True) -> int:
+        """Bring the indexed articles of a feed in line with its current entries.
+
+        Args:
+            feed_id: ID of the feed the articles belong to
+            articles: The feed's current articles
+            drop_stale: Whether to drop indexed articles that left the feed
+                (they are kept when the archive still holds them)
+
+        Returns:
+            Number of newly indexed articles (re-indexed ones not included)
+        """
+        current: Dict[str, Article] = {
+            document_key(feed_id, article): article for article in articles
+        }
+
+        with self._lock:
+            conn = self._connect()
+            # Document key -> (row ID, indexed text)
+            select = (
+                "SELECT doc_key, id, title, author, category, summary, content FROM documents "
+                "JOIN article_fts ON article_fts.rowid = documents.id"
+            )
+            if drop_stale:
+                rows = conn.execute(select + " WHERE feed_id = ?", (feed_id,)).fetchall()
+            else:
+                # Only the given articles matter, however many are indexed
+                rows = []
+                keys = list(current)
+                for start in range(0, len(keys), 500):
+                    batch = keys[start:start + 500]
+                    rows.extend(conn.execute(
+                        f"{select} WHERE doc_key IN ({', '.join('?' * len(batch))})", batch
+                    ))
+            indexed = {key: (rowid, tuple(fields)) for key, rowid, *fields in rows}
+            stale = [indexed[key][0] for key in indexed.keys() - current.keys()] if drop_stale else []
+            added = [key for key in current if key not in indexed]
+            changed = [
+                key for key in current
+                if key in indexed and indexed[key][1] != _indexed_fields(current[key])
+            ]
+            if not stale and not added and not changed:
+                return 0
+
+            with conn:
+                for rowid in stale:
+                    conn.execute("DELETE FROM article_fts WHERE rowid = ?", (rowid,))
+                    conn.execute("DELETE FROM documents WHERE id = ?", (rowid,))
+                for key in changed:
+                    rowid = indexed[key][0]
+                    conn.execute("DELETE FROM article_fts WHERE rowid = ?", (rowid,))
+                    conn.execute(
+                        "UPDATE documents SET data = ? WHERE id = ?",
+                        (pickle.dumps(current[key], protocol=pickle.HIGHEST_PROTOCOL), rowid)
+                    )
+                    conn.execute(
+                        "INSERT INTO article_fts (rowid, title, author, category, summary, content) "
+                        "VALUES (?, ?, ?, ?, ?, ?)", (rowid, *_indexed_fields(current[key]))
+                    )
+                for key in added:
+                    cursor = conn.execute(
+                        "INSERT INTO documents (doc_key, feed_id, data) VALUES (?, ?, ?)",
+                        (key, feed_id, pickle.dumps(current[key], protocol=pickle.HIGHEST_PROTOCOL))
+                    )
+                    conn.execute(
+                        "INSERT INTO article_fts (rowid, title, author, category, summary, content) "
+                        "VALUES (?, ?, ?, ?, ?, ?)", (cursor.lastrowid, *_indexed_fields(current[key]))
+                    )
+        logger.debug(
+            f"Indexed {len(added)}, re-indexed {len(changed)} and dropped {len(stale)} articles of {feed_id}"
+        )
+        return len(added)
+
+    def remove_feed(self, feed_id: str) -> None:
+        """Drop all indexed articles of a feed."""
+        with self._lock:
+            conn = self._connect()
+            with conn:
+                conn.execute(
+                    "DELETE FROM article_fts WHERE rowid IN "
+                    "(SELECT id FROM documents WHERE feed_id = ?)", (feed_id,)
+                )
+                conn.execute("DELETE FROM documents WHERE feed_id = ?", (feed_id,))
+
+    def remove_articles(self, feed_id: str, article_ids: Iterable[str]) -> None:
+        """Drop some indexed articles of a feed."""
+        keys = [(f"{feed_id}:{article_id}",) for article_id in article_ids]
+        with self._lock:
+            conn = self._connect()
+            with conn:
+                conn.executemany(
+                    "DELETE FROM article_fts WHERE rowid IN "
+                    "(SELECT id FROM documents WHERE doc_key = ?)", keys
+                )
+                conn.executemany("DELETE FROM documents WHERE doc_key = ?", keys)
+
+    def search(self, query: str, count: int = 10, feed_ids: Optional[Iterable[str]] = None) -> List[Article]:
+        """Find the articles best matching a query.
+
+        Args:
+            query: Query string (see build_match_expression for the syntax)
+            count: Maximum number of articles to return
+            feed_ids: Only return articles from these feeds (default: all)
+
+        Returns:
+            Matching Article objects ranked by BM25, best first, with feed_id set
+        """
+        expression = build_match_expression(query)
+        if not expression:
+            return []
+
+        sql = (
+            "SELECT documents.feed_id, documents.data FROM article_fts "
+            "JOIN documents ON documents.id = article_fts.rowid "
+            "WHERE article_fts MATCH ?"
+        )
+        params: list = [expression]
+        if feed_ids is not None:
+            feed_ids = list(feed_ids)
+            sql += f" AND documents.feed_id IN ({', '.join('?' * len(feed_ids))})"
+            params.extend(feed_ids)
+        weights = ", ".join(str(weight) for weight in FIELDS.values())
+        sql += f" ORDER BY bm25(article_fts, {weights}) LIMIT ?"
+        params.append(count)
+
+        with self._lock:
+            rows = self._connect().execute(sql, params).fetchall()
+
+        results = []
+        for feed_id, data in rows:
+            article = pickle.loads(data)
+            article.feed_id = feed_id
+            results.append(article)
+        return results
+
+    def has_documents(self, feed_ids: Optional[Iterable[str]] = None) -> bool:
+        """Whether any article is indexed, or any of the given feeds' articles."""
+        sql = "SELECT 1 FROM documents"
+        params: list = []
+        if feed_ids is not None:
+            params = list(feed_ids)
+            if not params:
+                return False
+            sql += f" WHERE feed_id IN ({', '.join('?' * len(params))})"
+        with self._lock:
+            return self._connect().execute(sql + " LIMIT 1", params).fetchone() is not None
+
+    def __len__(self) -> int:
+        """Number of indexed articles."""
+        with self._lock:
+            return self._connect().execute("SELECT COUNT(*) FROM documents").fetchone()[0]
+
+    def close(self) -> None:
+        """Close the database connection (it is reopened on next use)."""
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
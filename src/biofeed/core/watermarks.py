@@ -0,0 +1,247 @@
+"""Per-feed watermarks recording which entries have already been ingested."""
+
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Callable, Dict, Iterable, List, Optional, Tuple, Union
+import hashlib
+import logging
+import math
+import sqlite3
+import threading
+import time
+
+from biofeed.feeds.article import Article
+from biofeed.utils.config import DEFAULT_CONFIG, get_config_dir
+
+logger = logging.getLogger(__name__)
+
+# Name of the watermark database inside the config directory
+WATERMARK_FILE = DEFAULT_CONFIG.get("watermark_file", "watermarks.db")
+
+WATERMARK_LIMITS = DEFAULT_CONFIG.get("watermarks", {})
+
+class BloomFilter:
+    """Compact set of strings that may report false positives, never false negatives.
+
+    Sized for `capacity` items at the given false-positive rate; adding more
+    items than that makes false positives more likely.
+    """
+
+    def __init__(
+        self,
+        capacity: Optional[int] = None,
+        error_rate: Optional[float] = None,
+        bits: Optional[bytes] = None,
+        size: Optional[int] = None,
+        hashes: Optional[int] = None,
+        count: int = 0
+    ):
+        """Initialize the filter, empty or from a stored state.
+
+        Args:
+            capacity: Number of items the filter is sized for
+            error_rate: False-positive rate at capacity
+            bits: Stored bit array (with size, hashes and count)
+            size: Number of bits
+            hashes: Number of bit positions per item
+            count: Number of items added
+        """
+        self.capacity = capacity or WATERMARK_LIMITS.get("capacity", 4096)
+        error_rate = error_rate or WATERMARK_LIMITS.get("error_rate", 0.0001)
+        self.size = size or math.ceil(-self.capacity * math.log(error_rate) / math.log(2) ** 2)
+        self.hashes = hashes or max(1, round(self.size / self.capacity * math.log(2)))
+        self.bits = bytearray(bits) if bits is not None else bytearray((self.size + 7) // 8)
+        self.count = count
+
+    def _positions(self, item: str) -> Iterable[int]:
+        # Double hashing: k positions from the two halves of one digest
+        digest = hashlib.blake2b(item.encode("utf-8"), digest_size=16).digest()
+        first, second = int.from_bytes(digest[:8], "little"), int.from_bytes(digest[8:], "little") | 1
+        return ((first + i * second) % self.size for i in range(self.hashes))
+
+    def add(self, item: str) -> None:
+        """Add an item."""
+        for position in self._positions(item):
+            self.bits[position >> 3] |= 1 << (position & 7)
+        self.count += 1
+
+    def __contains__(self, item: object) -> bool:
+        if not isinstance(item, str):
+            return False
+        return all(self.bits[position >> 3] & (1 << (position & 7)) for position in self._positions(item))
+
+    def __len__(self) -> int:
+        return self.count
+
+@dataclass
+class Watermark:
+    """How far the entries of one feed have been ingested and read.
+
+    Attributes:
+        feed_id: ID of the feed
+        seen: IDs of the articles already ingested
+        version: Hash of the last feed body that was fully ingested
+        latest_id: ID of the newest article ingested
+        latest_ts: Publish time of the newest article ingested
+        read_at: When the feed's new articles were last listed
+    """
+    feed_id: str
+    seen: BloomFilter = field(default_factory=BloomFilter)
+    version: Optional[str] = None
+    latest_id: Optional[str] = None
+    latest_ts: Optional[int] = None
+    read_at: Optional[float] = None
+
+    def advance(
+        self,
+        articles: List[Article],
+        version: Optional[str] = None,
+        current_ids: Optional[Callable[[], Iterable[str]]] = None
+    ) -> None:
+        """Record articles as ingested.
+
+        Args:
+            articles: The articles that were ingested
+            version: Hash of the feed body, if all of its entries were ingested
+            current_ids: Gets the IDs of all entries currently in the feed;
+                when the filter is full it is rebuilt from them, forgetting
+                the articles that left the feed
+        """
+        if current_ids is not None and len(self.seen) + len(articles) > self.seen.capacity:
+            seen = BloomFilter()
+            for article_id in current_ids():
+                seen.add(article_id)
+            self.seen = seen
+        for article in articles:
+            if article.id not in self.seen:
+                self.seen.add(article.id)
+            if article.published_ts is not None and (
+                self.latest_ts is None or article.published_ts > self.latest_ts
+            ):
+                self.latest_id, self.latest_ts = article.id, article.published_ts
+        if version is not None:
+            self.version = version
+
+class WatermarkStore:
+    """Persistent watermarks of all feeds, backed by SQLite."""
+
+    def __init__(self, path: Optional[Union[str, Path]] = None):
+        """Initialize the store.
+
+        Args:
+            path: Path to the database file. If None, WATERMARK_FILE inside
+                the configuration directory is used, resolved on first access.
+        """
+        self.path = Path(path) if path else None
+        self._conn: Optional[sqlite3.Connection] = None
+        self._lock = threading.RLock()
+
+    def _connect(self) -> sqlite3.Connection:
+        """Open the database on first use and make sure the schema exists."""
+        if self._conn is None:
+            path = self.path or get_config_dir() / WATERMARK_FILE
+            conn = sqlite3.connect(str(path), timeout=10, check_same_thread=False)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS watermarks ("
+                "feed_id TEXT PRIMARY KEY, version TEXT, latest_id TEXT, latest_ts INTEGER, "
+                "read_at REAL, bits BLOB NOT NULL, size INTEGER NOT NULL, "
+                "hashes INTEGER NOT NULL, capacity INTEGER NOT NULL, count INTEGER NOT NULL)"
+            )
+            # The feed version and number of articles the last listing archived
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS listings ("
+                "feed_id TEXT PRIMARY KEY, version TEXT NOT NULL, count INTEGER NOT NULL)"
+            )
+            conn.commit()
+            self._conn = conn
+        return self._conn
+
+    def get(self, feed_id: str) -> Watermark:
+        """Get the watermark of a feed (an empty one if it was never ingested)."""
+        with self._lock:
+            row = self._connect().execute(
+                "SELECT version, latest_id, latest_ts, read_at, bits, size, hashes, capacity, count "
+                "FROM watermarks WHERE feed_id = ?", (feed_id,)
+            ).fetchone()
+        if row is None:
+            return Watermark(feed_id)
+        version, latest_id, latest_ts, read_at, bits, size, hashes, capacity, count = row
+        seen = BloomFilter(capacity, bits=bits, size=size, hashes=hashes, count=count)
+        return Watermark(feed_id, seen, version, latest_id, latest_ts, read_at)
+
+    def save(self, watermark: Watermark) -> None:
+        """Store the watermark of a feed."""
+        seen = watermark.seen
+        with self._lock:
+            conn = self._connect()
+            with conn:
+                conn.execute(
+                    "INSERT OR REPLACE INTO watermarks (feed_id, version, latest_id, latest_ts, "
+                    "read_at, bits, size, hashes, capacity, count) "
+                    "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                    (
+                        watermark.feed_id, watermark.version, watermark.latest_id,
+                        watermark.latest_ts, watermark.read_at, bytes(seen.bits),
+                        seen.size, seen.hashes, seen.capacity, seen.count
+                    )
+                )
+
+    def read_marks(self, feed_ids: Iterable[str]) -> Dict[str, Optional[float]]:
+        """Get when the new articles of each feed were last listed (None if never)."""
+        feed_ids = list(feed_ids)
+        if not feed_ids:
+            return {}
+        with self._lock:
+            rows = self._connect().execute(
+                f"SELECT feed_id, read_at FROM watermarks "
+                f"WHERE feed_id IN ({', '.join('?' * len(feed_ids))})", feed_ids
+            ).fetchall()
+        marks: Dict[str, Optional[float]] = dict.fromkeys(feed_ids)
+        marks.update(rows)
+        return marks
+
+    def mark_read(self, feed_ids: Iterable[str], when: Optional[float] = None) -> None:
+        """Record that the new articles of some feeds were listed."""
+        when = time.time() if when is None else when
+        with self._lock:
+            for feed_id in feed_ids:
+                watermark = self.get(feed_id)
+                watermark.read_at = when
+                self.save(watermark)
+
+    def listed(self, feed_id: str) -> Tuple[Optional[str], int]:
+        """Get the feed version and number of articles last archived from a listing.
+
+        Returns: The version (None if never listed) and the article count
+        """
+        with self._lock:
+            row = self._connect().execute(
+                "SELECT version, count FROM listings WHERE feed_id = ?", (feed_id,)
+            ).fetchone()
+        return (row[0], row[1]) if row is not None else (None, 0)
+
+    def mark_listed(self, feed_id: str, version: str, count: int) -> None:
+        """Record that the first articles of a feed version were archived from a listing."""
+        with self._lock:
+            conn = self._connect()
+            with conn:
+                conn.execute(
+                    "INSERT OR REPLACE INTO listings (feed_id, version, count) VALUES (?, ?, ?)",
+                    (feed_id, version, count)
+                )
+
+    def remove_feed(self, feed_id: str) -> None:
+        """Forget the watermark of a feed."""
+        with self._lock:
+            conn = self._connect()
+            with conn:
+                conn.execute("DELETE FROM watermarks WHERE feed_id = ?", (feed_id,))
+                conn.execute("DELETE FROM listings WHERE feed_id = ?", (feed_id,))
+
+    def close(self) -> None:
+        """Close the database connection (it is reopened on next use)."""
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
@@ -1,9 +1,30 @@
-from dataclasses import dataclass, field
-from typing import List, Optional
+from array import array
+from dataclasses import dataclass, field, fields
+from sys import intern
+from typing import Dict, Iterable, Iterator, List, Optional, Sequence, Union
 
+def _with_slots(cls):
+  """Rebuild a dataclass with __slots__ (dataclass(slots=True) needs Python 3.10)."""
+  namespace = dict(cls.__dict__)
+  names = tuple(f.name for f in fields(cls))
+  for name in names:
+      namespace.pop(name, None)  # Class-level defaults would clash with the slots
+  namespace.pop('__dict__', None)
+  namespace.pop('__weakref__', None)
+  namespace['__slots__'] = names
+  return type(cls)(cls.__name__, cls.__bases__, namespace)
+
+def _intern(value):
+  return intern(value) if type(value) is str else value
+
+@_with_slots
 @dataclass
 class Article:
-  """Standardized article representation regardless of source format."""
+  """Standardized article representation regardless of source format.
+
+  Instances have no per-instance __dict__, and the author and category
+  strings are interned so articles of the same journal share them.
+  """
   id: str
   title: str
   link: str
@@ -13,7 +34,205 @@ class Article:
   summary: Optional[str] = None
   content: Optional[str] = None
   categories: List[str] = field(default_factory=list)
+  feed_id: Optional[str] = None  # Set when articles from several feeds are merged
+  published_ts: Optional[int] = None  # Seconds since the epoch, set by FeedParser
+  updated_ts: Optional[int] = None
+  doi: Optional[str] = None  # Normalized DOI, set by FeedParser if the entry has one
+  also_in: List[str] = field(default_factory=list)  # Other feeds carrying the same paper
 
   def __post_init__(self):
       if self.categories is None:
-          self.categories = []
\ No newline at end of file
+          self.categories = []
+      else:
+          self.categories = [_intern(category) for category in self.categories]
+      if self.also_in is None:
+          self.also_in = []
+      self.author = _intern(self.author)
+
+  def __getstate__(self):
+      return tuple(getattr(self, name) for name in self.__slots__)
+
+  def __setstate__(self, state):
+      if isinstance(state, dict):
+          # Pickled before Article had slots
+          state = tuple(state.get(name) for name in self.__slots__)
+      # Articles pickled by older versions may lack the newer fields
+      state = tuple(state) + (None,) * (len(self.__slots__) - len(state))
+      for name, value in zip(self.__slots__, state):
+          object.__setattr__(self, name, value)
+      if self.categories is None:
+          self.categories = []
+      if self.also_in is None:
+          self.also_in = []
+
+class _TextColumn:
+    """Optional strings stored as offsets into shared text chunks.
+
+    Appended strings are joined into a new chunk on the next read, so each
+    string is copied once however appends and reads interleave.
+    """
+
+    def __init__(self):
+      self._chunks: List[str] = []
+      self._parts: List[str] = []  # Appended since the last chunk was made
+      self._pending = 0  # Length of the pending parts
+      self._chunk_of = array('I')
+      self._starts = array('q')
+      self._lengths = array('q')  # -1 marks a None value
+
+    def append(self, value: Optional[str]) -> None:
+      # Pending values go to the chunk made on the next read
+      self._chunk_of.append(len(self._chunks))
+      self._starts.append(self._pending)
+      if value is None:
+          self._lengths.append(-1)
+          return
+      value = str(value)
+      self._parts.append(value)
+      self._lengths.append(len(value))
+      self._pending += len(value)
+
+    def __getitem__(self, row: int) -> Optional[str]:
+      length = self._lengths[row]
+      if length < 0:
+          return None
+      if self._parts:
+          self._chunks.append(''.join(self._parts))
+          self._parts = []
+          self._pending = 0
+      start = self._starts[row]
+      return self._chunks[self._chunk_of[row]][start:start + length]
+
+class _StringTable:
+    """Interned strings referenced by index; index 0 stands for None."""
+
+    def __init__(self):
+      self.values: List[Optional[str]] = [None]
+      self._index: Dict[Optional[str], int] = {None: 0}
+
+    def add(self, value: Optional[str]) -> int:
+      index = self._index.get(value)
+      if index is None:
+          index = len(self.values)
+          self.values.append(_intern(value))
+          self._index[value] = index
+      return index
+
+class _StringListColumn:
+    """Lists of strings stored as string table indexes, with one offset per row."""
+
+    def __init__(self, strings: _StringTable):
+      self._strings = strings
+      self._starts = array('I', [0])
+      self._values = array('I')
+
+    def append(self, values: Optional[Iterable[str]]) -> None:
+      self._values.extend(self._strings.add(value) for value in values or [])
+      self._starts.append(len(self._values))
+
+    def __getitem__(self, row: int) -> List[str]:
+      strings = self._strings.values
+      return [strings[index] for index in self._values[self._starts[row]:self._starts[row + 1]]]
+
+class ArticleBatch:
+    """Column-wise storage for many articles.
+
+    Text fields live in shared buffers addressed by offsets, and authors,
+    categories and feed IDs are stored once in string tables, so holding a
+    large archive costs little more than its text. Rows are handed out as
+    regular Article objects, created on access, so formatters and the
+    controller can use a batch wherever they take a list of articles.
+    """
+
+    _TEXT_FIELDS = ('id', 'title', 'link', 'published', 'updated', 'summary', 'content', 'doi')
+    _LIST_FIELDS = ('categories', 'also_in')
+    _TIMESTAMP_FIELDS = ('published_ts', 'updated_ts')
+    _NO_TIMESTAMP = -2 ** 63
+
+    def __init__(self, articles: Iterable[Article] = ()):
+      """Initialize a batch.
+
+      Args:
+          articles: Articles to add to the batch
+      """
+      self._text = {name: _TextColumn() for name in self._TEXT_FIELDS}
+      self._strings = _StringTable()
+      self._authors = array('I')
+      self._feed_ids = array('I')
+      self._timestamps = {name: array('q') for name in self._TIMESTAMP_FIELDS}
+      self._lists = {name: _StringListColumn(self._strings) for name in self._LIST_FIELDS}
+      self._rows_by_id: Optional[Dict[str, int]] = None
+      self.extend(articles)
+
+    def append(self, article: Article) -> None:
+      """Add one article to the end of the batch."""
+      for name, column in self._text.items():
+          column.append(getattr(article, name))
+      self._authors.append(self._strings.add(article.author))
+      self._feed_ids.append(self._strings.add(article.feed_id))
+      for name, column in self._timestamps.items():
+          value = getattr(article, name)
+          column.append(self._NO_TIMESTAMP if value is None else value)
+      for name, column in self._lists.items():
+          column.append(getattr(article, name))
+      if self._rows_by_id is not None:
+          self._rows_by_id.setdefault(article.id, len(self) - 1)
+
+    def extend(self, articles: Iterable[Article]) -> None:
+      """Add several articles to the end of the batch."""
+      for article in articles:
+          self.append(article)
+
+    def __len__(self) -> int:
+      return len(self._authors)
+
+    def __getitem__(self, index: Union[int, slice]) -> Union[Article, List[Article]]:
+      if isinstance(index, slice):
+          return [self._row(row) for row in range(*index.indices(len(self)))]
+      if index < 0:
+          index += len(self)
+      if not 0 <= index < len(self):
+          raise IndexError("ArticleBatch index out of range")
+      return self._row(index)
+
+    def __iter__(self) -> Iterator[Article]:
+      return (self._row(row) for row in range(len(self)))
+
+    def _row(self, row: int) -> Article:
+      values = {name: column[row] for name, column in self._text.items()}
+      for name, column in self._timestamps.items():
+          values[name] = None if column[row] == self._NO_TIMESTAMP else column[row]
+      for name, column in self._lists.items():
+          values[name] = column[row]
+      strings = self._strings.values
+      return Article(
+        author=strings[self._authors[row]],
+        feed_id=strings[self._feed_ids[row]],
+        **values
+      )
+
+    def get(self, article_id: str) -> Optional[Article]:
+      """Get an article by ID, or None if the batch doesn't contain it."""
+      if self._rows_by_id is None:
+          id_column = self._text['id']
+          self._rows_by_id = {}
+          for row in range(len(self)):
+              self._rows_by_id.setdefault(id_column[row], row)
+      row = self._rows_by_id.get(article_id)
+      return None if row is None else self._row(row)
+
+    def column(self, name: str) -> Sequence[Optional[str]]:
+      """Get the values of one field for all rows, without building Articles."""
+      if name in self._text:
+          column = self._text[name]
+          return [column[row] for row in range(len(self))]
+      if name in self._timestamps:
+          return [None if value == self._NO_TIMESTAMP else value
+                  for value in self._timestamps[name]]
+      if name in self._lists:
+          column = self._lists[name]
+          return [column[row] for row in range(len(self))]
+      if name in ('author', 'feed_id'):
+          indexes = self._authors if name == 'author' else self._feed_ids
+          return [self._strings.values[index] for index in indexes]
+      raise ValueError(f"Unknown article field: {name}")
@@ -0,0 +1,181 @@
+"""Asyncio-native feed source for use inside an event loop."""
+
+from typing import Iterator, List, Mapping, Optional, Tuple
+import asyncio
+import logging
+import time
+
+try:
+    import aiohttp
+except ImportError:  # Optional dependency, installed with biofeed[async]
+    aiohttp = None
+
+from biofeed.feeds.article import Article
+from biofeed.feeds.feed_parser import ParsedFeed
+from biofeed.feeds.feed_source import FeedSource
+from biofeed.utils.config import DEFAULT_CONFIG
+
+# Set up logging
+logger = logging.getLogger(__name__)
+
+HTTP_CONFIG = DEFAULT_CONFIG.get("http", {})
+
+def require_aiohttp() -> None:
+    """Raise an informative error if aiohttp is not installed."""
+    if aiohttp is None:
+        raise ImportError(
+            "The asyncio API requires aiohttp. "
+            "Install it with: pip install 'biofeed[async]'"
+        )
+
+def create_session(
+    max_connections: int = 100, max_per_host: int = 2
+) -> "aiohttp.ClientSession":
+    """Create an aiohttp session with bounded, kept-alive connection pools.
+
+    Must be called from within a running event loop.
+
+    Args:
+        max_connections: Maximum number of concurrent connections overall
+        max_per_host: Maximum number of concurrent connections per host
+    Returns: A new ClientSession (the caller is responsible for closing it)
+    """
+    require_aiohttp()
+    return aiohttp.ClientSession(
+        connector=aiohttp.TCPConnector(limit=max_connections, limit_per_host=max_per_host),
+        timeout=aiohttp.ClientTimeout(total=HTTP_CONFIG.get("timeout", 10)),
+        headers={"User-Agent": HTTP_CONFIG.get("user_agent", "biofeed")}
+    )
+
+class AsyncFeedSource:
+    """Asyncio counterpart of FeedSource.
+
+    Wraps a FeedSource and shares its cache entries and validators, but
+    downloads with aiohttp and runs parsing and cache I/O in worker threads
+    so the event loop is never blocked.
+    """
+
+    def __init__(self, source: FeedSource, session: Optional["aiohttp.ClientSession"] = None):
+        """Initialize an async feed source.
+
+        Args:
+            source: The feed source to wrap
+            session: Optional shared aiohttp session. If None, a short-lived
+                session is created for each download.
+        """
+        require_aiohttp()
+        self.source = source
+        self._session = session
+
+    @property
+    def name(self) -> str:
+        return self.source.name
+
+    @property
+    def url(self) -> str:
+        return self.source.url
+
+    @property
+    def category(self) -> str:
+        return self.source.category
+
+    async def fetch(self, force_refresh: bool = False) -> ParsedFeed:
+        """Fetch the feed content from source or cache.
+
+        Args: force_refresh: Whether to force a refresh of the feed data
+        Returns: The normalized feed data
+        Raises: ValueError: If the feed cannot be fetched or parsed
+        """
+        source = self.source
+        if not force_refresh:
+            cached_data = await asyncio.to_thread(source.cached, source.cache_duration)
+            if cached_data is not None:
+                return cached_data
+
+        logger.info(f"Fetching feed from {source.url}")
+
+        headers = await asyncio.to_thread(source.validator_headers)
+        status, content, response_headers = await self._download(headers)
+        if status == 304:
+            data = await asyncio.to_thread(source.not_modified, response_headers)
+            if data is not None:
+                return data
+            # Cached data vanished in the meantime, fetch it unconditionally
+            status, content, response_headers = await self._download({})
+
+        # Parsing is CPU-bound: keep it off the event loop
+        return await asyncio.to_thread(source.ingest, content, response_headers)
+
+    async def _download(self, headers: Mapping[str, str]) -> Tuple[int, bytes, Mapping[str, str]]:
+        """Download the feed body once.
+
+        Args: headers: Request headers (e.g. conditional validators)
+        Returns: Status code, body and response headers
+        Raises: ValueError: If the feed cannot be downloaded
+        """
+        start = time.perf_counter()
+        try:
+            if self._session is not None:
+                return await self._request(self._session, headers)
+            async with create_session() as session:
+                return await self._request(session, headers)
+        except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+            logger.error(f"Failed to download feed: {e}")
+            raise ValueError(f"Failed to fetch feed at {self.url}: {e}")
+        finally:
+            self.source.timings["download"] = time.perf_counter() - start
+
+    async def _request(
+        self, session: "aiohttp.ClientSession", headers: Mapping[str, str]
+    ) -> Tuple[int, bytes, Mapping[str, str]]:
+        """Send the GET request and read the whole body."""
+        async with session.get(self.url, headers=headers) as response:
+            response.raise_for_status()
+            content = await response.read()
+            return response.status, content, response.headers.copy()
+
+    async def get_feed(self, force_refresh: bool = False) -> ParsedFeed:
+        """Get the normalized feed data, without normalizing any more entries.
+
+        Args: force_refresh: Whether to force a refresh of the feed data
+        Returns: The ParsedFeed holding the feed's articles
+        """
+        feed_data = await self.fetch(force_refresh)
+        # Raw data from older cache entries gets normalized in full
+        return await asyncio.to_thread(self.source.as_parsed, feed_data)
+
+    async def get_articles(self, force_refresh: bool = False) -> List[Article]:
+        """Get list of articles in standardized format.
+
+        Args: force_refresh: Whether to force a refresh of the feed data
+        Returns: List of Article objects
+        """
+        parsed = await self.get_feed(force_refresh)
+        # Entries are normalized lazily, and normalizing is CPU-bound too
+        # (dates, content cleaning): keep it off the event loop
+        return await asyncio.to_thread(self.source.all_articles, parsed)
+
+    async def iter_articles(self, force_refresh: bool = False) -> Iterator[Article]:
+        """Fetch the feed and return an iterator that normalizes entries lazily.
+
+        Entries are normalized by whichever thread advances the iterator, and
+        stored in the cache by the one that exhausts or closes it, so inside
+        an event loop consume and close it in a worker thread (asyncio.to_thread).
+
+        Args: force_refresh: Whether to force a refresh of the feed data
+        Returns: Iterator of Article objects in feed order
+        """
+        return self.source.iter_storing(await self.get_feed(force_refresh))
+
+    async def get_article(self, article_id: str) -> Article:
+        """Get a single article by ID.
+
+        Args: article_id: ID of the article to retrieve
+        Returns: The requested Article object
+        Raises: ValueError: If the article is not found
+        """
+        parsed = await self.get_feed()
+        return await asyncio.to_thread(self.source.lookup, parsed, article_id)
+
+    def __repr__(self) -> str:
+        return f"AsyncFeedSource({self.source!r})"
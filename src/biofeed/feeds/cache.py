@@ -1,99 +1,502 @@
 """Cache system for feed data."""
 
+from collections import OrderedDict
 from datetime import datetime, timedelta
-from typing import Dict, Any, Optional
+from pathlib import Path
+from typing import Dict, Any, Optional, Tuple, Union
+import json
+import logging
+import pickle
+import sqlite3
+import sys
+import threading
+import time
 
-from biofeed.utils.config import DEFAULT_CONFIG
+from biofeed.utils.config import DEFAULT_CONFIG, get_config_dir
+
+logger = logging.getLogger(__name__)
 
 # Default cache duration from config or fallback to 1 hour (3600 seconds)
 CACHE_DURATION = DEFAULT_CONFIG.get("cache_duration", 3600)
 
+# Name of the persistent cache database inside the config directory
+CACHE_FILE = DEFAULT_CONFIG.get("cache_file", "cache.db")
+
+# Bounds on the in-memory part of the cache (see FeedCache)
+CACHE_LIMITS = DEFAULT_CONFIG.get("cache_limits", {})
+
+class SQLiteCacheBackend:
+    """Persistent cache storage backed by a SQLite database.
+
+    Entries are pickled and stored along with the time they were cached and
+    their metadata (e.g. HTTP validators), so they survive across processes
+    (every CLI command is a new process).
+    """
+
+    def __init__(self, path: Optional[Union[str, Path]] = None):
+      """Initialize the backend.
+
+      Args:
+          path: Path to the database file. If None, CACHE_FILE inside the
+              configuration directory is used, resolved on first access.
+      """
+      self.path = Path(path) if path else None
+      self._conn: Optional[sqlite3.Connection] = None
+      self._lock = threading.RLock()
+
+    def _connect(self) -> sqlite3.Connection:
+      """Open the database on first use and make sure the schema exists."""
+      if self._conn is None:
+          path = self.path or get_config_dir() / CACHE_FILE
+          conn = sqlite3.connect(str(path), timeout=10, check_same_thread=False)
+          conn.execute("PRAGMA journal_mode=WAL")
+          conn.execute(
+              "CREATE TABLE IF NOT EXISTS feed_cache ("
+              "key TEXT PRIMARY KEY, timestamp REAL NOT NULL, data BLOB NOT NULL, "
+              "metadata TEXT NOT NULL DEFAULT '{}')"
+          )
+          columns = {row[1] for row in conn.execute("PRAGMA table_info(feed_cache)")}
+          if "metadata" not in columns:
+              # Databases created before validators were stored
+              conn.execute(
+                  "ALTER TABLE feed_cache ADD COLUMN metadata TEXT NOT NULL DEFAULT '{}'"
+              )
+          conn.commit()
+          self._conn = conn
+      return self._conn
+
+    def load(self, key: str) -> Optional[Tuple[Any, datetime, Dict[str, Any], int]]:
+      """Load an entry with its timestamp, metadata and stored size, or None if not stored."""
+      with self._lock:
+          row = self._connect().execute(
+              "SELECT data, timestamp, metadata FROM feed_cache WHERE key = ?", (key,)
+          ).fetchone()
+      if row is None:
+          return None
+      return (
+          pickle.loads(row[0]), datetime.fromtimestamp(row[1]), json.loads(row[2]), len(row[0])
+      )
+
+    def store(
+        self, key: str, data: Any, timestamp: datetime, metadata: Dict[str, Any]
+    ) -> int:
+      """Store an entry, replacing any previous value for the key.
+
+      Returns:
+          Size of the stored (pickled) data in bytes
+      """
+      blob = pickle.dumps(data, protocol=pickle.HIGHEST_PROTOCOL)
+      with self._lock:
+          conn = self._connect()
+          conn.execute(
+              "INSERT OR REPLACE INTO feed_cache (key, timestamp, data, metadata) "
+              "VALUES (?, ?, ?, ?)",
+              (key, timestamp.timestamp(), blob, json.dumps(metadata))
+          )
+          conn.commit()
+      return len(blob)
+
+    def replace(self, key: str, data: Any, timestamp: datetime) -> Optional[int]:
+      """Rewrite the data of an entry unless it was stored or revalidated after timestamp.
+
+      Returns:
+          Size of the stored (pickled) data in bytes, or None if the entry
+          is newer (e.g. written by another process) or gone
+      """
+      blob = pickle.dumps(data, protocol=pickle.HIGHEST_PROTOCOL)
+      with self._lock:
+          conn = self._connect()
+          # Allow for stored times being rounded to microseconds
+          updated = conn.execute(
+              "UPDATE feed_cache SET data = ? WHERE key = ? AND timestamp <= ?",
+              (blob, key, timestamp.timestamp() + 0.001)
+          ).rowcount
+          conn.commit()
+      return len(blob) if updated else None
+
+    def touch(self, key: str, timestamp: datetime, metadata: Dict[str, Any]) -> None:
+      """Update the timestamp and metadata of an entry without rewriting its data."""
+      with self._lock:
+          conn = self._connect()
+          conn.execute(
+              "UPDATE feed_cache SET timestamp = ?, metadata = ? WHERE key = ?",
+              (timestamp.timestamp(), json.dumps(metadata), key)
+          )
+          conn.commit()
+
+    def delete_older_than(self, cutoff: datetime) -> int:
+      """Delete entries stored or revalidated before a point in time.
+
+      Returns:
+          Number of deleted entries
+      """
+      with self._lock:
+          conn = self._connect()
+          deleted = conn.execute(
+              "DELETE FROM feed_cache WHERE timestamp < ?", (cutoff.timestamp(),)
+          ).rowcount
+          conn.commit()
+      return deleted
+
+    def clear(self) -> None:
+      """Delete all stored entries."""
+      with self._lock:
+          conn = self._connect()
+          conn.execute("DELETE FROM feed_cache")
+          conn.commit()
+
+    def close(self) -> None:
+      """Close the database connection (it is reopened on next use)."""
+      with self._lock:
+          if self._conn is not None:
+              self._conn.close()
+              self._conn = None
+
 class FeedCache:
-    """Cache system for feed data."""
-    
-    def __init__(self):
-      """Initialize an empty cache."""
-      self._cache: Dict[str, Any] = {}
+    """Cache system for feed data.
+
+    Entries are kept in memory and, when a backend is given, written through
+    to persistent storage so that later processes can reuse them.
+
+    The in-memory part is bounded for long-running processes: entries older
+    than the TTL are swept out (lazily, at most every sweep_interval seconds),
+    and the least recently used entries are evicted once max_entries or
+    max_bytes is exceeded. Evicted entries stay in the backend and are loaded
+    again on demand.
+    """
+
+    def __init__(
+        self,
+        backend: Optional[SQLiteCacheBackend] = None,
+        max_entries: Optional[int] = None,
+        max_bytes: Optional[int] = None,
+        ttl: Optional[int] = None,
+        sweep_interval: Optional[int] = None
+    ):
+      """Initialize an empty cache.
+
+      Args:
+          backend: Optional persistent storage backend. If None, the cache
+              only lives as long as the current process.
+          max_entries: Maximum number of entries held in memory
+              (defaults to CACHE_LIMITS["max_entries"]; 0 means unlimited)
+          max_bytes: Maximum total size of the entries held in memory, as
+              measured by their pickled size (0 means unlimited)
+          ttl: Seconds after which an entry is dropped altogether, from memory
+              and from the backend (0 means never)
+          sweep_interval: Minimum number of seconds between expiry sweeps
+      """
+      self._cache: "OrderedDict[str, Any]" = OrderedDict()  # Least recently used first
       self._timestamps: Dict[str, datetime] = {}
-    
+      self._metadata: Dict[str, Dict[str, Any]] = {}
+      self._sizes: Dict[str, int] = {}
+      self._backend = backend
+      self.max_entries = CACHE_LIMITS.get("max_entries", 0) if max_entries is None else max_entries
+      self.max_bytes = CACHE_LIMITS.get("max_bytes", 0) if max_bytes is None else max_bytes
+      self.ttl = CACHE_LIMITS.get("ttl", 0) if ttl is None else ttl
+      self.sweep_interval = (
+          CACHE_LIMITS.get("sweep_interval", 300) if sweep_interval is None else sweep_interval
+      )
+      self._last_sweep = 0.0
+      self._bytes = 0
+      self._hits = self._misses = self._evictions = self._expirations = 0
+      self._lock = threading.RLock()
+
+    def _put(self, key: str, data: Any, timestamp: datetime, metadata: Dict[str, Any], size: int) -> None:
+      """Hold an entry in memory as the most recently used one."""
+      self._drop(key)
+      self._cache[key] = data
+      self._timestamps[key] = timestamp
+      self._metadata[key] = metadata
+      self._sizes[key] = size
+      self._bytes += size
+      self._evict()
+
+    def _drop(self, key: str) -> None:
+      """Remove an entry from memory (the backend is left alone)."""
+      self._cache.pop(key, None)
+      self._timestamps.pop(key, None)
+      self._metadata.pop(key, None)
+      self._bytes -= self._sizes.pop(key, 0)
+
+    def _evict(self) -> None:
+      """Evict least recently used entries until the cache is within budget.
+
+      The most recently used entry is always kept, even if it alone exceeds
+      max_bytes.
+      """
+      while len(self._cache) > 1 and (
+          (self.max_entries and len(self._cache) > self.max_entries)
+          or (self.max_bytes and self._bytes > self.max_bytes)
+      ):
+          self._drop(next(iter(self._cache)))
+          self._evictions += 1
+
+    def _load(self, key: str) -> bool:
+      """Make sure an entry is in memory, loading it from the backend if needed.
+
+      Returns:
+          True if the entry is available, False otherwise
+      """
+      self._maybe_sweep()
+      if key in self._cache and key in self._timestamps:
+          self._cache.move_to_end(key)
+          return True
+      if self._backend is None:
+          return False
+
+      try:
+          entry = self._backend.load(key)
+      except Exception as e:
+          logger.warning(f"Failed to read cache entry for {key}: {e}")
+          return False
+
+      if entry is None:
+          return False
+      self._put(key, *entry)
+      return True
+
+    def _maybe_sweep(self) -> None:
+      """Run an expiry sweep if the last one is older than sweep_interval."""
+      if self.ttl and time.monotonic() - self._last_sweep >= self.sweep_interval:
+          self.sweep()
+
+    def sweep(self) -> int:
+      """Drop all entries older than the TTL, from memory and from the backend.
+
+      Returns:
+          Number of entries dropped from memory
+      """
+      with self._lock:
+          self._last_sweep = time.monotonic()
+          if not self.ttl:
+              return 0
+          cutoff = datetime.now() - timedelta(seconds=self.ttl)
+          expired = [key for key, timestamp in self._timestamps.items() if timestamp < cutoff]
+          for key in expired:
+              self._drop(key)
+          self._expirations += len(expired)
+
+          if self._backend is not None:
+              try:
+                  self._backend.delete_older_than(cutoff)
+              except Exception as e:
+                  logger.warning(f"Failed to sweep persistent cache: {e}")
+          return len(expired)
+
     def get(self, key: str, max_age: Optional[int] = None) -> Optional[Any]:
       """Get an item from cache if it exists and is not too old.
-      
+
       Args:
           key: Cache key (usually the feed URL)
           max_age: Maximum age in seconds (defaults to CACHE_DURATION)
-              
+
       Returns:
           Cached data or None if not found or expired
       """
       if max_age is None:
           max_age = CACHE_DURATION
-          
-      if key in self._cache and key in self._timestamps:
-          age = (datetime.now() - self._timestamps[key]).total_seconds()
-          if age <= max_age:
-              return self._cache[key]
-      return None
-    
-    def set(self, key: str, data: Any) -> None:
+
+      with self._lock:
+          if self._load(key):
+              age = (datetime.now() - self._timestamps[key]).total_seconds()
+              if age <= max_age:
+                  self._hits += 1
+                  return self._cache[key]
+          self._misses += 1
+          return None
+
+    def set(self, key: str, data: Any, metadata: Optional[Dict[str, Any]] = None) -> None:
       """Store an item in the cache.
-      
+
       Args:
           key: Cache key (usually the feed URL)
           data: Data to store
+          metadata: Optional JSON-serializable metadata kept with the entry,
+              such as the HTTP validators (ETag, Last-Modified)
       """
-      self._cache[key] = data
-      self._timestamps[key] = datetime.now()
-    
+      timestamp = datetime.now()
+      metadata = metadata or {}
+      size = None
+
+      if self._backend is not None:
+          try:
+              size = self._backend.store(key, data, timestamp, metadata)
+          except Exception as e:
+              # Keep the in-memory entry even if it cannot be persisted
+              logger.warning(f"Failed to persist cache entry for {key}: {e}")
+
+      with self._lock:
+          self._maybe_sweep()
+          self._put(key, data, timestamp, metadata, _sizeof(data) if size is None else size)
+
+    def replace(self, key: str, data: Any) -> bool:
+      """Store the updated contents of a cached item, keeping its age and metadata.
+
+      For data changed in place (e.g. a feed whose entries were normalized
+      after it was cached). Nothing is written if the item no longer holds
+      this very object, or the backend holds a newer entry.
+
+      Args:
+          key: Cache key
+          data: The object the item holds
+
+      Returns:
+          True if the contents were stored
+      """
+      with self._lock:
+          if key not in self._cache or self._cache[key] is not data:
+              return False
+          size = None
+          if self._backend is not None:
+              try:
+                  size = self._backend.replace(key, data, self._timestamps[key])
+              except Exception as e:
+                  logger.warning(f"Failed to persist cache entry for {key}: {e}")
+              if size is None:
+                  return False
+          else:
+              size = _sizeof(data)
+          self._bytes += size - self._sizes.get(key, 0)
+          self._sizes[key] = size
+          self._evict()
+          return True
+
+    def get_metadata(self, key: str) -> Dict[str, Any]:
+      """Get the metadata stored with an item, regardless of its age.
+
+      Args:
+          key: Cache key
+
+      Returns:
+          Metadata dictionary (empty if key not found)
+      """
+      with self._lock:
+          if self._load(key):
+              return self._metadata.get(key, {})
+          return {}
+
+    def revalidate(self, key: str, metadata: Optional[Dict[str, Any]] = None) -> Optional[Any]:
+      """Mark an existing item as fresh again without replacing its data.
+
+      Used when the source confirms that the cached data is still current
+      (e.g. an HTTP 304 Not Modified response).
+
+      Args:
+          key: Cache key
+          metadata: Optional metadata to merge into the stored metadata
+
+      Returns:
+          The cached data or None if key not found
+      """
+      with self._lock:
+          if not self._load(key):
+              return None
+
+          self._timestamps[key] = datetime.now()
+          if metadata:
+              self._metadata[key] = {**self._metadata.get(key, {}), **metadata}
+          if self._backend is not None:
+              try:
+                  self._backend.touch(key, self._timestamps[key], self._metadata.get(key, {}))
+              except Exception as e:
+                  logger.warning(f"Failed to update cache timestamp for {key}: {e}")
+          return self._cache[key]
+
+    def stats(self) -> Dict[str, int]:
+      """Get counters describing the in-memory cache.
+
+      Returns:
+          Dictionary with hits, misses, evictions (LRU), expirations (TTL),
+          the number of entries and bytes held, and the configured limits
+      """
+      with self._lock:
+          return {
+              "hits": self._hits,
+              "misses": self._misses,
+              "evictions": self._evictions,
+              "expirations": self._expirations,
+              "entries": len(self._cache),
+              "bytes": self._bytes,
+              "max_entries": self.max_entries,
+              "max_bytes": self.max_bytes,
+          }
+
     def clear(self) -> None:
       """Clear the entire cache."""
-      self._cache.clear()
-      self._timestamps.clear()
-    
+      with self._lock:
+          for key in list(self._cache):
+              self._drop(key)
+
+          if self._backend is not None:
+              try:
+                  self._backend.clear()
+              except Exception as e:
+                  logger.warning(f"Failed to clear persistent cache: {e}")
+
+    def close(self) -> None:
+      """Drop in-memory entries and close the persistent backend, if any."""
+      with self._lock:
+          for key in list(self._cache):
+              self._drop(key)
+          if self._backend is not None:
+              self._backend.close()
+
     def get_timestamp(self, key: str) -> Optional[datetime]:
       """Get the timestamp when an item was cached.
-      
+
       Args:
           key: Cache key
-          
+
       Returns:
           Timestamp or None if key not found
       """
-      return self._timestamps.get(key)
-    
+      with self._lock:
+          if self._load(key):
+              return self._timestamps[key]
+          return None
+
     def get_age(self, key: str) -> Optional[float]:
       """Get the age of a cached item in seconds.
-      
+
       Args:
           key: Cache key
-          
+
       Returns:
           Age in seconds or None if key not found
       """
-      if key in self._timestamps:
-          return (datetime.now() - self._timestamps[key]).total_seconds()
-      return None
-    
+      with self._lock:
+          if self._load(key):
+              return (datetime.now() - self._timestamps[key]).total_seconds()
+          return None
+
     def is_expired(self, key: str, max_age: Optional[int] = None) -> bool:
       """Check if a cached item is expired.
-      
+
       Args:
           key: Cache key
           max_age: Maximum age in seconds (defaults to CACHE_DURATION)
-          
+
       Returns:
           True if expired or not found, False otherwise
       """
       if max_age is None:
           max_age = CACHE_DURATION
-          
+
       age = self.get_age(key)
       if age is None:
           return True
       return age > max_age
 
-# Global cache instance
-cache = FeedCache()
+def _sizeof(data: Any) -> int:
+  """Estimate the memory held by an entry from its pickled size."""
+  try:
+      return len(pickle.dumps(data, protocol=pickle.HIGHEST_PROTOCOL))
+  except Exception:
+      return sys.getsizeof(data)
+
+# Global cache instance, persisted under the configuration directory
+cache = FeedCache(SQLiteCacheBackend())
 
 # Legacy functions for backward compatibility
 def get_from_cache(url: str, max_age: Optional[int] = None) -> Optional[Any]:
@@ -106,4 +509,4 @@ def store_in_cache(url: str, data: Any) -> None:
 
 def clear_cache() -> None:
   """Clear the entire cache."""
-  cache.clear()
\ No newline at end of file
+  cache.clear()
@@ -0,0 +1,249 @@
+"""Detection of the same paper appearing in several feeds.
+
+Papers are matched exactly by DOI or by canonical URL, and approximately by
+title: titles are summarized as MinHash signatures, and locality-sensitive
+hashing of the signatures finds candidate matches in constant time per
+article, so deduplicating a large archive never compares all pairs.
+"""
+
+from dataclasses import replace
+from typing import Dict, Iterable, Iterator, List, Optional, Set, Tuple
+from urllib.parse import parse_qsl, unquote, urlencode, urlsplit, urlunsplit
+import hashlib
+import html
+import re
+
+from biofeed.feeds.article import Article
+
+# Crossref's recommended pattern for modern DOIs
+_DOI_RE = re.compile(r"10\.\d{4,9}/[-._;()/:a-z0-9]+", re.IGNORECASE)
+_DOI_TRAILING = ".,;:)/"
+# Preprint versions (bioRxiv/medRxiv "v2") are the same paper
+_VERSION_RE = re.compile(r"v\d+$")
+_PREPRINT_PREFIXES = ("10.1101/",)
+
+# Publishers whose article links embed the DOI suffix but not the prefix
+_LINK_DOIS = (
+    (re.compile(r"nature\.com/articles/([a-z0-9.\-]+)", re.IGNORECASE), "10.1038/{}"),
+)
+
+# Query parameters that only track where a click came from
+_TRACKING_PARAMS = frozenset(("rss", "ref", "source", "via", "cmp", "cmpid", "af", "fbclid", "gclid"))
+
+_TAG_RE = re.compile(r"<[^>]+>")
+_NON_WORD_RE = re.compile(r"[\W_]+")
+
+# Titles shorter than this (after normalization) are never matched, since
+# short titles like "Correction" or "Editorial" are shared by different papers
+MIN_TITLE_LENGTH = 24
+SHINGLE_SIZE = 4
+SIGNATURE_SIZE = 64
+BANDS = 16  # 4 rows per band: pairs with a Jaccard similarity of 0.5 or more become candidates
+TITLE_SIMILARITY = 0.85  # Jaccard similarity of title shingles required for a match
+
+_BORROW_OFFSET = 1 << 58
+
+def normalize_doi(value: Optional[str]) -> Optional[str]:
+    """Find a DOI in a string (a bare DOI, doi: URI or URL) and normalize it.
+
+    DOIs are case-insensitive, so the result is lowercase; preprint version
+    suffixes are dropped.
+
+    Returns:
+        The DOI, or None if the string contains none
+    """
+    if not value:
+        return None
+    match = _DOI_RE.search(unquote(value))
+    if not match:
+        return None
+    doi = match.group(0).rstrip(_DOI_TRAILING).lower()
+    if doi.startswith(_PREPRINT_PREFIXES):
+        doi = _VERSION_RE.sub("", doi)
+    return doi
+
+def find_doi(*candidates: Optional[str]) -> Optional[str]:
+    """Get the DOI of an entry from its GUID, identifiers or link, in that order.
+
+    Links of publishers that leave the DOI prefix out (e.g. Nature) are
+    recognized too.
+    """
+    for candidate in candidates:
+        doi = normalize_doi(candidate)
+        if doi:
+            return doi
+    for candidate in candidates:
+        for pattern, template in _LINK_DOIS:
+            match = pattern.search(candidate or "")
+            if match:
+                return template.format(match.group(1).lower())
+    return None
+
+def canonical_url(url: Optional[str]) -> Optional[str]:
+    """Normalize an article URL so that links to the same page compare equal.
+
+    The scheme, a leading "www.", fragments, trailing slashes and tracking
+    parameters are dropped, and the remaining parameters are sorted.
+    """
+    if not url or not url.strip():
+        return None
+    parts = urlsplit(url.strip())
+    host = parts.netloc.lower()
+    if host.startswith("www."):
+        host = host[4:]
+    query = sorted(
+        (key, value) for key, value in parse_qsl(parts.query, keep_blank_values=True)
+        if key.lower() not in _TRACKING_PARAMS and not key.lower().startswith("utm_")
+    )
+    return urlunsplit(("", host, parts.path.rstrip("/"), urlencode(query), "")).lstrip("/")
+
+def normalize_title(title: Optional[str]) -> str:
+    """Lowercase a title and reduce it to its words."""
+    if not title:
+        return ""
+    text = _TAG_RE.sub(" ", html.unescape(title)).lower()
+    return " ".join(_NON_WORD_RE.sub(" ", text).split())
+
+def shingles(text: str, size: int = SHINGLE_SIZE) -> Set[str]:
+    """Get the set of character n-grams of a text."""
+    if len(text) <= size:
+        return {text} if text else set()
+    return {text[i:i + size] for i in range(len(text) - size + 1)}
+
+def minhash(features: Iterable[str]) -> Tuple[int, ...]:
+    """Compute the MinHash signature of a set of features.
+
+    The fraction of positions at which two signatures agree estimates the
+    Jaccard similarity of the two sets. One-permutation hashing is used:
+    each feature is hashed once into one of SIGNATURE_SIZE bins, keeping
+    the minimum per bin, and empty bins borrow from the next filled bin.
+    Hashes are stable across processes (unlike hash()).
+    """
+    bins: List[Optional[int]] = [None] * SIGNATURE_SIZE
+    for feature in features:
+        value = int.from_bytes(hashlib.blake2b(feature.encode(), digest_size=8).digest(), "little")
+        index, value = value % SIGNATURE_SIZE, value // SIGNATURE_SIZE
+        current = bins[index]
+        if current is None or value < current:
+            bins[index] = value
+    if all(value is None for value in bins):
+        return ()
+    signature = []
+    for index in range(SIGNATURE_SIZE):
+        distance = 0
+        while bins[(index + distance) % SIGNATURE_SIZE] is None:
+            distance += 1
+        # The offset keeps borrowed values from colliding with the originals
+        signature.append(bins[(index + distance) % SIGNATURE_SIZE] + distance * _BORROW_OFFSET)
+    return tuple(signature)
+
+def jaccard(first: Set[str], second: Set[str]) -> float:
+    """Jaccard similarity of two sets."""
+    if not first or not second:
+        return 0.0
+    return len(first & second) / len(first | second)
+
+class Deduplicator:
+    """Recognizes articles that were already seen, possibly in another feed.
+
+    Articles are added one by one; each is either new, and remembered, or a
+    duplicate of an earlier one. Matching keys are, in order: the DOI, the
+    canonical URL and, for titles long enough to be distinctive, the exact
+    normalized title or a near-identical one found through LSH.
+    """
+
+    def __init__(self, title_similarity: float = TITLE_SIMILARITY):
+      """Initialize the deduplicator.
+
+      Args:
+          title_similarity: Jaccard similarity of the title shingles above
+              which two titles are considered the same
+      """
+      self.title_similarity = title_similarity
+      self._exact: Dict[str, Article] = {}
+      self._buckets: Dict[Tuple[int, Tuple[int, ...]], List[Tuple[Article, Set[str]]]] = {}
+
+    @staticmethod
+    def _keys(article: Article) -> List[str]:
+      keys = []
+      doi = normalize_doi(article.doi) or find_doi(article.link)
+      if doi:
+          keys.append(f"doi:{doi}")
+      url = canonical_url(article.link)
+      if url:
+          keys.append(f"url:{url}")
+      title = normalize_title(article.title)
+      if len(title) >= MIN_TITLE_LENGTH:
+          keys.append(f"title:{title}")
+      return keys
+
+    def _match(
+        self, article: Article, keys: List[str]
+    ) -> Tuple[Optional[Article], List[Tuple[int, Tuple[int, ...]]], Set[str]]:
+      for key in keys:
+          original = self._exact.get(key)
+          if original is not None:
+              return original, [], set()
+
+      title = normalize_title(article.title)
+      if len(title) < MIN_TITLE_LENGTH:
+          return None, [], set()
+      features = shingles(title)
+      signature = minhash(features)
+      rows = SIGNATURE_SIZE // BANDS
+      bands = [(band, signature[band * rows:(band + 1) * rows]) for band in range(BANDS)]
+      for band in bands:
+          for candidate, candidate_features in self._buckets.get(band, ()):
+              if jaccard(features, candidate_features) >= self.title_similarity:
+                  return candidate, [], set()
+      return None, bands, features
+
+    def add(self, article: Article, feed_id: Optional[str] = None) -> Tuple[Article, bool]:
+      """Add an article, merging it into an earlier copy of the same paper.
+
+      New papers are remembered as a copy of the article, so merging never
+      changes articles held by feed caches.
+
+      Args:
+          article: The article to add
+          feed_id: Feed the article came from (defaults to article.feed_id)
+
+      Returns:
+          The paper's article (for a duplicate, the earlier one with this
+          article's feed added to its also_in) and whether it is new
+      """
+      keys = self._keys(article)
+      original, bands, features = self._match(article, keys)
+      if original is None:
+          paper = replace(article, also_in=list(article.also_in))
+          if feed_id:
+              paper.feed_id = feed_id
+          for key in keys:
+              self._exact.setdefault(key, paper)
+          for band in bands:
+              self._buckets.setdefault(band, []).append((paper, features))
+          return paper, True
+
+      for other in [feed_id or article.feed_id, *article.also_in]:
+          if other and other != original.feed_id and other not in original.also_in:
+              original.also_in.append(other)
+      # Later copies may know the DOI, which helps to match further copies
+      for key in keys:
+          self._exact.setdefault(key, original)
+      return original, False
+
+def unique_articles(articles: Iterable[Article]) -> Iterator[Article]:
+    """Yield each paper once, in order of first appearance.
+
+    Later copies are merged into the first, which lists their feeds in
+    also_in; copies that have not been reached yet are not listed.
+    """
+    deduplicator = Deduplicator()
+    for article in articles:
+        paper, new = deduplicator.add(article)
+        if new:
+            yield paper
+
+def deduplicate(articles: Iterable[Article]) -> List[Article]:
+    """Get each paper once, in order of first appearance, with all its feeds listed."""
+    return list(unique_articles(articles))
@@ -0,0 +1,232 @@
+"""Publisher-specific extraction of readable text from article HTML.
+
+Each publisher's rules are declared once, as an Extractor registered for
+the hosts of its article links and feeds. Feed content is cleaned when the
+entries are normalized, so the cleaned text is what gets cached with the
+feed; full texts are extracted from article pages when they are fetched,
+and cached by the full-text cache. HTML is parsed with lxml when it is
+installed, and with BeautifulSoup otherwise.
+"""
+
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import Callable, Dict, Iterator, Optional, Tuple, Union
+import re
+
+from biofeed.utils.http_client import get_host
+
+# HTML parsers, fastest first ("bs4" is BeautifulSoup with html.parser)
+PARSERS = ("lxml", "bs4")
+
+# Elements whose text is never shown
+_HIDDEN_TAGS = frozenset(("script", "style"))
+
+_default_parser: Optional[str] = None
+
+def default_parser() -> str:
+  """Get the fastest HTML parser that is installed."""
+  global _default_parser
+  if _default_parser is None:
+      try:
+          import lxml.html  # noqa: F401
+          _default_parser = "lxml"
+      except ImportError:
+          _default_parser = "bs4"
+  return _default_parser
+
+def html_text(markup: Union[str, bytes], parser: Optional[str] = None) -> str:
+  """Get the visible text of an HTML fragment or page.
+
+  Script and style contents are dropped, and the remaining text nodes are
+  stripped and joined by single spaces.
+
+  Args:
+      markup: The HTML
+      parser: One of PARSERS (defaults to the fastest installed)
+
+  Returns:
+      The text, empty if there is none
+  """
+  if not markup:
+      return ""
+  if (parser or default_parser()) == "lxml":
+      try:
+          return " ".join(_lxml_strings(_lxml_parse(markup)))
+      except Exception:
+          pass  # Markup lxml rejects: html.parser is more lenient
+  return _bs4_text(_bs4_parse(markup))
+
+def class_text(
+    page: Union[str, bytes], class_name: str, tag: str = "div", parser: Optional[str] = None
+) -> Optional[str]:
+  """Get the text of the first element with a given class.
+
+  Args:
+      page: The HTML
+      class_name: One of the classes of the element
+      tag: Tag name of the element
+      parser: One of PARSERS (defaults to the fastest installed)
+
+  Returns:
+      The element's visible text, as from html_text(), or None if there is
+      no such element
+  """
+  if not page:
+      return None
+  if (parser or default_parser()) == "lxml":
+      try:
+          matches = _class_xpath(tag, class_name)(_lxml_parse(page))
+          return " ".join(_lxml_strings(matches[0])) if matches else None
+      except Exception:
+          pass
+  element = _bs4_parse(page).find(tag, attrs={"class": class_name})
+  return _bs4_text(element) if element else None
+
+def _lxml_parse(markup: Union[str, bytes]):
+  import lxml.html
+
+  if _is_page(markup):
+      return lxml.html.document_fromstring(markup)
+  # Wrapped in a <div> so that text before the first tag is kept
+  return lxml.html.fragment_fromstring(markup, create_parent="div")
+
+def _is_page(markup: Union[str, bytes]) -> bool:
+  head = markup[:512].lstrip()[:9].lower()
+  if isinstance(head, bytes):
+      head = head.decode("ascii", "ignore")
+  return head.startswith(("<!doctype", "<html", "<?xml"))
+
+def _lxml_strings(root) -> Iterator[str]:
+  """Yield the stripped, non-empty visible text nodes below an lxml element."""
+  from lxml import etree
+
+  hidden = 0
+  for event, element in etree.iterwalk(root, events=("start", "end", "comment", "pi")):
+      if event == "start":
+          if element.tag in _HIDDEN_TAGS:
+              hidden += 1
+          elif not hidden and element.text:
+              text = element.text.strip()
+              if text:
+                  yield text
+          continue
+      if event == "end" and element.tag in _HIDDEN_TAGS:
+          hidden -= 1
+      if element is not root and not hidden and element.tail:
+          text = element.tail.strip()
+          if text:
+              yield text
+
+@lru_cache(maxsize=None)
+def _class_xpath(tag: str, class_name: str):
+  """Compile (once) an XPath finding elements that have a class."""
+  from lxml import etree
+
+  return etree.XPath(
+      f'//{tag}[contains(concat(" ", normalize-space(@class), " "), " {class_name} ")]'
+  )
+
+def _bs4_parse(markup: Union[str, bytes]):
+  from bs4 import BeautifulSoup
+
+  return BeautifulSoup(markup, features="html.parser")
+
+def _bs4_text(element) -> str:
+  for hidden in element(list(_HIDDEN_TAGS)):
+      hidden.decompose()
+  return " ".join(element.stripped_strings)
+
+@dataclass(frozen=True)
+class Extractor:
+  """How to get readable text out of one publisher's HTML.
+
+  Attributes:
+      name: Name of the publisher
+      hosts: Hosts of the publisher's article links and feeds; each also
+          matches its subdomains
+      clean_content: Turns the content of a feed entry into plain text,
+          or None if the feed content is used as is
+      extract_page: Extracts the full text from an article page (None if
+          the page has none), or None if the pages are not worth fetching
+  """
+  name: str
+  hosts: Tuple[str, ...]
+  clean_content: Optional[Callable[[str], str]] = None
+  extract_page: Optional[Callable[[bytes], Optional[str]]] = None
+
+# Host -> extractor
+EXTRACTORS: Dict[str, Extractor] = {}
+
+def register_extractor(extractor: Extractor) -> Extractor:
+  """Register an extractor for its hosts, replacing any previous one."""
+  for host in extractor.hosts:
+      EXTRACTORS[host.lower()] = extractor
+  return extractor
+
+def find_extractor(*urls: Optional[str]) -> Optional[Extractor]:
+  """Get the extractor for the first URL whose host has one.
+
+  Pass an article's link and then its feed's URL, so that articles whose
+  links point elsewhere (e.g. to doi.org) are still matched by their feed.
+
+  Returns:
+      The extractor, or None if no URL matches
+  """
+  for url in urls:
+      if url:
+          extractor = _host_extractor(get_host(url))
+          if extractor is not None:
+              return extractor
+  return None
+
+def _host_extractor(host: str) -> Optional[Extractor]:
+  while host:
+      extractor = EXTRACTORS.get(host)
+      if extractor is not None:
+          return extractor
+      host = host.partition(".")[2]
+  return None
+
+def clean_content(content: Optional[str], *urls: Optional[str]) -> Optional[str]:
+  """Clean an entry's feed content with the extractor of its link or feed.
+
+  Content the extractor fails on is returned unchanged.
+  """
+  extractor = find_extractor(*urls) if content else None
+  if extractor is None or extractor.clean_content is None:
+      return content
+  try:
+      return extractor.clean_content(content)
+  except Exception:
+      return content
+
+# PLOS: entries start with a paragraph naming the authors, followed by the abstract
+_PLOS_BYLINE = re.compile(r"<p>(.*?)</p>")
+
+def clean_plos_content(content: str) -> str:
+  """Drop the author line that PLOS puts before the abstract."""
+  match = _PLOS_BYLINE.match(content)
+  if not match:
+      return content
+  return content[match.end():].replace("\n", "").strip()
+
+# Oxford: abstracts are HTML with section titles, the first being "Motivation"
+_OXFORD_PREFIX = re.compile(r"^Abstract\s+Motivation\s*")
+
+def clean_oxford_content(content: str) -> str:
+  """Turn an Oxford Academic abstract into plain text."""
+  return _OXFORD_PREFIX.sub("", html_text(content), count=1)
+
+def extract_nature_text(page: bytes) -> Optional[str]:
+  """Extract the article text from a Nature article page."""
+  return class_text(page, "c-article-section__content")
+
+register_extractor(Extractor(
+  "PLOS", ("plos.org",), clean_content=clean_plos_content
+))
+register_extractor(Extractor(
+  "Oxford Academic", ("academic.oup.com",), clean_content=clean_oxford_content
+))
+register_extractor(Extractor(
+  "Nature", ("nature.com",), extract_page=extract_nature_text
+))
@@ -1,51 +1,260 @@
-from typing import Any, List, Dict
+from collections import deque
+from typing import Any, Container, Deque, Dict, Iterator, List, Optional, Tuple
+import hashlib
+import threading
 from biofeed.feeds.article import Article
+from biofeed.feeds.dedup import find_doi
+from biofeed.feeds.extractors import clean_content
+from biofeed.utils.dates import to_epoch
+
+class ParsedFeed:
+    """Normalized articles of one fetched version of a feed.
+    
+    This is what gets cached instead of the raw parser output. Entries are
+    normalized lazily, in feed order, the first time they are requested, and
+    each raw entry is released once its Article exists; so showing the first
+    few articles of a long feed only pays for those. Articles normalized
+    after the feed was cached are written back (see FeedSource), so later
+    processes load them instead of normalizing the raw entries again.
+    """
+
+    def __init__(
+        self,
+        articles: Optional[List[Article]] = None,
+        version: str = '',
+        entries: Optional[List[Any]] = None,
+        kind: str = 'rss',
+        source: str = ''
+    ):
+      """Initialize a parsed feed.
+      
+      Args:
+          articles: Already normalized articles
+          version: Hash of the feed body the articles were parsed from
+          entries: Raw entries still to be normalized, following the articles
+          kind: Format of the raw entries ('rss' or 'json')
+          source: URL of the feed, used to pick the content extractor
+      """
+      self.version = version
+      self.kind = kind
+      self.source = source
+      self._articles: List[Article] = list(articles or [])
+      self._pending: Deque[Any] = deque(entries or [])
+      # Pending entries normalized out of order by new_articles, by position
+      self._ahead: Dict[int, Article] = {}
+      self.by_id: Dict[str, Article] = {article.id: article for article in self._articles}
+      self._lock = threading.Lock()
+      # Number of articles already normalized when the feed was last stored
+      self._saved = len(self._articles)
+
+    @classmethod
+    def from_raw(cls, feed_data: Any, version: str = '', source: str = '') -> 'ParsedFeed':
+      """Wrap raw parser output without normalizing any entry yet."""
+      entries, kind = FeedParser.split_entries(feed_data)
+      return cls(version=version, entries=entries, kind=kind, source=source)
+
+    def _normalize_next(self) -> bool:
+      """Normalize the next pending entry; False if there is none left."""
+      with self._lock:
+          if not self._pending:
+              return False
+          entry = self._pending.popleft()
+          article = self._ahead.pop(len(self._articles), None)
+          if article is None:
+              article = FeedParser.normalize_entry(entry, self.kind, self.source)
+          self._articles.append(article)
+          self.by_id.setdefault(article.id, article)
+          return True
+
+    def iter_articles(self) -> Iterator[Article]:
+      """Iterate over the articles, normalizing entries only as they are reached."""
+      position = 0
+      while position < len(self._articles) or self._normalize_next():
+          yield self._articles[position]
+          position += 1
+
+    @property
+    def articles(self) -> List[Article]:
+      """All articles (normalizes every pending entry)."""
+      while self._normalize_next():
+          pass
+      return self._articles
+
+    def get(self, article_id: str) -> Optional[Article]:
+      """Find an article by ID, normalizing only as far as needed."""
+      while article_id not in self.by_id:
+          if not self._normalize_next():
+              return None
+      return self.by_id[article_id]
+
+    def get_position(self, position: int) -> Optional[Article]:
+      """Get the article at a position, normalizing only as far as needed."""
+      while position >= len(self._articles):
+          if not self._normalize_next():
+              return None
+      return self._articles[position]
+
+    def new_articles(self, seen: Container[str]) -> List[Article]:
+      """Get the articles whose IDs are not in seen, in feed order.
+      
+      The ID of a pending entry is derived from its raw fields, so only the
+      entries that are new get normalized.
+      """
+      with self._lock:
+          new = [article for article in self._articles if article.id not in seen]
+          offset = len(self._articles)
+          for index, entry in enumerate(self._pending):
+              article = self._ahead.get(offset + index)
+              if article is None:
+                  if FeedParser.entry_id(entry, self.kind) in seen:
+                      continue
+                  article = FeedParser.normalize_entry(entry, self.kind, self.source)
+                  self._ahead[offset + index] = article
+              if article.id not in seen:
+                  new.append(article)
+          return new
+
+    def entry_ids(self) -> List[str]:
+      """IDs of all entries, without normalizing pending ones."""
+      with self._lock:
+          return [article.id for article in self._articles] + [
+              FeedParser.entry_id(entry, self.kind) for entry in self._pending
+          ]
+
+    def published_timestamps(self) -> List[Optional[int]]:
+      """Publish times of all entries, without normalizing pending ones."""
+      with self._lock:
+          return [article.published_ts for article in self._articles] + [
+              FeedParser.entry_timestamp(entry, self.kind) for entry in self._pending
+          ]
+
+    @property
+    def unsaved(self) -> bool:
+      """Whether entries were normalized since the feed was last stored."""
+      return len(self._articles) > self._saved
+
+    def mark_saved(self) -> None:
+      """Record that the articles normalized so far were stored."""
+      self._saved = len(self._articles)
+
+    def __len__(self) -> int:
+      return len(self._articles) + len(self._pending)
+
+    def __getstate__(self) -> Dict[str, Any]:
+      # The ID index and lock are rebuilt when loaded from the persistent
+      # cache; normalized entries are stored as articles, the rest raw
+      with self._lock:
+          return {
+              'articles': list(self._articles), 'entries': list(self._pending),
+              'version': self.version, 'kind': self.kind, 'source': self.source
+          }
+
+    def __setstate__(self, state: Dict[str, Any]) -> None:
+      self.__init__(**state)
 
 class FeedParser:
     """Parser for feed formats that converts to standardized Article objects."""
     
     @staticmethod
-    def parse_feed(feed_data: Any) -> List[Article]:
+    def parse_feed(feed_data: Any, source: str = '') -> List[Article]:
       """Parse feed data into a list of standardized Article objects."""
+      return list(FeedParser.iter_articles(feed_data, source))
+
+    @staticmethod
+    def iter_articles(feed_data: Any, source: str = '') -> Iterator[Article]:
+      """Lazily parse feed data, normalizing each entry only when it is reached."""
+      entries, kind = FeedParser.split_entries(feed_data)
+      return (FeedParser.normalize_entry(entry, kind, source) for entry in entries)
+
+    @staticmethod
+    def split_entries(feed_data: Any) -> Tuple[List[Any], str]:
+      """Get the raw entries of feed data and their format ('rss' or 'json')."""
       if hasattr(feed_data, 'entries'):
-          return FeedParser._parse_rss_feed(feed_data)
+          return list(feed_data.entries), 'rss'
       elif isinstance(feed_data, dict) and 'items' in feed_data:
-          return FeedParser._parse_json_feed(feed_data)
-      return []
+          return list(feed_data['items']), 'json'
+      return [], 'rss'
+
+    @staticmethod
+    def normalize_entry(entry: Any, kind: str = 'rss', source: str = '') -> Article:
+      """Convert one raw entry into an Article.
+      
+      Dates are converted to epoch seconds here, once, so sorting, filtering
+      and rendering never have to parse date strings again. Likewise the
+      content is cleaned by the publisher's extractor (see extractors), found
+      by the article's link or else the feed URL given as source.
+      """
+      if kind == 'json':
+          article = FeedParser._parse_json_item(entry)
+      else:
+          article = FeedParser._parse_rss_entry(entry)
+      article.published_ts = to_epoch(article.published)
+      article.updated_ts = to_epoch(article.updated)
+      article.content = clean_content(article.content, article.link, source)
+      return article
 
     @staticmethod
-    def _parse_rss_feed(feed_data: Any) -> List[Article]:
-      articles = []
-      for index, entry in enumerate(feed_data.entries):
-          articles.append(Article(
-            id=str(index),
-            title=getattr(entry, 'title', 'No Title'),
-            link=FeedParser._extract_link(entry),
-            published=FeedParser._extract_date(entry, ['published', 'pubDate', 'updated']),
-            updated=FeedParser._extract_date(entry, ['updated', 'modified']),
-            author=FeedParser._extract_author(entry),
-            summary=FeedParser._extract_text(entry, ['summary', 'description']),
-            content=FeedParser._extract_content(entry),
-            categories=FeedParser._extract_categories(entry)
-          ))
-      return articles
-
-    @staticmethod
-    def _parse_json_feed(feed_data: Dict) -> List[Article]:
-      articles = []
-      for index, item in enumerate(feed_data['items']):
-          articles.append(Article(
-            id=str(index),
-            title=item.get('title', 'No Title'),
-            link=item.get('url', item.get('link', '')),
-            published=item.get('date_published', ''),
-            updated=item.get('date_modified', ''),
-            author=FeedParser._extract_json_author(item),
-            summary=item.get('summary', ''),
-            content=item.get('content_text', item.get('content_html', '')),
-            categories=item.get('tags', [])
-          ))
-      return articles
+    def entry_timestamp(entry: Any, kind: str = 'rss') -> Optional[int]:
+      """Get the publish time of a raw entry in epoch seconds."""
+      if kind == 'json':
+          return to_epoch(entry.get('date_published'))
+      return to_epoch(FeedParser._extract_date(entry, ['published', 'pubDate', 'updated']))
+
+    @staticmethod
+    def entry_id(entry: Any, kind: str = 'rss') -> str:
+      """Get the stable ID of a raw entry without normalizing it."""
+      if kind == 'json':
+          return FeedParser.make_article_id(
+            entry.get('id'), entry.get('url', entry.get('link')),
+            entry.get('title', ''), entry.get('date_published', '')
+          )
+      return FeedParser.make_article_id(
+        getattr(entry, 'id', None), FeedParser._extract_link(entry),
+        getattr(entry, 'title', ''), getattr(entry, 'published', '')
+      )
+
+    @staticmethod
+    def _parse_rss_entry(entry: Any) -> Article:
+      link = FeedParser._extract_link(entry)
+      return Article(
+        id=FeedParser.entry_id(entry),
+        title=getattr(entry, 'title', 'No Title'),
+        link=link,
+        published=FeedParser._extract_date(entry, ['published', 'pubDate', 'updated']),
+        updated=FeedParser._extract_date(entry, ['updated', 'modified']),
+        author=FeedParser._extract_author(entry),
+        summary=FeedParser._extract_text(entry, ['summary', 'description']),
+        content=FeedParser._extract_content(entry),
+        categories=FeedParser._extract_categories(entry),
+        doi=find_doi(getattr(entry, 'id', None), link)
+      )
+
+    @staticmethod
+    def _parse_json_item(item: Dict) -> Article:
+      return Article(
+        id=FeedParser.entry_id(item, 'json'),
+        title=item.get('title', 'No Title'),
+        link=item.get('url', item.get('link', '')),
+        published=item.get('date_published', ''),
+        updated=item.get('date_modified', ''),
+        author=FeedParser._extract_json_author(item),
+        summary=item.get('summary', ''),
+        content=item.get('content_text', item.get('content_html', '')),
+        categories=item.get('tags', []),
+        doi=find_doi(item.get('id'), item.get('url'), item.get('external_url'))
+      )
+
+    @staticmethod
+    def make_article_id(
+        guid: Optional[str], link: Optional[str], title: str = '', published: str = ''
+    ) -> str:
+      """Derive a stable article ID that survives entries being added or removed.
+      
+      The ID is a short hash of the entry's GUID (which for many publishers is
+      its DOI), or of its link if it has none, or else of its title and date.
+      """
+      identity = guid or link or f"{title}\n{published}"
+      return hashlib.sha1(str(identity).strip().encode('utf-8')).hexdigest()[:12]
 
     # Helper methods: (_extract_author, _extract_json_author, _extract_date, 
     # _extract_text, _extract_content, _extract_categories, _extract_link)
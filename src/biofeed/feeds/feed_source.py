@@ -1,19 +1,54 @@
 """Feed source implementation for retrieving feed content."""
 
 from datetime import datetime
-from typing import List, Optional, Any
+from typing import TYPE_CHECKING, Dict, Iterator, List, Mapping, Optional, Any
+import hashlib
+import json
 import logging
-
-import fastfeedparser
-import requests
+import time
 
 from biofeed.feeds.article import Article
-from biofeed.feeds.feed_parser import FeedParser
+from biofeed.feeds.feed_parser import FeedParser, ParsedFeed
 from biofeed.feeds.cache import FeedCache, CACHE_DURATION, cache
+from biofeed.feeds.schedule import feed_hints, header_max_age, publish_cadence, refresh_interval
+from biofeed.utils import http_client
+
+if TYPE_CHECKING:
+    import requests
 
 # Set up logging
 logger = logging.getLogger(__name__)
 
+# Imported on first parse: it is slow to import and most commands are
+# answered from the cache
+fastfeedparser = None
+
+def _load_fastfeedparser():
+    """Import fastfeedparser on first use."""
+    global fastfeedparser
+    if fastfeedparser is None:
+        import fastfeedparser as module
+        fastfeedparser = module
+    return fastfeedparser
+
+def sniff_format(content: bytes, content_type: str = "") -> str:
+    """Guess the format of a feed body without parsing it.
+    
+    The leading bytes are checked first since publishers often serve feeds
+    with a generic Content-Type; the header is used when they are ambiguous.
+    
+    Args:
+        content: The raw feed body
+        content_type: The Content-Type header of the response, if any
+    Returns: "json" for JSON Feed bodies, "xml" for RSS/Atom/RDF bodies
+    """
+    head = content[:64].lstrip(b"\xef\xbb\xbf \t\r\n")
+    if head.startswith((b"{", b"[")):
+        return "json"
+    if head.startswith(b"<"):
+        return "xml"
+    return "json" if "json" in content_type.lower() else "xml"
+
 class FeedSource:
     """Generic feed source that works with multiple formats."""
     
@@ -30,54 +65,224 @@ class FeedSource:
             name: Display name for the feed
             url: URL of the feed
             category: Category of the feed (default: "general")
-            cache_duration: Cache duration in seconds (default: CACHE_DURATION)
+            cache_duration: Cache duration in seconds (default: CACHE_DURATION).
+                Once the feed has been downloaded it is adapted to the
+                publisher's hints and the feed's cadence, and this value is
+                only used when there are neither.
         """
         self.name = name
         self.url = url
         self.category = category
+        self.base_cache_duration = cache_duration
         self.cache_duration = cache_duration
         self._last_fetched: Optional[datetime] = None
+        self.timings: Dict[str, float] = {}  # Duration of the last fetch stages
+        # Raw data supplied to get_articles (e.g. cached by older versions)
+        # and the articles normalized from it
+        self._raw_data: Any = None
+        self._raw_parsed: Optional[ParsedFeed] = None
         self._cache = cache  # Use the global cache instance
     
-    def fetch(self, force_refresh: bool = False) -> Any:
+    def fetch(self, force_refresh: bool = False, offline: bool = False) -> ParsedFeed:
         """Fetch the feed content from source or cache.
         
-        Args: force_refresh: Whether to force a refresh of the feed data
-        Returns: The feed data in its raw format
-        Raises: ValueError: If the feed cannot be fetched or parsed
+        Args:
+            force_refresh: Whether to force a refresh of the feed data
+            offline: Never download; use the cached data however old it is
+        Returns: The normalized feed data
+        Raises: ValueError: If the feed cannot be fetched or parsed, or is not cached when offline
         """
+        if offline:
+            cached_data = self._cache.get(self.url, max_age=float("inf"))
+            if cached_data is None:
+                raise ValueError(f"Feed at {self.url} is not cached (offline)")
+            return cached_data
+        
         if not force_refresh:
-            cached_data = self._cache.get(self.url, self.cache_duration)
-            if cached_data:
-                # Use the cache's method to get the timestamp
-                self._last_fetched = self._cache.get_timestamp(self.url)
+            cached_data = self.cached(self.cache_duration)
+            if cached_data is not None:
                 return cached_data
         
         logger.info(f"Fetching feed from {self.url}")
         
-        # Try parsing with fastfeedparser first (handles RSS/Atom feeds)
+        response = self._download()
+        if response.status_code == 304:
+            data = self.not_modified(response.headers)
+            if data is not None:
+                return data
+            # Cached data vanished in the meantime, fetch it unconditionally
+            response = self._download(conditional=False)
+        
+        return self.ingest(response.content, response.headers)
+    
+    def cached(self, max_age: float) -> Optional[ParsedFeed]:
+        """Get the cached feed data if it is fresh enough.
+        
+        Args: max_age: Maximum age of the cached data in seconds
+        Returns: The cached feed data, or None if it is missing or too old
+        """
+        cached_data = self._cache.get(self.url, max_age)
+        if cached_data is not None:
+            # Use the cache's method to get the timestamp
+            self._last_fetched = self._cache.get_timestamp(self.url)
+        return cached_data
+    
+    def not_modified(self, response_headers: Mapping[str, str]) -> Optional[ParsedFeed]:
+        """Renew the cached feed data after a 304 response.
+        
+        Args: response_headers: Headers of the 304 response
+        Returns: The cached feed data, or None if it vanished in the meantime
+        """
+        data = self._cache.revalidate(self.url)
+        if data is not None:
+            logger.info(f"Feed at {self.url} not modified")
+            self._last_fetched = self._cache.get_timestamp(self.url)
+            self._update_schedule(response_headers)
+        return data
+    
+    def ingest(self, content: bytes, response_headers: Mapping[str, str]) -> ParsedFeed:
+        """Cache a downloaded feed body and adapt the refresh interval to it.
+        
+        Args:
+            content: The raw feed body
+            response_headers: Headers of the response the body came from
+        Returns: The normalized feed data
+        Raises: ValueError: If the body cannot be parsed
+        """
+        data = self._ingest(content, response_headers)
+        self._update_schedule(response_headers)
+        return data
+    
+    def _ingest(self, content: bytes, response_headers: Mapping[str, str]) -> ParsedFeed:
+        """Turn a downloaded feed body into cached, normalized articles.
+        
+        The body is parsed only if it differs from the version already cached.
+        Only the raw entries are kept, each until it has been normalized; the
+        articles normalized later are written back to the cache entry (see
+        _store_normalized), so the cache ends up holding articles, not raw
+        entries.
+        
+        Args:
+            content: The raw feed body
+            response_headers: Headers of the response the body came from
+        Returns: The normalized feed data
+        Raises: ValueError: If the body cannot be parsed
+        """
+        version = hashlib.sha1(content).hexdigest()
+        validators = {
+            "etag": response_headers.get("ETag"),
+            "last_modified": response_headers.get("Last-Modified"),
+            "version": version,
+        }
+        
+        if self._cache.get_metadata(self.url).get("version") == version:
+            # Same body as before (the server just doesn't send validators)
+            data = self._cache.revalidate(self.url, validators)
+            if isinstance(data, ParsedFeed):
+                logger.info(f"Feed at {self.url} unchanged")
+                self._last_fetched = self._cache.get_timestamp(self.url)
+                return data
+        
+        # Entries are normalized lazily, as they are requested
+        data = ParsedFeed.from_raw(
+            self._parse(content, response_headers.get("Content-Type", "")), version, self.url
+        )
+        # Kept with the validators, so they still apply after a 304
+        validators.update(feed_hints(content))
+        validators["cadence"] = publish_cadence(data.published_timestamps())
+        self._cache.set(self.url, data, validators)
+        self._last_fetched = datetime.now()  # Update the timestamp
+        return data
+    
+    def _update_schedule(self, response_headers: Mapping[str, str]) -> None:
+        """Adapt cache_duration to the publisher's hints and the feed's cadence.
+        
+        Args: response_headers: Headers of the latest response for the feed
+        """
+        metadata = self._cache.get_metadata(self.url)
+        self.cache_duration = refresh_interval(
+            max_age=header_max_age(response_headers),
+            ttl=metadata.get("ttl"),
+            cadence=metadata.get("cadence"),
+            skip_hours=metadata.get("skip_hours", ()),
+            default=self.base_cache_duration
+        )
+        logger.debug(f"Refresh interval of {self.url} is {self.cache_duration}s")
+    
+    def expires_in(self) -> Optional[float]:
+        """Get the number of seconds until the cached data goes stale.
+        
+        Returns: Seconds left (negative if already stale), or None if nothing is cached
+        """
+        age = self._cache.get_age(self.url)
+        return None if age is None else self.cache_duration - age
+    
+    def validator_headers(self) -> Dict[str, str]:
+        """Build conditional request headers from the cached validators.
+        
+        Returns: If-None-Match/If-Modified-Since headers (empty if none are stored)
+        """
+        validators = self._cache.get_metadata(self.url)
+        headers = {}
+        if validators.get("etag"):
+            headers["If-None-Match"] = validators["etag"]
+        if validators.get("last_modified"):
+            headers["If-Modified-Since"] = validators["last_modified"]
+        return headers
+    
+    def _download(self, conditional: bool = True) -> "requests.Response":
+        """Download the feed body once.
+        
+        Args: conditional: Whether to send the validators of the cached data
+        Returns: The HTTP response (status 304 if the cached data is current)
+        Raises: ValueError: If the feed cannot be downloaded
+        """
+        # Send the validators of the previous response so an unchanged feed
+        # costs a 304 instead of a full download and parse
+        headers = self.validator_headers() if conditional else {}
+        
+        import requests
+        start = time.perf_counter()
+        try:
+            response = http_client.get(self.url, headers=headers)
+            response.raise_for_status()
+        except requests.RequestException as e:
+            logger.error(f"Failed to download feed: {e}")
+            raise ValueError(f"Failed to fetch feed at {self.url}: {e}")
+        finally:
+            self.timings["download"] = time.perf_counter() - start
+        
+        logger.debug(
+            f"Downloaded {len(response.content)} bytes from {self.url} "
+            f"in {self.timings['download']:.3f}s"
+        )
+        return response
+    
+    def _parse(self, content: bytes, content_type: str = "") -> Any:
+        """Parse an in-memory feed body in its sniffed format.
+        
+        Args:
+            content: The raw feed body
+            content_type: The Content-Type header of the response, if any
+        Returns: The feed data in its raw format
+        Raises: ValueError: If the body cannot be parsed
+        """
+        feed_format = sniff_format(content, content_type)
+        start = time.perf_counter()
         try:
-            data = fastfeedparser.parse(self.url)
-            self._cache.set(self.url, data)
-            self._last_fetched = datetime.now()  # Update the timestamp
-            return data
+            if feed_format == "json":
+                return json.loads(content)
+            # fastfeedparser handles RSS/Atom/RDF feeds
+            return _load_fastfeedparser().parse(content)
         except Exception as e:
-            logger.warning(f"Failed to parse feed with fastfeedparser: {e}")
-            
-            # Try as JSON
-            try:
-                response = requests.get(self.url, timeout=10)
-                response.raise_for_status()
-                data = response.json()
-                self._cache.set(self.url, data)
-                self._last_fetched = datetime.now()  # Update the timestamp
-                return data
-            except Exception as json_error:
-                logger.error(f"Failed to parse feed as JSON: {json_error}")
-                raise ValueError(
-                    f"Failed to parse feed at {self.url}. "
-                    f"Tried RSS/Atom and JSON formats but both failed."
-                )
+            logger.error(f"Failed to parse feed as {feed_format}: {e}")
+            raise ValueError(f"Failed to parse feed at {self.url} as {feed_format}: {e}")
+        finally:
+            self.timings["parse"] = time.perf_counter() - start
+            logger.debug(
+                f"Parsed {feed_format} feed from {self.url} "
+                f"in {self.timings['parse']:.3f}s"
+            )
     
     def get_articles(self, force_refresh: bool = False) -> List[Article]:
         """Get list of articles in standardized format.
@@ -85,31 +290,105 @@ class FeedSource:
         Args: force_refresh: Whether to force a refresh of the feed data
         Returns: List of Article objects
         """
-        feed_data = self.fetch(force_refresh)
-        return FeedParser.parse_feed(feed_data)
+        return self.all_articles(self.get_feed(force_refresh))
+    
+    def iter_articles(self, force_refresh: bool = False) -> Iterator[Article]:
+        """Iterate over articles, normalizing entries only as they are reached.
+        
+        Stopping early (e.g. after the first 10 articles) skips the work of
+        normalizing the rest of a long feed. The articles normalized are
+        stored in the cache once the iterator is exhausted or closed.
+        
+        Args: force_refresh: Whether to force a refresh of the feed data
+        Returns: Iterator of Article objects in feed order
+        """
+        return self.iter_storing(self.get_feed(force_refresh))
+
+    def get_feed(self, force_refresh: bool = False) -> ParsedFeed:
+        """Get the normalized feed data, without normalizing any more entries.
+
+        Args: force_refresh: Whether to force a refresh of the feed data
+        Returns: The ParsedFeed holding the feed's articles
+        """
+        return self.as_parsed(self.fetch(force_refresh))
+
+    def as_parsed(self, feed_data: Any) -> ParsedFeed:
+        """Get normalized feed data, normalizing raw data at most once.
+        
+        Raw data only shows up in cache entries written by older versions.
+        """
+        if isinstance(feed_data, ParsedFeed):
+            return feed_data
+        if feed_data is not self._raw_data:
+            self._raw_parsed = ParsedFeed(FeedParser.parse_feed(feed_data, self.url), source=self.url)
+            self._raw_data = feed_data
+        return self._raw_parsed
+
+    def _store_normalized(self, parsed: ParsedFeed) -> None:
+        """Write articles normalized since the feed was cached back to the cache.
+        
+        Later processes then load the articles instead of normalizing the raw
+        entries again. Nothing is written if the cache moved on to newer data.
+        """
+        if parsed.unsaved and self._cache.replace(self.url, parsed):
+            parsed.mark_saved()
+
+    def all_articles(self, parsed: ParsedFeed) -> List[Article]:
+        """Normalize every entry of a feed, storing the result."""
+        articles = parsed.articles
+        self._store_normalized(parsed)
+        return articles
+
+    def iter_storing(self, parsed: ParsedFeed) -> Iterator[Article]:
+        """Iterate over a feed's articles, storing the normalized ones when done."""
+        try:
+            yield from parsed.iter_articles()
+        finally:
+            self._store_normalized(parsed)
     
-    def get_article(self, article_id: str) -> Article:
+    def get_article(self, article_id: str, offline: bool = False) -> Article:
         """Get a single article by ID.
         
-        Args: article_id: ID of the article to retrieve
+        Args:
+            article_id: Stable ID of the article, or its position in the feed
+            offline: Only look in the cached feed data, however old it is
         Returns: The requested Article object
             
         Raises: ValueError: If the article is not found
         """
-        articles = self.get_articles()
-        
-        # Try to interpret as index first
+        return self.lookup(self.as_parsed(self.fetch(offline=offline)), article_id)
+
+    def lookup(self, parsed: ParsedFeed, article_id: str) -> Article:
+        """Find an article in a parsed feed, storing the entries normalized on the way."""
         try:
-            index = int(article_id)
-            if 0 <= index < len(articles):
-                return articles[index]
+            return self._find_article(parsed, article_id)
+        finally:
+            self._store_normalized(parsed)
+    
+    @staticmethod
+    def _find_article(parsed: ParsedFeed, article_id: str) -> Article:
+        """Find an article in a parsed feed by ID or position.
+        
+        Args:
+            parsed: The parsed feed
+            article_id: Stable ID of the article, or its position in the feed
+        Returns: The requested Article object
+        Raises: ValueError: If the article is not found
+        """
+        if article_id in parsed.by_id:
+            return parsed.by_id[article_id]
+        
+        # The position shown by the list command only needs a short prefix
+        # of the feed normalized, while an ID lookup may need all of it
+        if article_id.isdigit() and int(article_id) < len(parsed):
+            return parsed.get_position(int(article_id))
+        
+        article = parsed.get(article_id)
+        if article is not None:
+            return article
+        if article_id.isdigit():
             raise ValueError(f"Article ID {article_id} out of range")
-        except ValueError:
-            # Try as string ID
-            for article in articles:
-                if article.id == article_id:
-                    return article
-            raise ValueError(f"Article with ID {article_id} not found")
+        raise ValueError(f"Article with ID {article_id} not found")
     
     def get_last_fetched(self) -> Optional[datetime]:
         """Get the timestamp of when this feed was last fetched.
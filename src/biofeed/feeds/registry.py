@@ -1,96 +1,410 @@
 """Feed registry for managing feed sources."""
 
 from pathlib import Path
-from typing import Dict, List, Optional
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple, Union
+import logging
+import sqlite3
+import threading
 
 from biofeed.feeds.feed_source import FeedSource
-from biofeed.utils.config import load_config, save_config, DEFAULT_CONFIG
+from biofeed.utils.config import (
+    DEFAULT_CONFIG, get_config_dir, get_config_file, load_config, read_config, update_config, view_config
+)
+from biofeed.utils.http_client import get_host
+
+logger = logging.getLogger(__name__)
+
+# Name of the registry database inside the config directory
+REGISTRY_FILE = DEFAULT_CONFIG.get("registry_file", "feeds.db")
+
+# Config file the feeds were kept in before the registry database existed
+LEGACY_FEEDS_FILE = "feeds.json"
+
+class JSONRegistryBackend:
+    """Registry storage in a JSON config file (e.g. feeds.json).
+
+    Every change rewrites the whole file, so this suits short, hand-edited
+    feed lists; see SQLiteRegistryBackend for large ones.
+    """
+
+    def __init__(self, config_file: str = LEGACY_FEEDS_FILE):
+        """Initialize the backend.
+
+        Args:
+            config_file: Name of the file in the config directory, or a path
+        """
+        self.config_file = config_file
+
+    def _update(self, change: Callable[[Dict[str, Any]], Any]) -> None:
+        # Applied to the file's current contents, under its lock, so feeds
+        # that other processes added or removed in the meantime are kept
+        update_config(self.config_file, change, default=DEFAULT_CONFIG.get("default_feeds", {}))
+
+    def load(self) -> Dict[str, Dict[str, Any]]:
+        """Get the entries of all feeds, by feed ID, in registration order."""
+        return load_config(self.config_file, default=DEFAULT_CONFIG.get("default_feeds", {}))
+
+    def find(
+        self, category: Optional[str] = None, host: Optional[str] = None
+    ) -> Dict[str, Dict[str, Any]]:
+        """Get the entries of the feeds in a category and/or on a host."""
+        # Scans the cached file without copying it; only matches are copied
+        return {
+            feed_id: dict(feed_info) for feed_id, feed_info in view_config(
+                self.config_file, default=DEFAULT_CONFIG.get("default_feeds", {})
+            ).items()
+            if (category is None or feed_info.get("category", "general").lower() == category.lower())
+            and (host is None or get_host(feed_info["url"]) == host.lower())
+        }
+
+    def put(self, entries: Dict[str, Dict[str, Any]]) -> None:
+        """Add or replace feed entries."""
+        self._update(lambda feed_data: feed_data.update(entries))
+
+    def delete(self, feed_ids: Iterable[str]) -> None:
+        """Remove feed entries."""
+        feed_ids = list(feed_ids)
+
+        def delete(feed_data: Dict[str, Any]) -> None:
+            for feed_id in feed_ids:
+                feed_data.pop(feed_id, None)
+
+        self._update(delete)
+
+    def set_refresh_intervals(self, intervals: Dict[str, Tuple[str, Optional[int]]]) -> None:
+        """Store refresh intervals, given as feed ID -> (feed URL, interval or None).
+
+        Feeds whose URL no longer matches were replaced by another process
+        and are skipped.
+        """
+        def set_intervals(feed_data: Dict[str, Any]) -> None:
+            for feed_id, (url, interval) in intervals.items():
+                feed_info = feed_data.get(feed_id)
+                if feed_info is None or feed_info.get("url") != url:
+                    continue
+                feed_info.pop("refresh_interval", None)
+                if interval is not None:
+                    feed_info["refresh_interval"] = interval
+
+        self._update(set_intervals)
+
+    def close(self) -> None:
+        """Nothing to release."""
+
+class SQLiteRegistryBackend:
+    """Registry storage in a SQLite database, indexed by ID, category and host.
+
+    Changes only touch the rows of the feeds concerned, and batches of them
+    are written in one transaction, so registering thousands of feeds stays
+    cheap. On first use the database is seeded from feeds.json, or from the
+    default feeds if there is none; after that feeds.json is no longer read.
+    """
+
+    def __init__(self, path: Optional[Union[str, Path]] = None):
+        """Initialize the backend.
+
+        Args:
+            path: Path to the database file. If None, REGISTRY_FILE inside
+                the configuration directory is used, resolved on first access.
+        """
+        self.path = Path(path) if path else None
+        self._conn: Optional[sqlite3.Connection] = None
+        self._lock = threading.RLock()
+
+    def _connect(self) -> sqlite3.Connection:
+        """Open the database on first use, creating and seeding it if needed."""
+        if self._conn is None:
+            path = self.path or get_config_dir() / REGISTRY_FILE
+            conn = sqlite3.connect(str(path), timeout=10, check_same_thread=False)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS feeds ("
+                "id TEXT PRIMARY KEY, position INTEGER NOT NULL, name TEXT NOT NULL, "
+                "url TEXT NOT NULL, category TEXT NOT NULL, category_key TEXT NOT NULL, "
+                "host TEXT NOT NULL, refresh_interval INTEGER)"
+            )
+            conn.execute("CREATE INDEX IF NOT EXISTS feeds_position ON feeds (position)")
+            conn.execute("CREATE INDEX IF NOT EXISTS feeds_category ON feeds (category_key)")
+            conn.execute("CREATE INDEX IF NOT EXISTS feeds_host ON feeds (host)")
+            conn.commit()
+            self._conn = conn
+            # Seeded once (a registry whose feeds were all removed stays
+            # empty), under a write lock so concurrent first runs seed once
+            if conn.execute("PRAGMA user_version").fetchone()[0] == 0:
+                conn.execute("BEGIN IMMEDIATE")
+                try:
+                    if conn.execute("PRAGMA user_version").fetchone()[0] == 0:
+                        entries = read_config(
+                            LEGACY_FEEDS_FILE, default=DEFAULT_CONFIG.get("default_feeds", {})
+                        )
+                        self._insert(conn, entries)
+                        conn.execute("PRAGMA user_version = 1")
+                        if get_config_file(LEGACY_FEEDS_FILE).exists():
+                            logger.warning(
+                                f"Imported {len(entries)} feeds from {LEGACY_FEEDS_FILE} into {path}; "
+                                f"{LEGACY_FEEDS_FILE} is no longer read, manage feeds with 'biofeed feeds'"
+                            )
+                    conn.commit()
+                except BaseException:
+                    conn.rollback()
+                    raise
+        return self._conn
+
+    @staticmethod
+    def _insert(conn: sqlite3.Connection, entries: Dict[str, Dict[str, Any]]) -> None:
+        """Add or replace entries, keeping the position of replaced feeds."""
+        position = conn.execute("SELECT COALESCE(MAX(position), 0) FROM feeds").fetchone()[0]
+        rows = []
+        for feed_id, feed_info in entries.items():
+            position += 1
+            category = feed_info.get("category", "general")
+            rows.append((
+                feed_id, position, feed_info["name"], feed_info["url"], category,
+                category.lower(), get_host(feed_info["url"]), feed_info.get("refresh_interval")
+            ))
+        conn.executemany(
+            "INSERT INTO feeds (id, position, name, url, category, category_key, host, refresh_interval) "
+            "VALUES (?, ?, ?, ?, ?, ?, ?, ?) ON CONFLICT (id) DO UPDATE SET "
+            "name = excluded.name, url = excluded.url, category = excluded.category, "
+            "category_key = excluded.category_key, host = excluded.host, "
+            "refresh_interval = excluded.refresh_interval", rows
+        )
+
+    @staticmethod
+    def _entries(rows: Iterable[Tuple]) -> Dict[str, Dict[str, Any]]:
+        entries = {}
+        for feed_id, name, url, category, refresh_interval in rows:
+            entries[feed_id] = {"name": name, "url": url, "category": category}
+            if refresh_interval:
+                entries[feed_id]["refresh_interval"] = refresh_interval
+        return entries
+
+    def load(self) -> Dict[str, Dict[str, Any]]:
+        """Get the entries of all feeds, by feed ID, in registration order."""
+        with self._lock:
+            rows = self._connect().execute(
+                "SELECT id, name, url, category, refresh_interval FROM feeds ORDER BY position"
+            ).fetchall()
+        return self._entries(rows)
+
+    def find(
+        self, category: Optional[str] = None, host: Optional[str] = None
+    ) -> Dict[str, Dict[str, Any]]:
+        """Get the entries of the feeds in a category and/or on a host, using the indexes."""
+        conditions, params = [], []
+        if category is not None:
+            conditions.append("category_key = ?")
+            params.append(category.lower())
+        if host is not None:
+            conditions.append("host = ?")
+            params.append(host.lower())
+        sql = "SELECT id, name, url, category, refresh_interval FROM feeds"
+        if conditions:
+            sql += " WHERE " + " AND ".join(conditions)
+        with self._lock:
+            rows = self._connect().execute(sql + " ORDER BY position", params).fetchall()
+        return self._entries(rows)
+
+    def put(self, entries: Dict[str, Dict[str, Any]]) -> None:
+        """Add or replace feed entries, in one transaction."""
+        with self._lock:
+            conn = self._connect()
+            with conn:
+                self._insert(conn, entries)
+
+    def delete(self, feed_ids: Iterable[str]) -> None:
+        """Remove feed entries, in one transaction."""
+        with self._lock:
+            conn = self._connect()
+            with conn:
+                conn.executemany("DELETE FROM feeds WHERE id = ?", ((feed_id,) for feed_id in feed_ids))
+
+    def set_refresh_intervals(self, intervals: Dict[str, Tuple[str, Optional[int]]]) -> None:
+        """Store refresh intervals, given as feed ID -> (feed URL, interval or None).
+
+        Feeds whose URL no longer matches were replaced by another process
+        and are skipped.
+        """
+        with self._lock:
+            conn = self._connect()
+            with conn:
+                conn.executemany(
+                    "UPDATE feeds SET refresh_interval = ? WHERE id = ? AND url = ?",
+                    ((interval, feed_id, url) for feed_id, (url, interval) in intervals.items())
+                )
+
+    def close(self) -> None:
+        """Close the database connection (it is reopened on next use)."""
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
 
 class FeedRegistry:
-    """Manages registration and retrieval of feed sources."""
-    
-    def __init__(self, config_file: Optional[str] = None):
+    """Manages registration and retrieval of feed sources.
+
+    Feeds are stored by a backend: SQLiteRegistryBackend by default, or
+    JSONRegistryBackend when a config file is given. Feeds are kept in
+    memory by ID; lookups by category or host are answered by the backend,
+    from its indexes.
+    """
+
+    def __init__(
+        self,
+        config_file: Optional[str] = None,
+        backend: Optional[Union[JSONRegistryBackend, SQLiteRegistryBackend]] = None
+    ):
         """Initialize the feed registry.
-        
+
         Args:
-            config_file: Optional path to a custom configuration file.
-                If None, the default configuration location is used.
+            config_file: Optional path to a custom JSON configuration file.
+                If None, the registry database in the default configuration
+                location is used.
+            backend: Optional storage backend, overriding config_file
         """
-        self.config_file = config_file or "feeds.json"
+        self.config_file = config_file or LEGACY_FEEDS_FILE
+        if backend is None:
+            backend = JSONRegistryBackend(config_file) if config_file else SQLiteRegistryBackend()
+        self.backend = backend
         self.feeds: Dict[str, FeedSource] = {}
+        self._saved_intervals: Dict[str, int] = {}  # Feed URL -> interval in the backend
         self._load_feeds()
-    
+
     def _load_feeds(self) -> None:
-        """Load feeds from config file."""
-        feed_data = load_config(
-            self.config_file, 
-            default=DEFAULT_CONFIG.get("default_feeds", {})
-        )
-        
-        for feed_id, feed_info in feed_data.items():
-            self.feeds[feed_id] = FeedSource(
-                feed_info["name"], 
-                feed_info["url"], 
-                feed_info.get("category", "general")
-            )
-    
-    def _save_feeds(self) -> None:
-        """Save feeds to config file."""
-        feed_data = {}
-        for feed_id, feed in self.feeds.items():
-            feed_data[feed_id] = {
-                "name": feed.name,
-                "url": feed.url,
-                "category": feed.category
-            }
-        
-        save_config(self.config_file, feed_data)
-    
+        """Load feeds from the backend."""
+        for feed_id, feed_info in self.backend.load().items():
+            feed = self._create_source(feed_info)
+            self.feeds[feed_id] = feed
+
+    def _create_source(self, feed_info: Dict[str, Any]) -> FeedSource:
+        feed = FeedSource(feed_info["name"], feed_info["url"], feed_info.get("category", "general"))
+        self._apply_refresh_interval(feed, feed_info)
+        return feed
+
+    def _apply_refresh_interval(self, feed: FeedSource, feed_info: Dict) -> None:
+        """Use the refresh interval learned in an earlier run, if any."""
+        if feed_info.get("refresh_interval"):
+            feed.cache_duration = feed_info["refresh_interval"]
+        self._saved_intervals[feed.url] = feed.cache_duration
+
+    def reload(self) -> None:
+        """Pick up feeds added or removed by other processes.
+
+        Feeds whose name, URL and category are unchanged keep their FeedSource.
+        """
+        feeds = {}
+        for feed_id, feed_info in self.backend.load().items():
+            feed = self.feeds.get(feed_id)
+            category = feed_info.get("category", "general")
+            if feed is None or (feed.name, feed.url, feed.category) != (
+                feed_info["name"], feed_info["url"], category
+            ):
+                feed = self._create_source(feed_info)
+            feeds[feed_id] = feed
+        self.feeds = feeds
+
+    @staticmethod
+    def _feed_info(feed: FeedSource) -> Dict[str, Any]:
+        """Get the stored entry of a feed."""
+        feed_info: Dict[str, Any] = {"name": feed.name, "url": feed.url, "category": feed.category}
+        if feed.cache_duration != feed.base_cache_duration:
+            feed_info["refresh_interval"] = feed.cache_duration
+        return feed_info
+
+    def update_refresh_intervals(self) -> bool:
+        """Save the refresh intervals the feeds have adapted since they were loaded.
+
+        Feeds adapt their interval (cache_duration) to the publisher's hints
+        and their observed cadence whenever they are downloaded; storing it
+        lets later processes, the cache and the refresh daemon use it.
+
+        Returns:
+            True if anything changed and the configuration was saved
+        """
+        changed = {
+            feed_id: feed for feed_id, feed in self.feeds.items()
+            if self._saved_intervals.get(feed.url) != feed.cache_duration
+        }
+        if not changed:
+            return False
+
+        self.backend.set_refresh_intervals({
+            feed_id: (feed.url, self._feed_info(feed).get("refresh_interval"))
+            for feed_id, feed in changed.items()
+        })
+        for feed in changed.values():
+            self._saved_intervals[feed.url] = feed.cache_duration
+        return True
+
     def add_feed(self, feed_id: str, name: str, url: str, category: str = "general") -> FeedSource:
         """Add a new feed source.
-        
+
         Args:
             feed_id: Unique identifier for the feed
             name: Display name for the feed
             url: URL of the feed
             category: Category of the feed (default: "general")
-            
+
         Returns:
             The newly created FeedSource object
         """
-        self.feeds[feed_id] = FeedSource(name, url, category)
-        self._save_feeds()
-        return self.feeds[feed_id]
-    
+        return self.add_feeds([(feed_id, name, url, category)])[0]
+
+    def add_feeds(self, feeds: Iterable[Tuple[str, str, str, str]]) -> List[FeedSource]:
+        """Add several feed sources, stored in one write.
+
+        Args:
+            feeds: (feed ID, name, URL, category) of each feed
+
+        Returns:
+            The newly created FeedSource objects, in the order given
+        """
+        added: Dict[str, FeedSource] = {}
+        for feed_id, name, url, category in feeds:
+            added[feed_id] = FeedSource(name, url, category)
+        self.backend.put({feed_id: self._feed_info(feed) for feed_id, feed in added.items()})
+
+        for feed_id, feed in added.items():
+            self.feeds[feed_id] = feed
+            self._saved_intervals[feed.url] = feed.cache_duration
+        return list(added.values())
+
     def remove_feed(self, feed_id: str) -> None:
         """Remove a feed source.
-        
+
         Args:
             feed_id: ID of the feed to remove
         """
-        if feed_id in self.feeds:
+        self.remove_feeds([feed_id])
+
+    def remove_feeds(self, feed_ids: Iterable[str]) -> None:
+        """Remove several feed sources, in one write; unknown IDs are ignored."""
+        removed = [feed_id for feed_id in dict.fromkeys(feed_ids) if feed_id in self.feeds]
+        if not removed:
+            return
+        self.backend.delete(removed)
+        for feed_id in removed:
             del self.feeds[feed_id]
-            self._save_feeds()
-    
+
     def get_feed(self, feed_id: str) -> FeedSource:
         """Get a feed source by ID.
-        
+
         Args:
             feed_id: ID of the feed to retrieve
-            
+
         Returns:
             The requested FeedSource object
-            
+
         Raises:
             ValueError: If the feed ID is not found
         """
         if feed_id not in self.feeds:
             raise ValueError(f"Feed with ID {feed_id} not found")
         return self.feeds[feed_id]
-    
+
     def list_feeds(self) -> List[Dict[str, str]]:
         """List all available feeds.
-        
+
         Returns:
             List of dictionaries containing feed information
         """
@@ -98,17 +412,33 @@ class FeedRegistry:
             {"id": feed_id, "name": feed.name, "category": feed.category}
             for feed_id, feed in self.feeds.items()
         ]
-    
+
     def get_feeds_by_category(self, category: str) -> List[FeedSource]:
         """Get all feeds in a specific category.
-        
+
         Args:
-            category: Category name to filter by
-            
+            category: Category name to filter by (case-insensitive)
+
         Returns:
             List of FeedSource objects in the specified category
         """
-        return [
-            feed for feed in self.feeds.values() 
-            if feed.category.lower() == category.lower()
-        ]
\ No newline at end of file
+        return self._find(category=category)
+
+    def get_feeds_by_host(self, host: str) -> List[FeedSource]:
+        """Get all feeds served from a host.
+
+        Args:
+            host: Host name, e.g. "www.nature.com"
+
+        Returns:
+            List of FeedSource objects whose URL is on the host
+        """
+        return self._find(host=host)
+
+    def _find(self, **criteria: str) -> List[FeedSource]:
+        """Look feeds up in the backend, in registration order.
+
+        Feeds that other processes added since this registry was loaded are
+        left out, as they are from feeds (see reload).
+        """
+        return [self.feeds[feed_id] for feed_id in self.backend.find(**criteria) if feed_id in self.feeds]
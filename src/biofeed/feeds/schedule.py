@@ -0,0 +1,157 @@
+"""Per-feed refresh intervals from publisher hints and observed cadence."""
+
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from statistics import median
+from typing import Any, Dict, Iterable, List, Mapping, Optional
+import re
+import time
+
+from biofeed.utils.config import DEFAULT_CONFIG
+
+SCHEDULE_CONFIG = DEFAULT_CONFIG.get("schedule", {})
+
+# Only the channel header is scanned for hints, not the whole body
+_HEAD_SIZE = 64 * 1024
+_TTL_RE = re.compile(rb"<ttl>\s*(\d+)\s*</ttl>", re.IGNORECASE)
+_SKIP_HOURS_RE = re.compile(rb"<skipHours>(.*?)</skipHours>", re.IGNORECASE | re.DOTALL)
+_HOUR_RE = re.compile(rb"<hour>\s*(\d+)\s*</hour>", re.IGNORECASE)
+_UPDATE_PERIOD_RE = re.compile(rb"<sy:updatePeriod>\s*(\w+)\s*</sy:updatePeriod>", re.IGNORECASE)
+_UPDATE_FREQUENCY_RE = re.compile(rb"<sy:updateFrequency>\s*(\d+)\s*</sy:updateFrequency>", re.IGNORECASE)
+_MAX_AGE_RE = re.compile(r"(?:s-maxage|max-age)\s*=\s*\"?(\d+)", re.IGNORECASE)
+
+_PERIODS = {
+  "hourly": 3600,
+  "daily": 86400,
+  "weekly": 7 * 86400,
+  "monthly": 30 * 86400,
+  "yearly": 365 * 86400,
+}
+
+# Publish times closer together than this count as one batch
+_BATCH_WINDOW = 60
+
+def header_max_age(headers: Mapping[str, str]) -> Optional[float]:
+  """Get the freshness lifetime an HTTP response allows, in seconds.
+
+  Uses Cache-Control max-age/s-maxage, or else Expires relative to Date.
+
+  Returns:
+      Seconds (0 for no-cache/no-store), or None if the response says nothing
+  """
+  cache_control = headers.get("Cache-Control") or ""
+  if re.search(r"no-cache|no-store", cache_control, re.IGNORECASE):
+      return 0.0
+  match = _MAX_AGE_RE.search(cache_control)
+  if match:
+      return float(match.group(1))
+
+  expires = headers.get("Expires")
+  if not expires:
+      return None
+  try:
+      expires_at = parsedate_to_datetime(expires).timestamp()
+  except (TypeError, ValueError, IndexError):
+      return 0.0  # Invalid dates mean "already expired"
+  try:
+      now = parsedate_to_datetime(headers["Date"]).timestamp()
+  except (KeyError, TypeError, ValueError, IndexError):
+      now = time.time()
+  return max(0.0, expires_at - now)
+
+def feed_hints(content: bytes) -> Dict[str, Any]:
+  """Read the polling hints a publisher put in a feed's channel header.
+
+  Understands RSS <ttl> (minutes) and <skipHours>, and the syndication
+  module's <sy:updatePeriod>/<sy:updateFrequency>.
+
+  Args:
+      content: The raw feed body
+
+  Returns:
+      Dictionary with "ttl" (seconds) and/or "skip_hours" (UTC hours)
+  """
+  head = content[:_HEAD_SIZE]
+  hints: Dict[str, Any] = {}
+
+  match = _TTL_RE.search(head)
+  if match:
+      hints["ttl"] = int(match.group(1)) * 60
+  else:
+      period = _UPDATE_PERIOD_RE.search(head)
+      if period and period.group(1).decode().lower() in _PERIODS:
+          frequency = _UPDATE_FREQUENCY_RE.search(head)
+          times = max(1, int(frequency.group(1))) if frequency else 1
+          hints["ttl"] = _PERIODS[period.group(1).decode().lower()] // times
+
+  match = _SKIP_HOURS_RE.search(head)
+  if match:
+      hours = sorted({int(hour) % 24 for hour in _HOUR_RE.findall(match.group(1))})
+      if hours:
+          hints["skip_hours"] = hours
+  return hints
+
+def publish_cadence(timestamps: Iterable[Optional[float]]) -> Optional[float]:
+  """Estimate how often a feed publishes from its entries' publish times.
+
+  Entries published within a minute of each other count as one batch, so a
+  journal that releases a whole issue at once is seen as publishing once.
+
+  Returns:
+      Median number of seconds between batches, or None if there are fewer
+      than two batches
+  """
+  batches: List[float] = []
+  for timestamp in sorted(t for t in timestamps if t is not None):
+      if not batches or timestamp - batches[-1] > _BATCH_WINDOW:
+          batches.append(timestamp)
+  if len(batches) < 2:
+      return None
+  return median(later - earlier for earlier, later in zip(batches, batches[1:]))
+
+def refresh_interval(
+    max_age: Optional[float] = None,
+    ttl: Optional[float] = None,
+    cadence: Optional[float] = None,
+    skip_hours: Iterable[int] = (),
+    default: Optional[float] = None,
+    now: Optional[float] = None
+) -> int:
+  """Derive how long a feed's data may be served from cache.
+
+  The publisher's hints (HTTP freshness lifetime, RSS ttl) are honoured as
+  the least time to wait; beyond that the feed is polled about twice per
+  observed publishing interval. The result is bounded by the configured
+  min_interval and max_interval, and stretched past any skipHours.
+
+  Args:
+      max_age: Freshness lifetime allowed by the HTTP response, in seconds
+      ttl: Interval requested in the feed itself, in seconds
+      cadence: Observed seconds between publications
+      skip_hours: UTC hours during which the feed should not be polled
+      default: Interval to use without hints or cadence
+          (defaults to the configured cache duration)
+      now: Current POSIX time (defaults to the actual time)
+
+  Returns:
+      Refresh interval in seconds
+  """
+  minimum = SCHEDULE_CONFIG.get("min_interval", 300)
+  maximum = SCHEDULE_CONFIG.get("max_interval", 86400)
+  if default is None:
+      default = DEFAULT_CONFIG.get("cache_duration", 3600)
+
+  hint = max(max_age or 0, ttl or 0)
+  observed = cadence * SCHEDULE_CONFIG.get("cadence_factor", 0.5) if cadence else 0
+  interval = max(hint, observed) if hint or observed else default
+  interval = min(max(interval, minimum), maximum)
+
+  skip = set(skip_hours)
+  if skip and len(skip) < 24:
+      now = time.time() if now is None else now
+      due = now + interval
+      while datetime.fromtimestamp(due, timezone.utc).hour in skip:
+          # Move to the start of the next hour
+          due = (due // 3600 + 1) * 3600
+      interval = due - now
+  return int(interval)
@@ -1,13 +1,79 @@
 """Configuration management for BioFeed."""
 
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Callable, Dict, Any, Iterator, Optional, Set, Tuple
+import copy
 import json
+import logging
 import os
-from pathlib import Path
-from typing import Dict, Any, Optional
+import tempfile
+import threading
+
+try:
+  import fcntl
+except ImportError:  # Windows
+  fcntl = None
+  import msvcrt
+
+logger = logging.getLogger(__name__)
 
 # Default configuration values
 DEFAULT_CONFIG = {
   "cache_duration": 3600,  # 1 hour in seconds
+  "cache_file": "cache.db",  # persistent feed cache, inside the config dir
+  "registry_file": "feeds.db",  # registered feeds (imported from feeds.json once)
+  "search_index_file": "search.db",  # full-text index of all fetched articles
+  "fulltext_cache_file": "fulltext.db",  # article texts fetched by `read`
+  "archive_file": "archive.db",  # every article ever fetched, by feed
+  "watermark_file": "watermarks.db",  # per-feed record of ingested and read entries
+  "watermarks": {
+      "capacity": 4096,  # entry IDs remembered per feed before the seen-set is rebuilt
+      "error_rate": 0.0001  # chance of an unseen entry being taken for a seen one
+  },
+  "archive_limits": {
+      "retention_days": 0,  # articles published earlier are dropped on compaction (0: keep all)
+      "max_per_feed": 0  # newest articles kept per feed on compaction (0: keep all)
+  },
+  "fulltext_limits": {
+      "max_entries": 2000,  # texts kept; least recently read are evicted
+      "max_bytes": 50 * 1024 * 1024  # total size of the texts kept
+  },
+  "prefetch": {
+      "count": 5,  # full texts prefetched per listing or refreshed feed
+      "max_workers": 4,  # pages fetched at once
+      "max_per_host": 2  # concurrent requests to the same publisher
+  },
+  "cache_limits": {
+      "max_entries": 256,  # feeds held in memory; least recently used are evicted
+      "max_bytes": 64 * 1024 * 1024,  # total (pickled) size of feeds held in memory
+      "ttl": 7 * 24 * 3600,  # seconds after which entries are dropped, also on disk
+      "sweep_interval": 300  # minimum seconds between expiry sweeps
+  },
+  "http": {
+      "pool_connections": 20,  # number of hosts with a pool of kept-alive connections
+      "pool_maxsize": 10,  # connections kept alive per host
+      "timeout": 10,  # seconds
+      "user_agent": "biofeed/0.1.0"
+  },
+  "refresh": {
+      "max_workers": 8,  # feeds fetched concurrently
+      "max_per_host": 2,  # concurrent requests to the same host
+      "max_connections": 100  # total concurrent connections in the asyncio API
+  },
+  "schedule": {
+      "min_interval": 300,  # never treat a feed as stale sooner than this (seconds)
+      "max_interval": 86400,  # always recheck a feed at least this often (seconds)
+      "cadence_factor": 0.5  # poll about twice per observed publishing interval
+  },
+  "daemon": {
+      "max_concurrent": 4,  # feeds refreshed at once by `biofeed daemon`
+      "max_per_host": 2,  # concurrent requests to the same host
+      "lead_time": 120,  # seconds before expiry at which a feed is refreshed
+      "jitter": 0.1,  # fraction of the cache duration a refresh may come early
+      "retry_delay": 300,  # seconds before a failed refresh is retried
+      "poll_interval": 60  # seconds between checks for added or removed feeds
+  },
   "default_feeds": {
       "nature_bioinformatics": {
           "name": "Nature Bioinformatics",
@@ -17,8 +83,11 @@ DEFAULT_CONFIG = {
     }
   }
 
+# Config directories already created by this process
+_created_dirs: Set[Path] = set()
+
 def get_config_dir() -> Path:
-  """Get the configuration directory for BioFeed."""
+  """Get the configuration directory for BioFeed, creating it on first use."""
   # Use XDG_CONFIG_HOME if available, otherwise use ~/.config
   config_home = os.environ.get("XDG_CONFIG_HOME")
   if config_home:
@@ -26,8 +95,10 @@ def get_config_dir() -> Path:
   else:
       config_dir = Path.home() / ".config" / "biofeed"
   
-  # Create the directory if it doesn't exist
-  config_dir.mkdir(parents=True, exist_ok=True)
+  # Create the directory if it doesn't exist, checking once per process
+  if config_dir not in _created_dirs:
+      config_dir.mkdir(parents=True, exist_ok=True)
+      _created_dirs.add(config_dir)
   
   return config_dir
 
@@ -35,30 +106,163 @@ def get_config_file(filename: str) -> Path:
   """Get a configuration file path."""
   return get_config_dir() / filename
 
+@contextmanager
+def _file_lock(path: Path) -> Iterator[None]:
+  """Hold an exclusive lock on path's lock file, across processes."""
+  with open(path.with_name(path.name + ".lock"), "a+b") as lock_file:
+      if fcntl is not None:
+          fcntl.flock(lock_file.fileno(), fcntl.LOCK_EX)
+      else:
+          lock_file.seek(0)
+          msvcrt.locking(lock_file.fileno(), msvcrt.LK_LOCK, 1)
+      try:
+          yield
+      finally:
+          if fcntl is not None:
+              fcntl.flock(lock_file.fileno(), fcntl.LOCK_UN)
+          else:
+              lock_file.seek(0)
+              msvcrt.locking(lock_file.fileno(), msvcrt.LK_UNLCK, 1)
+
+class ConfigStore:
+  """In-process cache of the JSON configuration files.
+
+  A file is parsed again only when its modification time, size or inode
+  changed, so repeated reads cost a stat call. Reads never write: missing
+  or corrupted files give the default. Writes go to a temporary file that
+  is renamed over the original, so readers in other processes always see a
+  complete file, and read-modify-write updates hold a file lock, so
+  concurrent processes (e.g. a cron refresh and an interactive command)
+  never lose each other's changes.
+  """
+
+  def __init__(self):
+    self._files: Dict[Path, Tuple[Tuple[int, int, int], Any]] = {}
+    self._lock = threading.RLock()
+
+  def _read(self, path: Path) -> Optional[Any]:
+    """Get the parsed contents of a file (None if missing or corrupted), not copied."""
+    try:
+        stat = path.stat()
+    except OSError:
+        return None
+    key = (stat.st_mtime_ns, stat.st_size, stat.st_ino)
+    with self._lock:
+        cached = self._files.get(path)
+        if cached is not None and cached[0] == key:
+            return cached[1]
+        try:
+            with open(path, "r") as f:
+                data = json.load(f)
+        except (OSError, json.JSONDecodeError) as e:
+            logger.warning(f"Ignoring unreadable config file {path}: {e}")
+            data = None
+        self._files[path] = (key, data)
+        return data
+
+  def read(self, path: Path, default: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+    """Get a copy of a file's contents, or of the default if it is missing or corrupted."""
+    return copy.deepcopy(self.view(path, default))
+
+  def view(self, path: Path, default: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+    """Get a file's cached contents without copying them; callers must not modify them."""
+    data = self._read(path)
+    return data if data is not None else (default or {})
+
+  def _write(self, path: Path, data: Dict[str, Any]) -> None:
+    """Replace a file atomically (the caller holds the file lock)."""
+    fd, temp_path = tempfile.mkstemp(dir=str(path.parent), prefix=f".{path.name}.", suffix=".tmp")
+    try:
+        with os.fdopen(fd, "w") as f:
+            json.dump(data, f, indent=2)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(temp_path, path)
+    except BaseException:
+        try:
+            os.unlink(temp_path)
+        except OSError:
+            pass
+        raise
+    stat = path.stat()
+    with self._lock:
+        self._files[path] = ((stat.st_mtime_ns, stat.st_size, stat.st_ino), copy.deepcopy(data))
+
+  def write(self, path: Path, data: Dict[str, Any]) -> None:
+    """Replace a file's contents."""
+    with self._lock, _file_lock(path):
+        self._write(path, data)
+
+  def update(
+      self,
+      path: Path,
+      change: Callable[[Dict[str, Any]], None],
+      default: Optional[Dict[str, Any]] = None
+  ) -> bool:
+    """Change a file's contents in place, under the file lock.
+
+    Args:
+        path: The file to update
+        change: Modifies the current contents (or a copy of the default)
+        default: Contents to start from if the file is missing or corrupted
+
+    Returns:
+        True if the contents changed and the file was written
+    """
+    with self._lock, _file_lock(path):
+        current = self._read(path)
+        data = copy.deepcopy(current if current is not None else (default or {}))
+        change(data)
+        if current is not None and data == current:
+            return False
+        self._write(path, data)
+        return True
+
+  def clear(self) -> None:
+    """Forget the cached contents (files are read again on next access)."""
+    with self._lock:
+        self._files.clear()
+
+# Global config store shared by everything in the process
+config_store = ConfigStore()
+
 def load_config(filename: str, default: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
-  """Load a configuration file, creating it with default values if it doesn't exist."""
-  config_file = get_config_file(filename)
-  
-  if not config_file.exists():
-      # Create the file with default values
-      config_data = default or {}
-      with open(config_file, "w") as f:
-          json.dump(config_data, f, indent=2)
-      return config_data
-  
-  try:
-      with open(config_file, "r") as f:
-          return json.load(f)
-  except json.JSONDecodeError:
-      # If the file is corrupted, create a new one with default values
-      config_data = default or {}
-      with open(config_file, "w") as f:
-          json.dump(config_data, f, indent=2)
-      return config_data
+  """Load a configuration file without creating or repairing it.
+
+  Returns:
+      The file's contents, or a copy of the default if it is missing or
+      corrupted (until the file is saved)
+  """
+  return config_store.read(get_config_file(filename), default)
+
+# Reading never writes, so both names do the same
+read_config = load_config
+
+def view_config(filename: str, default: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+  """Get a configuration file's contents for reading only, without copying them.
+
+  Cheaper than load_config for lookups that scan a large file; the result
+  is shared with later reads and must not be modified.
+  """
+  return config_store.view(get_config_file(filename), default)
 
 def save_config(filename: str, config_data: Dict[str, Any]) -> None:
-  """Save configuration to a file."""
-  config_file = get_config_file(filename)
-  
-  with open(config_file, "w") as f:
-      json.dump(config_data, f, indent=2)
\ No newline at end of file
+  """Save configuration to a file, atomically."""
+  config_store.write(get_config_file(filename), config_data)
+
+def update_config(
+    filename: str,
+    change: Callable[[Dict[str, Any]], None],
+    default: Optional[Dict[str, Any]] = None
+) -> bool:
+  """Apply a change to a configuration file, keeping other processes' changes.
+
+  Args:
+      filename: Name of the file inside the configuration directory
+      change: Modifies the file's current contents in place
+      default: Contents to start from if the file is missing or corrupted
+
+  Returns:
+      True if the contents changed and the file was written
+  """
+  return config_store.update(get_config_file(filename), change, default)
@@ -0,0 +1,75 @@
+"""Date handling helpers for BioFeed."""
+
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from functools import lru_cache
+from typing import Optional
+import time
+
+def parse_timestamp(date_str: Optional[str]) -> Optional[float]:
+  """Convert a feed date string to a POSIX timestamp.
+
+  Handles RFC 3339/ISO 8601 dates (Atom, JSON Feed) and RFC 822 dates (RSS)
+  directly, and anything else with dateparser. Dates without a timezone are
+  assumed to be UTC. Results are memoized, since the same dates recur across
+  the entries of a feed and across refreshes.
+
+  Args:
+      date_str: Date string as found in the feed
+
+  Returns:
+      Seconds since the epoch, or None if the date cannot be parsed
+  """
+  if not date_str or not isinstance(date_str, str):
+      return None
+  return _parse_timestamp(date_str.strip())
+
+def to_epoch(date_str: Optional[str]) -> Optional[int]:
+  """Convert a feed date string to whole seconds since the epoch.
+
+  Args:
+      date_str: Date string as found in the feed
+
+  Returns:
+      Seconds since the epoch, or None if the date cannot be parsed
+  """
+  timestamp = parse_timestamp(date_str)
+  return None if timestamp is None else int(timestamp)
+
+def format_timestamp(timestamp: float, fmt: str = "%Y-%m-%d") -> str:
+  """Format a POSIX timestamp as a UTC date string."""
+  return time.strftime(fmt, time.gmtime(timestamp))
+
+@lru_cache(maxsize=4096)
+def _parse_timestamp(value: str) -> Optional[float]:
+  dt = None
+  try:
+      # fromisoformat() only accepts a trailing 'Z' from Python 3.11
+      dt = datetime.fromisoformat(value[:-1] + "+00:00" if value.endswith("Z") else value)
+  except ValueError:
+      try:
+          dt = parsedate_to_datetime(value)
+      except (TypeError, ValueError, IndexError):
+          dt = _parse_fallback(value)
+  if dt is None:
+      return None
+
+  if dt.tzinfo is None:
+      dt = dt.replace(tzinfo=timezone.utc)
+  return dt.timestamp()
+
+def _parse_fallback(value: str) -> Optional[datetime]:
+  """Parse an unusual date format with dateparser (slow, imported on demand)."""
+  try:
+      import dateparser
+  except ImportError:
+      return None
+  try:
+      # Relative dates ("2 days ago") are left out: they would go stale in the memo
+      return dateparser.parse(value, settings={
+        "TIMEZONE": "UTC",
+        "RETURN_AS_TIMEZONE_AWARE": True,
+        "PARSERS": ["timestamp", "custom-formats", "absolute-time"],
+      })
+  except Exception:
+      return None
@@ -0,0 +1,105 @@
+"""Shared HTTP transport for BioFeed.
+
+All network access (feeds and full-text pages) goes through one
+requests.Session so connections to the same host are pooled and kept alive,
+and TLS handshakes are reused across feeds and articles.
+"""
+
+import threading
+from contextlib import contextmanager
+from typing import TYPE_CHECKING, Any, Dict, Iterator, Optional
+from urllib.parse import urlparse
+
+from biofeed.utils.config import DEFAULT_CONFIG
+
+if TYPE_CHECKING:
+  import requests
+
+# requests is imported with the first session, so commands that never touch
+# the network don't pay for it
+_session: Optional["requests.Session"] = None
+_settings: Dict[str, Any] = dict(DEFAULT_CONFIG.get("http", {}))
+_lock = threading.Lock()
+
+def configure(**settings: Any) -> None:
+  """Change the transport settings.
+
+  Accepts the keys of DEFAULT_CONFIG["http"] (pool_connections, pool_maxsize,
+  timeout, user_agent). The shared session is rebuilt on next use.
+  """
+  global _session
+  with _lock:
+      _settings.update(settings)
+      if _session is not None:
+          _session.close()
+          _session = None
+
+def get_session() -> "requests.Session":
+  """Get the shared session, creating it on first use."""
+  global _session
+  with _lock:
+      if _session is None:
+          import requests
+          from requests.adapters import HTTPAdapter
+
+          session = requests.Session()
+          # One pool per host, each keeping up to pool_maxsize connections alive
+          adapter = HTTPAdapter(
+              pool_connections=_settings.get("pool_connections", 20),
+              pool_maxsize=_settings.get("pool_maxsize", 10)
+          )
+          session.mount("http://", adapter)
+          session.mount("https://", adapter)
+          session.headers["User-Agent"] = _settings.get("user_agent", "biofeed")
+          _session = session
+      return _session
+
+def get(url: str, **kwargs: Any) -> "requests.Response":
+  """Send a GET request through the shared session.
+
+  Args:
+      url: URL to fetch
+      **kwargs: Extra arguments for requests; timeout defaults to the
+          configured value
+
+  Returns:
+      The HTTP response
+  """
+  kwargs.setdefault("timeout", _settings.get("timeout", 10))
+  return get_session().get(url, **kwargs)
+
+def close() -> None:
+  """Close the shared session and its pooled connections."""
+  global _session
+  with _lock:
+      if _session is not None:
+          _session.close()
+          _session = None
+
+def get_host(url: str) -> str:
+  """Get the lowercase host name of a URL."""
+  return urlparse(url).netloc.lower()
+
+class HostLimiter:
+  """Caps the number of concurrent requests to any single host."""
+
+  def __init__(self, max_per_host: int):
+      """Initialize the limiter.
+
+      Args:
+          max_per_host: Maximum number of concurrent requests per host
+      """
+      self.max_per_host = max(1, max_per_host)
+      self._semaphores: Dict[str, threading.Semaphore] = {}
+      self._lock = threading.Lock()
+
+  @contextmanager
+  def limit(self, url: str) -> Iterator[None]:
+      """Hold one of the slots of the URL's host for the duration of the block."""
+      host = get_host(url)
+      with self._lock:
+          semaphore = self._semaphores.setdefault(
+              host, threading.Semaphore(self.max_per_host)
+          )
+      with semaphore:
+          yield
@@ -0,0 +1,84 @@
+"""Startup checks for the biofeed CLI.
+
+Every command starts a new interpreter, so import time is paid on each
+invocation (including shell completion). These tests keep heavy
+dependencies off the paths that don't need them, and hold the import time
+of the CLI module to a budget.
+"""
+import json
+import os
+import subprocess
+import sys
+from unittest.mock import MagicMock, patch
+
+from biofeed.cli.commands import handle_prefetch_command, handle_read_command, parse_args
+from biofeed.core.controller import ReaderController
+from biofeed.core.formatter import ArticleFormatter
+from biofeed.feeds.article import Article
+from biofeed.feeds.registry import FeedRegistry
+
+# Generous compared to the ~50 ms measured, to catch regressions (such as a
+# heavy dependency imported at module level) rather than machine noise
+IMPORT_BUDGET = float(os.environ.get("BIOFEED_IMPORT_BUDGET", "0.5"))
+
+HEAVY_MODULES = ["bs4", "requests", "fastfeedparser", "dateparser", "aiohttp"]
+
+def run_python(code):
+  result = subprocess.run(
+    [sys.executable, "-c", code], capture_output=True, text=True, check=True, env=os.environ
+  )
+  return result.stdout
+
+def test_feeds_list_does_not_import_heavy_modules():
+  code = (
+    "import sys, json, contextlib, io\n"
+    "from biofeed.cli.commands import main\n"
+    "with contextlib.redirect_stdout(io.StringIO()):\n"
+    "    main(['feeds', '--list'])\n"
+    f"print(json.dumps([m for m in {HEAVY_MODULES!r} if m in sys.modules]))\n"
+  )
+  assert json.loads(run_python(code)) == []
+
+def test_package_import_is_lazy():
+  code = (
+    "import sys, biofeed\n"
+    "print('biofeed.core.controller' in sys.modules)\n"
+    "biofeed.ReaderController\n"
+    "print('biofeed.core.controller' in sys.modules)\n"
+  )
+  assert run_python(code).split() == ["False", "True"]
+
+def test_cli_import_time_budget():
+  code = (
+    "import time\n"
+    "start = time.perf_counter()\n"
+    "import biofeed.cli.commands\n"
+    "print(time.perf_counter() - start)\n"
+  )
+  # Best of three, to discount a cold disk cache
+  elapsed = min(float(run_python(code)) for _ in range(3))
+  assert elapsed < IMPORT_BUDGET, f"CLI import took {elapsed:.3f}s (budget {IMPORT_BUDGET}s)"
+
+def test_read_shows_archived_article_of_removed_feed(capsys):
+  controller = MagicMock(spec=ReaderController)
+  controller.registry = MagicMock(spec=FeedRegistry)
+  controller.registry.feeds = {}
+  controller.get_article.return_value = Article(
+    id="a1", title="Brain atlas", link="https://example.com/a1", published="", feed_id="removed"
+  )
+  args = parse_args(["read", "removed:a1"])
+  handle_read_command(controller, ArticleFormatter(), args)
+  output = capsys.readouterr().out
+  assert "Brain atlas" in output and "Error" not in output
+
+@patch("biofeed.core.fulltext.prefetch_full_texts", return_value=1)
+def test_prefetch_passes_feed_urls(mock_prefetch, capsys):
+  controller = MagicMock(spec=ReaderController)
+  # doi.org links are only matched to an extractor through their feed
+  args = parse_args([
+    "prefetch", "https://doi.org/10.1038/a", "https://doi.org/10.1038/b",
+    "--feed-url", "https://www.nature.com/nbt.rss", "--feed-url", "",
+  ])
+  handle_prefetch_command(controller, args)
+  links = mock_prefetch.call_args.args[0]
+  assert links == [("https://doi.org/10.1038/a", "https://www.nature.com/nbt.rss"), ("https://doi.org/10.1038/b", None)]
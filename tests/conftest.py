@@ -0,0 +1,24 @@
+"""Shared test configuration."""
+import pathlib
+import shutil
+import pytest
+
+from biofeed.core.fulltext import fulltext_cache
+from biofeed.feeds.cache import cache
+
+FIXTURES = pathlib.Path(__file__).resolve().parent / "feeds" / "fixtures"
+
+@pytest.fixture(autouse=True)
+def isolated_config(tmp_path, monkeypatch):
+  """Point the config directory at a temporary one seeded with the fixture feeds."""
+  config_dir = tmp_path / "config" / "biofeed"
+  config_dir.mkdir(parents=True)
+  shutil.copy(FIXTURES / "feeds.json", config_dir / "feeds.json")
+  monkeypatch.setenv("XDG_CONFIG_HOME", str(config_dir.parent))
+
+  # The global caches are persistent: make them open the temporary databases
+  cache.close()
+  fulltext_cache.close()
+  yield config_dir
+  cache.close()
+  fulltext_cache.close()
@@ -0,0 +1,103 @@
+"""Tests for the append-only article archive."""
+import time
+from itertools import islice
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from biofeed.core.archive import ArticleArchive
+from biofeed.core.controller import ReaderController
+from biofeed.core.search import SearchIndex
+from biofeed.feeds.article import Article
+from biofeed.feeds.feed_parser import ParsedFeed
+from biofeed.feeds.feed_source import FeedSource
+from biofeed.feeds.registry import FeedRegistry
+
+DAY = 86400
+
+def make_article(i, published_ts=None, title=None):
+  return Article(id=f"a{i}", title=title or f"Article {i}", link=f"https://example.com/{i}",
+                 published="", published_ts=published_ts)
+
+@pytest.fixture
+def archive(tmp_path):
+  archive = ArticleArchive(tmp_path / "archive.db")
+  yield archive
+  archive.close()
+
+def test_append_dedupes_on_feed_and_id(archive, tmp_path):
+  assert archive.append("nature", [make_article(i, i * DAY) for i in range(3)]) == 3
+  # The window moved on: one article left, one is new
+  assert archive.append("nature", [make_article(i, i * DAY) for i in range(1, 4)]) == 1
+  # The same article in another feed is archived for that feed
+  assert archive.append("plos", [make_article(1, DAY)]) == 1
+  assert archive.count("nature") == 4 and len(archive) == 5
+
+  archive.close()
+  reopened = ArticleArchive(tmp_path / "archive.db")
+  article = reopened.get("nature", "a0")
+  assert article.title == "Article 0" and article.feed_id == "nature"
+  assert reopened.get("plos", "a0") is None
+  reopened.close()
+
+def test_scan_time_ranges_in_batches(archive):
+  archive.append("nature", [make_article(i, i * DAY) for i in range(0, 10, 2)])
+  archive.append("plos", [make_article(i, i * DAY) for i in range(1, 10, 2)])
+
+  newest = [a.id for a in archive.scan(batch_size=3)]
+  assert newest == [f"a{i}" for i in range(9, -1, -1)]
+  assert [a.id for a in archive.scan(newest_first=False, batch_size=4)] == newest[::-1]
+  assert [a.id for a in archive.scan(since=3 * DAY, until=6 * DAY, batch_size=1)] == ["a5", "a4", "a3"]
+  assert [a.id for a in archive.scan(["plos"], since=5 * DAY)] == ["a9", "a7", "a5"]
+  assert list(archive.scan([])) == []
+  assert [a.id for a in islice(archive.scan(batch_size=2), 3)] == ["a9", "a8", "a7"]
+
+def test_undated_articles_sort_by_first_seen(archive):
+  archive.append("nature", [make_article(0, 1000)])
+  archive.append("nature", [make_article(1)])
+  assert [a.id for a in archive.scan()] == ["a1", "a0"]
+
+def test_compact_drops_old_and_excess_articles(archive):
+  now = time.time()
+  archive.append("nature", [make_article(i, int(now - i * DAY)) for i in range(5)])
+  archive.append("plos", [make_article(i, int(now - i * DAY)) for i in range(2)])
+
+  assert archive.compact(retention_days=3.5, max_per_feed=0) == {"nature": ["a4"]}
+  removed = archive.compact(retention_days=0, max_per_feed=2)
+  assert sorted(removed["nature"]) == ["a2", "a3"] and "plos" not in removed
+  assert archive.stats()["nature"][0] == 2
+
+@patch.object(ReaderController, '_initialize')
+def test_controller_keeps_articles_that_left_the_feed(mock_init, tmp_path):
+  registry = MagicMock(spec=FeedRegistry)
+  feed = MagicMock(spec=FeedSource, url="https://www.nature.com/a.atom")
+  feed.name = "Nature"
+  registry.feeds = {"nature": feed}
+  registry.get_feed.return_value = feed
+  controller = ReaderController(
+    registry=registry,
+    search_index=SearchIndex(tmp_path / "search.db"),
+    archive=ArticleArchive(tmp_path / "archive.db")
+  )
+
+  feed.get_feed.return_value = ParsedFeed([make_article(0, DAY, "Brain atlas"), make_article(1, 2 * DAY)])
+  controller.refresh_all()
+  feed.get_feed.return_value = ParsedFeed([make_article(1, 2 * DAY), make_article(2, 3 * DAY)])
+  controller.refresh_all()
+  feed.get_article.side_effect = ValueError("Article not found")
+
+  assert [a.id for a in controller.get_archived_articles(count=10)] == ["a2", "a1", "a0"]
+  assert controller.get_article("nature:a0").title == "Brain atlas"
+  assert [a.id for a in controller.search_articles("brain")] == ["a0"]
+  with pytest.raises(ValueError):
+    controller.get_article("nature:missing")
+
+  assert controller.compact_archive(max_per_feed=2) == 1
+  assert controller.search_articles("brain") == []
+
+def test_arrivals_are_streamed_in_batches(archive):
+  archive.append("nature", [make_article(i, i * DAY) for i in range(5)])
+  arrivals = archive.arrivals("nature", until=time.time() + 1, batch_size=2)
+  assert not isinstance(arrivals, list)
+  assert [(a.id, a.feed_id) for a in arrivals] == [(f"a{i}", "nature") for i in range(4, -1, -1)]
+  assert list(archive.arrivals("nature", after=time.time() + 1)) == []
@@ -0,0 +1,113 @@
+"""Tests for the asyncio-native controller."""
+import asyncio
+import threading
+import pytest
+from types import SimpleNamespace
+from unittest.mock import MagicMock
+
+pytest.importorskip("aiohttp")
+
+from biofeed.core.archive import ArticleArchive
+from biofeed.core.async_controller import AsyncReaderController
+from biofeed.core.controller import ReaderController
+from biofeed.core.search import SearchIndex
+from biofeed.core.watermarks import WatermarkStore
+from biofeed.feeds.async_source import AsyncFeedSource
+from biofeed.feeds.cache import FeedCache
+from biofeed.feeds.feed_parser import FeedParser, ParsedFeed
+from biofeed.feeds.feed_source import FeedSource
+from biofeed.feeds.registry import FeedRegistry
+
+def test_async_refresh_ingests_like_the_sync_controller(monkeypatch, tmp_path):
+  registry = MagicMock(spec=FeedRegistry)
+  registry.feeds = {
+    "good": FeedSource("Good", "https://example.com/good.xml"),
+    "bad": FeedSource("Bad", "https://example.com/bad.xml"),
+  }
+  controller = ReaderController(
+    registry=registry, search_index=SearchIndex(tmp_path / "search.db"),
+    archive=ArticleArchive(tmp_path / "archive.db"), watermarks=WatermarkStore(tmp_path / "watermarks.db")
+  )
+  entries = [SimpleNamespace(id=f"urn:{i}", title=f"Brain atlas {i}", link=f"https://example.com/{i}") for i in range(2)]
+
+  async def fake_get_feed(self, force_refresh=False):
+    if self.source.name == "Bad":
+      raise ValueError("Failed to fetch feed")
+    await asyncio.sleep(0)
+    return ParsedFeed.from_raw(SimpleNamespace(entries=entries), "v1")
+  monkeypatch.setattr(AsyncFeedSource, "get_feed", fake_get_feed)
+
+  async def scenario():
+    async with AsyncReaderController(controller) as async_controller:
+      return await async_controller.refresh_all()
+
+  results = asyncio.run(scenario())
+  assert [(r.feed_id, r.article_count, r.new_count, r.ok) for r in results] == [
+    ("good", 2, 2, True), ("bad", 0, 0, False)
+  ]
+  registry.update_refresh_intervals.assert_called_once()
+  # Searchable, archived and listed as new, as after a sync refresh
+  assert len(controller.search_articles("brain")) == 2
+  assert len(controller.get_archived_articles(feed_ids=["good"])) == 2
+  assert controller.watermarks.get("good").version == "v1"
+
+def test_entries_are_normalized_off_the_event_loop(monkeypatch):
+  feed = FeedSource("Example", "https://example.com/feed.xml")
+  feed._cache = FeedCache()
+  entries = [SimpleNamespace(id=f"urn:{i}", title=f"Paper {i}", link=f"https://example.com/{i}") for i in range(5)]
+  feed._cache.set(feed.url, ParsedFeed.from_raw(SimpleNamespace(entries=entries)))
+  registry = MagicMock(spec=FeedRegistry)
+  registry.feeds = {"example": feed}
+  registry.get_feed.return_value = feed
+  controller = ReaderController(registry=registry)
+
+  threads = set()
+  normalize_entry = FeedParser.normalize_entry
+  def recording_normalize(*args):
+    threads.add(threading.get_ident())
+    return normalize_entry(*args)
+  monkeypatch.setattr(FeedParser, "normalize_entry", staticmethod(recording_normalize))
+
+  async def scenario():
+    async with AsyncReaderController(controller) as async_controller:
+      async_controller.select_feed("example")
+      recent = await async_controller.get_recent_articles(count=2)
+      article = await async_controller.get_article("3")
+      articles = await async_controller._source(feed).get_articles()
+      return threading.get_ident(), recent, article, articles
+
+  loop_thread, recent, article, articles = asyncio.run(scenario())
+  assert [a.title for a in recent] == ["Paper 0", "Paper 1"] and article.title == "Paper 3"
+  assert len(articles) == 5
+  assert threads and loop_thread not in threads
+
+def test_async_listing_archives_and_indexes_off_the_event_loop(monkeypatch, tmp_path):
+  feed = FeedSource("Example", "https://example.com/feed.xml")
+  entries = [SimpleNamespace(id=f"urn:{i}", title=f"Brain atlas {i}", link=f"https://example.com/{i}") for i in range(3)]
+  feed._cache.set(feed.url, ParsedFeed.from_raw(SimpleNamespace(entries=entries)))
+  registry = MagicMock(spec=FeedRegistry)
+  registry.feeds = {"example": feed}
+  registry.get_feed.return_value = feed
+  controller = ReaderController(
+    registry=registry, search_index=SearchIndex(tmp_path / "search.db"),
+    archive=ArticleArchive(tmp_path / "archive.db"), watermarks=WatermarkStore(tmp_path / "watermarks.db")
+  )
+
+  threads = set()
+  def recording_read_config(*args, **kwargs):
+    threads.add(threading.get_ident())
+    return {"last_feed": "example"}
+  monkeypatch.setattr("biofeed.core.controller.read_config", recording_read_config)
+
+  async def scenario():
+    async with AsyncReaderController(controller) as async_controller:
+      recent = await async_controller.get_recent_articles(count=2)
+      return threading.get_ident(), recent
+
+  loop_thread, recent = asyncio.run(scenario())
+  assert len(recent) == 2
+  # The settings are read in a worker thread
+  assert threads and loop_thread not in threads
+  # Listed articles are archived and searchable, as after a sync listing
+  assert len(controller.search_articles("brain")) == 2
+  assert len(controller.get_archived_articles(feed_ids=["example"])) == 2
@@ -3,6 +3,7 @@ from unittest.mock import MagicMock, patch
 
 from biofeed.core.controller import ReaderController
 from biofeed.feeds.registry import FeedRegistry
+from biofeed.feeds.feed_parser import ParsedFeed
 from biofeed.feeds.feed_source import FeedSource
 from biofeed.feeds.article import Article
 
@@ -32,11 +33,11 @@ def mock_article():
   )
 
 # Basic initialization test
-@patch("biofeed.core.controller.load_config")
-def test_controller_initialization(mock_load_config):
+@patch("biofeed.core.controller.read_config")
+def test_controller_initialization(mock_read_config):
   # In the _initialize() method of ReaderController, the controller tries to load 
   # the last used feed from settings. To test, we ensure that there is no last feed.
-  mock_load_config.return_value = {"last_feed": None}
+  mock_read_config.return_value = {"last_feed": None}
   with patch("biofeed.core.controller.FeedRegistry") as MockRegistry:
     mock_registry = MockRegistry.return_value
     mock_registry.list_feeds.return_value = [
@@ -45,6 +46,10 @@ def test_controller_initialization(mock_load_config):
     
     controller = ReaderController()
     
+    # Settings are only read once the active feed is needed
+    mock_read_config.assert_not_called()
+    controller.get_active_feed()
+    
     # Should try to get the first feed if no last feed is saved
     mock_registry.get_feed.assert_called_once_with("first_feed")
 
@@ -106,7 +111,7 @@ def test_get_article(mock_init, mock_registry, mock_article):
   
   article = controller.get_article("test-article-1")
   
-  test_feed.get_article.assert_called_once_with("test-article-1")
+  test_feed.get_article.assert_called_once_with("test-article-1", offline=False)
   assert article == mock_article
 
 # Test get_recent_articles method
@@ -117,21 +122,148 @@ def test_get_recent_articles(mock_init, mock_registry):
   controller.active_feed = test_feed
   
   # Mock article results
-  test_articles = [MagicMock(spec=Article) for _ in range(5)]
-  test_feed.get_articles.return_value = test_articles
+  test_articles = [
+    Article(id=str(i), title=f"Article {i}", link=f"https://example.com/{i}", published="")
+    for i in range(5)
+  ]
+  test_feed.get_feed.side_effect = lambda force_refresh: ParsedFeed(test_articles)
+  test_feed.iter_storing.side_effect = lambda parsed: parsed.iter_articles()
   
   # Test default count
   articles = controller.get_recent_articles()
-  test_feed.get_articles.assert_called_once_with(force_refresh=False)
+  test_feed.get_feed.assert_called_once_with(force_refresh=False)
   assert articles == test_articles[:10]  # Default count is 10
   
   # Reset mock and test with custom count
-  test_feed.get_articles.reset_mock()
+  test_feed.get_feed.reset_mock()
   articles = controller.get_recent_articles(count=3)
-  test_feed.get_articles.assert_called_once_with(force_refresh=False)
+  test_feed.get_feed.assert_called_once_with(force_refresh=False)
   assert articles == test_articles[:3]
   
   # Test with force_refresh
-  test_feed.get_articles.reset_mock()
+  test_feed.get_feed.reset_mock()
   articles = controller.get_recent_articles(force_refresh=True)
-  test_feed.get_articles.assert_called_once_with(force_refresh=True)
\ No newline at end of file
+  test_feed.get_feed.assert_called_once_with(force_refresh=True)
+
+@patch.object(ReaderController, '_initialize')
+def test_recent_articles_keep_feed_positions(mock_init, mock_registry):
+  controller = ReaderController(registry=mock_registry)
+  test_feed = mock_registry.get_feed.return_value
+  controller.active_feed = test_feed
+  # The same paper twice in one feed: listing positions must match read positions
+  test_articles = [
+    Article(id=str(i), title="Same paper", link="https://example.com/paper", published="")
+    for i in range(3)
+  ]
+  test_feed.get_feed.return_value = ParsedFeed(test_articles)
+  test_feed.iter_storing.side_effect = lambda parsed: parsed.iter_articles()
+  assert controller.get_recent_articles() == test_articles
+
+@patch.object(ReaderController, '_initialize')
+def test_relisting_an_unchanged_feed_writes_nothing(mock_init, mock_registry, tmp_path):
+  from biofeed.core.watermarks import WatermarkStore
+  search_index, archive = MagicMock(), MagicMock()
+  controller = ReaderController(
+    registry=mock_registry, search_index=search_index, archive=archive,
+    watermarks=WatermarkStore(tmp_path / "watermarks.db")
+  )
+  test_feed = mock_registry.get_feed.return_value
+  controller.active_feed = test_feed
+  test_articles = [
+    Article(id=str(i), title=f"Article {i}", link=f"https://example.com/{i}", published="")
+    for i in range(5)
+  ]
+  versions = iter(["v1", "v1", "v1", "v2"])
+  test_feed.get_feed.side_effect = lambda force_refresh: ParsedFeed(test_articles, version=next(versions))
+  test_feed.iter_storing.side_effect = lambda parsed: parsed.iter_articles()
+  
+  controller.get_recent_articles(count=3)
+  controller.get_recent_articles(count=2)
+  assert archive.append.call_count == 1 and search_index.update_feed.call_count == 1
+  # Listing more of the same version, or a new version, archives again
+  controller.get_recent_articles(count=5)
+  controller.get_recent_articles(count=2)
+  assert archive.append.call_count == 3 and search_index.update_feed.call_count == 3
+
+# Test refresh method
+@patch.object(ReaderController, '_initialize')
+def test_refresh_reports_per_feed_results(mock_init):
+  registry = MagicMock(spec=FeedRegistry)
+  good = MagicMock(spec=FeedSource, url="https://www.nature.com/a.atom")
+  good.get_feed.return_value = ParsedFeed(
+    [Article(id=str(i), title="T", link=f"https://example.com/{i}", published="") for i in range(3)]
+  )
+  bad = MagicMock(spec=FeedSource, url="https://academic.oup.com/b.xml")
+  bad.get_feed.side_effect = ValueError("Failed to fetch feed")
+  registry.feeds = {"good": good, "bad": bad}
+  controller = ReaderController(registry=registry)
+  
+  results = controller.refresh_all(force_refresh=True)
+  
+  assert [result.feed_id for result in results] == ["good", "bad"]
+  assert results[0].ok and results[0].article_count == 3 and results[0].new_count == 3
+  assert not results[1].ok and "Failed to fetch feed" in results[1].error
+  good.get_feed.assert_called_once_with(force_refresh=True)
+
+@patch.object(ReaderController, '_initialize')
+def test_refresh_runs_feeds_concurrently(mock_init):
+  import threading
+  # Each fetch waits until all three are in flight, which only happens in parallel
+  barrier = threading.Barrier(3, timeout=5)
+  def get_feed(force_refresh):
+    barrier.wait()
+    return ParsedFeed()
+  registry = MagicMock(spec=FeedRegistry)
+  registry.feeds = {}
+  for i in range(3):
+    feed = MagicMock(spec=FeedSource, url=f"https://host{i}.org/feed")
+    feed.get_feed.side_effect = get_feed
+    registry.feeds[f"feed{i}"] = feed
+  registry.get_feed.side_effect = registry.feeds.__getitem__
+  controller = ReaderController(registry=registry)
+  
+  results = controller.refresh(["feed0", "feed1", "feed2"], max_workers=3)
+  
+  assert all(result.ok for result in results)
+
+# Test get_timeline method
+@patch.object(ReaderController, '_initialize')
+def test_get_timeline_merges_feeds_by_date(mock_init):
+  registry = MagicMock(spec=FeedRegistry)
+  journal = MagicMock(spec=FeedSource, url="https://www.nature.com/a.atom", category="bioinformatics")
+  journal.get_articles.return_value = [
+    Article(id="0", title="J1", link="https://example.com/J1", published="2025-05-03T00:00:00+00:00"),
+    Article(id="1", title="J2", link="https://example.com/J2", published="Thu, 01 May 2025 08:00:00 GMT"),
+  ]
+  preprints = MagicMock(spec=FeedSource, url="https://www.biorxiv.org/b.xml", category="preprints")
+  preprints.get_articles.return_value = [
+    Article(id="0", title="P1", link="https://example.com/P1", published="2025-05-04T00:00:00Z"),
+    Article(id="1", title="P2", link="https://example.com/P2", published=""),
+    Article(id="2", title="P3", link="https://example.com/P3", published="2025-05-02"),
+  ]
+  registry.feeds = {"journal": journal, "preprints": preprints}
+  registry.get_feeds_by_category.return_value = [journal]
+  controller = ReaderController(registry=registry)
+  
+  timeline = controller.get_timeline(count=4)
+  assert [a.title for a in timeline] == ["P1", "J1", "P3", "J2"]
+  assert [a.feed_id for a in timeline] == ["preprints", "journal", "preprints", "journal"]
+  
+  by_category = controller.get_timeline(count=10, category="Bioinformatics")
+  registry.get_feeds_by_category.assert_called_once_with("Bioinformatics")
+  assert [a.title for a in by_category] == ["J1", "J2"]
+
+# Test remove_feed method
+@patch.object(ReaderController, '_initialize')
+def test_remove_feed_cleans_every_store(mock_init, mock_registry):
+  search_index, archive, watermarks = MagicMock(), MagicMock(), MagicMock()
+  search_index.remove_feed.side_effect = OSError("database is locked")
+  controller = ReaderController(
+    registry=mock_registry, search_index=search_index, archive=archive, watermarks=watermarks
+  )
+  
+  controller.remove_feed("test_feed")
+  
+  # A failing search index does not leave the archive or watermarks behind
+  archive.remove_feed.assert_called_once_with("test_feed")
+  watermarks.remove_feed.assert_called_once_with("test_feed")
@@ -0,0 +1,23 @@
+"""Tests for the ArticleFormatter."""
+import pytest
+
+from biofeed.core.formatter import ArticleFormatter
+from biofeed.feeds.article import Article
+
+@pytest.mark.parametrize("date_str,expected", [
+  ("2025-04-11T14:00:00+00:00", "2025-04-11"),
+  ("Tue, 14 May 2024 10:00:00 GMT", "2024-05-14"),
+  ("2025-04-11", "2025-04-11"),
+  ("sometime", "sometime"),
+  ("", ""),
+])
+def test_format_date(date_str, expected):
+  assert ArticleFormatter.format_date(date_str) == expected
+
+def test_format_date_prefers_timestamp():
+  article = Article(id="a", title="T", link="l", published="garbled", published_ts=1744380000)
+  assert "(2025-04-11)" in ArticleFormatter.format_article_list([article])
+
+def test_format_article_list_names_other_feeds():
+  article = Article(id="a", title="T", link="l", published="", also_in=["plos", "biorxiv"])
+  assert "(also in plos, biorxiv)" in ArticleFormatter.format_article_list([article])
@@ -0,0 +1,84 @@
+"""Tests for the persistent full-text cache."""
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from biofeed.core.fulltext import FullTextCache, FullTextEntry, get_full_text, prefetch_full_texts
+
+LINK = "https://www.nature.com/articles/s41586-025-00001-1"
+
+def page_response(status_code=200, content=b"<p>Full text</p>", headers=None):
+  response = MagicMock(status_code=status_code, content=content)
+  response.headers = headers or {}
+  return response
+
+@patch("biofeed.utils.http_client.get")
+def test_repeat_reads_use_cache(mock_get, tmp_path):
+  cache = FullTextCache(tmp_path / "fulltext.db")
+  mock_get.return_value = page_response(headers={"ETag": '"v1"'})
+  extract = MagicMock(return_value="Full text")
+
+  assert get_full_text(LINK, extract, cache) == "Full text"
+  assert get_full_text(LINK, extract, cache) == "Full text"
+  mock_get.assert_called_once()
+  extract.assert_called_once()
+
+  # Survives a new process
+  cache.close()
+  assert FullTextCache(tmp_path / "fulltext.db").get(LINK).etag == '"v1"'
+
+@patch("biofeed.utils.http_client.get")
+def test_refresh_revalidates_with_validators(mock_get, tmp_path):
+  cache = FullTextCache(tmp_path / "fulltext.db")
+  cache.store(FullTextEntry(LINK, "Cached text", etag='"v1"'))
+  mock_get.return_value = page_response(status_code=304)
+  extract = MagicMock()
+
+  assert get_full_text(LINK, extract, cache, refresh=True) == "Cached text"
+  mock_get.assert_called_once_with(LINK, headers={"If-None-Match": '"v1"'})
+  extract.assert_not_called()
+
+@patch("biofeed.utils.http_client.get")
+def test_offline_never_downloads(mock_get, tmp_path):
+  cache = FullTextCache(tmp_path / "fulltext.db")
+  assert get_full_text(LINK, MagicMock(), cache, offline=True) is None
+  cache.store(FullTextEntry(LINK, "Cached text"))
+  assert get_full_text(LINK, MagicMock(), cache, offline=True, refresh=True) == "Cached text"
+  mock_get.assert_not_called()
+
+def test_eviction_drops_least_recently_read(tmp_path):
+  cache = FullTextCache(tmp_path / "fulltext.db", max_entries=2, max_bytes=250)
+  cache.store(FullTextEntry("a", "x" * 100))
+  cache.store(FullTextEntry("b", "y" * 100))
+  cache.get("a")  # "b" is now the least recently read
+  cache.store(FullTextEntry("c", "z" * 100))
+
+  assert "a" in cache and "c" in cache and "b" not in cache
+  cache.store(FullTextEntry("d", "w" * 200))
+  assert cache.stats()["bytes"] <= 250
+  assert "d" in cache
+
+@patch("biofeed.utils.http_client.get")
+def test_prefetch_fetches_uncached_pages_in_parallel(mock_get, tmp_path):
+  import threading
+  # Both pages must be in flight at once for the barrier to open
+  barrier = threading.Barrier(2, timeout=5)
+  def get(link, headers):
+    barrier.wait()
+    return page_response(content=b'<div class="c-article-section__content">Text of ' + link.encode() + b'</div>')
+  mock_get.side_effect = get
+  cache = FullTextCache(tmp_path / "fulltext.db")
+  cache.store(FullTextEntry(LINK, "Cached text"))
+  links = [
+    (LINK, None),
+    ("https://www.nature.com/articles/a", None),
+    # Matched by its feed, as when the article is read
+    ("https://doi.org/10.1038/b", "https://www.nature.com/nbt.rss"),
+    ("https://example.org/no-extractor", None),
+    ("https://www.nature.com/articles/a", None),
+  ]
+
+  assert prefetch_full_texts(links, cache, max_workers=4, max_per_host=2) == 2
+  assert mock_get.call_count == 2
+  assert cache.get("https://doi.org/10.1038/b").text == "Text of https://doi.org/10.1038/b"
+  assert cache.get(LINK).text == "Cached text"
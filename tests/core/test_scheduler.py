@@ -0,0 +1,94 @@
+"""Tests for the background refresh scheduler."""
+import threading
+import time
+from unittest.mock import MagicMock
+
+from biofeed.core.controller import ReaderController, RefreshResult
+from biofeed.core.scheduler import RefreshScheduler
+from biofeed.feeds.feed_source import FeedSource
+from biofeed.feeds.registry import FeedRegistry
+
+def make_controller(feed_count, refresh):
+  controller = MagicMock(spec=ReaderController)
+  controller.registry = MagicMock(spec=FeedRegistry)
+  controller.registry.feeds = {}
+  for i in range(feed_count):
+    feed = MagicMock(spec=FeedSource, url=f"https://host{i}.org/feed", cache_duration=3600)
+    feed.expires_in.return_value = None  # Nothing cached yet
+    controller.registry.feeds[f"feed{i}"] = feed
+  controller.registry.get_feed.side_effect = controller.registry.feeds.__getitem__
+  controller.refresh.side_effect = refresh
+  return controller
+
+def run_until(scheduler, condition, timeout=5):
+  thread = threading.Thread(target=scheduler.run)
+  thread.start()
+  deadline = time.monotonic() + timeout
+  while not condition() and time.monotonic() < deadline:
+    time.sleep(0.01)
+  scheduler.stop()
+  thread.join(timeout)
+  assert not thread.is_alive()
+
+def test_scheduler_refreshes_each_feed_and_reschedules():
+  refreshed = []
+  def refresh(feed_ids, force_refresh, max_workers):
+    feed_id = feed_ids[0]
+    refreshed.append(feed_id)
+    controller.registry.feeds[feed_id].expires_in.return_value = 3600
+    return [RefreshResult(feed_id, 5)]
+  controller = make_controller(3, refresh)
+  scheduler = RefreshScheduler(controller, lead_time=60, jitter=0.1)
+
+  run_until(scheduler, lambda: len(scheduler.next_refreshes()) == 3 and len(refreshed) == 3)
+
+  assert sorted(refreshed) == ["feed0", "feed1", "feed2"]
+  controller.refresh.assert_called_with([refreshed[-1]], force_refresh=True, max_workers=1)
+  # Next refresh is due before expiry, by the lead time plus up to 10% jitter
+  for due in scheduler.next_refreshes().values():
+    assert time.time() + 3600 - 60 - 360 - 5 <= due <= time.time() + 3600 - 60
+
+def test_scheduler_caps_concurrency_and_retries_failures():
+  in_flight, peak, calls = [0], [0], []
+  lock = threading.Lock()
+  def refresh(feed_ids, force_refresh, max_workers):
+    with lock:
+      in_flight[0] += 1
+      peak[0] = max(peak[0], in_flight[0])
+      calls.append(feed_ids[0])
+    time.sleep(0.02)
+    with lock:
+      in_flight[0] -= 1
+    return [RefreshResult(feed_ids[0], 0, "Failed to fetch feed")]
+  controller = make_controller(4, refresh)
+  scheduler = RefreshScheduler(controller, max_concurrent=2, retry_delay=600)
+
+  run_until(scheduler, lambda: len(calls) == 4 and len(scheduler.next_refreshes()) == 4)
+
+  assert peak[0] == 2
+  assert sorted(calls) == ["feed0", "feed1", "feed2", "feed3"]
+  assert all(due >= time.time() + 590 for due in scheduler.next_refreshes().values())
+
+def test_long_lead_time_does_not_refresh_in_a_loop():
+  calls = []
+  def refresh(feed_ids, force_refresh, max_workers):
+    calls.append(feed_ids[0])
+    controller.registry.feeds[feed_ids[0]].expires_in.return_value = 3600
+    return [RefreshResult(feed_ids[0], 5)]
+  controller = make_controller(2, refresh)
+  scheduler = RefreshScheduler(controller, lead_time=100000, jitter=0)
+
+  # Give a refresh loop time to show up
+  run_until(scheduler, lambda: len(calls) > 2, timeout=0.5)
+
+  assert sorted(calls) == ["feed0", "feed1"]
+  # The lead time is capped at half the cache duration
+  for due in scheduler.next_refreshes().values():
+    assert time.time() + 1800 - 5 <= due <= time.time() + 1800
+
+def test_refreshed_feed_waits_for_the_min_interval():
+  feed = MagicMock(spec=FeedSource, cache_duration=60)
+  feed.expires_in.return_value = 10
+  scheduler = RefreshScheduler(make_controller(0, None), lead_time=120, jitter=0, min_interval=300)
+  assert scheduler._next_due(feed) <= time.time()
+  assert scheduler._next_due(feed, refreshed=True) >= time.time() + 295
@@ -0,0 +1,133 @@
+"""Tests for the full-text search index."""
+import pathlib
+import pytest
+from unittest.mock import MagicMock, patch
+
+import fastfeedparser
+
+from biofeed.core.controller import ReaderController
+from biofeed.core.search import SearchIndex, build_match_expression
+from biofeed.feeds.article import Article
+from biofeed.feeds.feed_parser import FeedParser, ParsedFeed
+from biofeed.feeds.feed_source import FeedSource
+from biofeed.feeds.registry import FeedRegistry
+
+# Get fixtures directory
+FIXTURES = pathlib.Path(__file__).resolve().parent.parent / "feeds" / "fixtures"
+
+@pytest.fixture
+def index(tmp_path):
+  index = SearchIndex(tmp_path / "search.db")
+  index.update_feed("papers", [
+    Article(id="0", title="Single cell atlas of the mouse brain", link="https://example.com/0",
+            published="", author="Smith, J.", summary="<p>An atlas built from RNA-seq.</p>",
+            categories=["Genomics"]),
+    Article(id="1", title="Protein structure prediction", link="https://example.com/1",
+            published="", author="Jones, K.", summary="Brain tissue samples were analysed.",
+            categories=["Structural biology"]),
+    Article(id="2", title="Sequencing errors", link="https://example.com/2",
+            published="", author="Smith, A.", summary="Nothing about neurons.",
+            categories=["Genomics"]),
+  ])
+  yield index
+  index.close()
+
+def test_build_match_expression():
+  assert build_match_expression('title:"single cell" smith') == 'title : "single cell" AND "smith"'
+  assert build_match_expression('tag:genomics') == 'category : "genomics"'
+  assert build_match_expression('unknown:x "OR"') == '"unknown:x" AND "OR"'
+  assert build_match_expression(' :: ') == ""
+
+def test_search_ranks_title_matches_first(index):
+  results = index.search("brain")
+  assert [a.id for a in results] == ["0", "1"]
+  assert results[0].feed_id == "papers"
+
+def test_fielded_queries(index):
+  assert sorted(a.id for a in index.search("author:smith")) == ["0", "2"]
+  assert [a.id for a in index.search("category:genomics atlas")] == ["0"]
+  assert index.search("title:brain author:jones") == []
+  # Markup is not indexed
+  assert index.search("p") == []
+
+def test_incremental_update_and_persistence(index, tmp_path):
+  assert index.update_feed("papers", [
+    Article(id="1", title="Protein structure prediction", link="https://example.com/1",
+            published="", author="Jones, K.", summary="Brain tissue samples were analysed.",
+            categories=["Structural biology"]),
+    Article(id="3", title="Brain organoids", link="https://example.com/3", published=""),
+  ]) == 1
+  assert len(index) == 2
+  index.close()
+
+  # Unchanged articles keep their indexed text; "0" left the feed
+  reopened = SearchIndex(tmp_path / "search.db")
+  assert [a.id for a in reopened.search("brain")] == ["3", "1"]
+  reopened.remove_feed("papers")
+  assert len(reopened) == 0
+  reopened.close()
+
+def test_changed_articles_are_reindexed(index):
+  # A corrected title and summary replace the indexed text
+  assert index.update_feed("papers", [
+    Article(id="1", title="Protein structure prediction in the brain", link="https://example.com/1",
+            published="", author="Jones, K.", summary="Corrected abstract."),
+  ], drop_stale=False) == 0
+  assert len(index) == 3
+  assert index.search("analysed") == []
+  results = {a.id: a for a in index.search("title:brain")}
+  assert sorted(results) == ["0", "1"]
+  assert results["1"].summary == "Corrected abstract."
+
+@patch.object(ReaderController, '_initialize')
+def test_controller_search_covers_refreshed_feeds(mock_init, tmp_path):
+  registry = MagicMock(spec=FeedRegistry)
+  registry.feeds = {}
+  for name in ("plos_20250413", "oxford_20250413"):
+    with open(FIXTURES / f"{name}.xml", "rb") as f:
+      articles = FeedParser.parse_feed(fastfeedparser.parse(f.read()))
+    feed = MagicMock(spec=FeedSource, url=f"https://{name}.org/feed")
+    feed.get_feed.return_value = ParsedFeed(articles)
+    registry.feeds[name.split("_")[0]] = feed
+
+  controller = ReaderController(registry=registry, search_index=SearchIndex(tmp_path / "search.db"))
+  controller.refresh_all()
+
+  results = controller.search_articles("title:epilepsy")
+  assert [a.title for a in results] == ["Virtual epilepsy patient cohort: Generation and evaluation"]
+  assert results[0].feed_id == "plos"
+  assert {a.feed_id for a in controller.search_articles("bioinformatics", count=50)} <= {"plos", "oxford"}
+
+@patch.object(ReaderController, '_initialize')
+def test_controller_search_does_not_fetch_feeds(mock_init, tmp_path):
+  registry = MagicMock(spec=FeedRegistry)
+  feed = MagicMock(spec=FeedSource, url="https://example.com/feed")
+  registry.feeds = {"example": feed}
+  controller = ReaderController(registry=registry, search_index=SearchIndex(tmp_path / "search.db"))
+  controller.active_feed = feed
+  feed.get_feed.return_value = ParsedFeed([
+    Article(id="1", title="Brain organoids", link="https://example.com/1", published="")
+  ])
+  feed.iter_storing.side_effect = lambda parsed: parsed.iter_articles()
+  controller.get_recent_articles()
+  feed.reset_mock()
+
+  assert [a.id for a in controller.search_articles("organoids")] == ["1"]
+  feed.get_articles.assert_not_called()
+  feed.get_feed.assert_not_called()
+
+@patch.object(ReaderController, '_initialize')
+def test_search_indexes_the_cached_active_feed_on_first_use(mock_init, tmp_path):
+  from types import SimpleNamespace
+  feed = FeedSource("Example", "https://example.com/feed.xml")
+  entries = [SimpleNamespace(id="urn:1", title="Brain organoids", link="https://example.com/1")]
+  feed._cache.set(feed.url, ParsedFeed.from_raw(SimpleNamespace(entries=entries), "v1"))
+  registry = MagicMock(spec=FeedRegistry)
+  registry.feeds = {"example": feed}
+  controller = ReaderController(registry=registry, search_index=SearchIndex(tmp_path / "search.db"))
+  controller.active_feed = feed
+
+  # A fresh install: nothing indexed, but the feed was downloaded before
+  with patch("biofeed.utils.http_client.get") as mock_get:
+    assert [a.title for a in controller.search_articles("organoids")] == ["Brain organoids"]
+    mock_get.assert_not_called()
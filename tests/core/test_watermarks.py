@@ -0,0 +1,114 @@
+"""Tests for per-feed watermarks and incremental ingest."""
+from types import SimpleNamespace
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from biofeed.core.archive import ArticleArchive
+from biofeed.core.controller import ReaderController
+from biofeed.core.search import SearchIndex
+from biofeed.core.watermarks import BloomFilter, Watermark, WatermarkStore
+from biofeed.feeds.article import Article
+from biofeed.feeds.feed_parser import FeedParser, ParsedFeed
+from biofeed.feeds.feed_source import FeedSource
+from biofeed.feeds.registry import FeedRegistry
+
+def make_entry(i):
+  return SimpleNamespace(id=f"10.1000/paper.{i}", title=f"Paper {i} about brain atlases",
+                         link=f"https://example.com/{i}", published="2025-04-0%d" % (i % 9 + 1))
+
+def make_feed(numbers, version):
+  return ParsedFeed.from_raw(SimpleNamespace(entries=[make_entry(i) for i in numbers]), version)
+
+@pytest.fixture
+def store(tmp_path):
+  store = WatermarkStore(tmp_path / "watermarks.db")
+  yield store
+  store.close()
+
+def test_bloom_filter_has_no_false_negatives():
+  seen = BloomFilter(capacity=1000, error_rate=0.001)
+  for i in range(1000):
+    seen.add(f"id{i}")
+  assert all(f"id{i}" in seen for i in range(1000))
+  false_positives = sum(f"other{i}" in seen for i in range(10000))
+  assert false_positives < 50 and len(seen) == 1000
+
+def test_store_round_trip(store, tmp_path):
+  watermark = store.get("nature")
+  assert watermark.version is None and "a" not in watermark.seen
+  watermark.advance([Article(id="a", title="T", link="l", published="", published_ts=100),
+                     Article(id="b", title="T", link="l", published="", published_ts=50)], "v1")
+  store.save(watermark)
+  store.mark_read(["nature", "plos"], 123.0)
+  store.close()
+
+  restored = WatermarkStore(tmp_path / "watermarks.db").get("nature")
+  assert ("a" in restored.seen, "b" in restored.seen, "c" in restored.seen) == (True, True, False)
+  assert (restored.version, restored.latest_id, restored.latest_ts, restored.read_at) == ("v1", "a", 100, 123.0)
+  assert store.read_marks(["plos", "oxford"]) == {"plos": 123.0, "oxford": None}
+
+def test_full_seen_set_is_rebuilt_from_the_feed():
+  watermark = Watermark("nature", BloomFilter(capacity=3))
+  articles = [Article(id=str(i), title="T", link="l", published="") for i in range(4)]
+  watermark.advance(articles[:3])
+  watermark.advance(articles[3:], current_ids=lambda: ["2", "3"])
+  assert len(watermark.seen) == 2 and "2" in watermark.seen and "3" in watermark.seen and "0" not in watermark.seen
+
+def test_only_new_entries_are_normalized():
+  parsed = make_feed(range(5), "v1")
+  seen = {FeedParser.entry_id(make_entry(i)) for i in (0, 1, 3, 4)}
+  with patch.object(FeedParser, "normalize_entry", wraps=FeedParser.normalize_entry) as normalize:
+    new = parsed.new_articles(seen)
+  assert [a.title for a in new] == ["Paper 2 about brain atlases"] and normalize.call_count == 1
+  assert parsed.entry_ids() == [FeedParser.entry_id(make_entry(i)) for i in range(5)]
+  # The article normalized ahead is the one the feed later yields
+  assert parsed.articles[2] is new[0] and [a.id for a in parsed.articles] == parsed.entry_ids()
+
+@patch.object(ReaderController, "_initialize")
+def test_refresh_ingests_only_arrivals(mock_init, tmp_path):
+  registry = MagicMock(spec=FeedRegistry)
+  feed = MagicMock(spec=FeedSource, url="https://example.com/feed")
+  feed.name = "Example"
+  registry.feeds = {"example": feed}
+  search_index = SearchIndex(tmp_path / "search.db")
+  controller = ReaderController(
+    registry=registry, search_index=search_index,
+    archive=ArticleArchive(tmp_path / "archive.db"), watermarks=WatermarkStore(tmp_path / "watermarks.db")
+  )
+
+  feed.get_feed.return_value = make_feed(range(1, 6), "v1")
+  assert controller.refresh_all()[0].new_count == 5
+  assert len(controller.get_new_articles(count=10)) == 5
+  assert controller.get_new_articles() == []
+
+  # The same body again costs nothing; a new body only its new entry
+  assert controller.refresh_all()[0].new_count == 0
+  feed.get_feed.return_value = make_feed(range(0, 5), "v2")
+  with patch.object(FeedParser, "normalize_entry", wraps=FeedParser.normalize_entry) as normalize, \
+       patch.object(search_index, "update_feed", wraps=search_index.update_feed) as update:
+    result = controller.refresh_all()[0]
+  assert (result.article_count, result.new_count, normalize.call_count) == (5, 1, 1)
+  assert [a.id for a in update.call_args[0][1]] == [FeedParser.entry_id(make_entry(0))]
+
+  assert [a.title for a in controller.get_new_articles(mark_read=False)] == ["Paper 0 about brain atlases"]
+  assert [a.title for a in controller.get_new_articles()] == ["Paper 0 about brain atlases"]
+  assert controller.get_new_articles() == []
+
+@patch.object(ReaderController, "_initialize")
+def test_browsing_the_timeline_leaves_watermarks_alone(mock_init, tmp_path):
+  registry = MagicMock(spec=FeedRegistry)
+  feed = MagicMock(spec=FeedSource, url="https://example.com/feed")
+  registry.feeds = {"example": feed}
+  watermarks = WatermarkStore(tmp_path / "watermarks.db")
+  controller = ReaderController(
+    registry=registry, search_index=SearchIndex(tmp_path / "search.db"),
+    archive=ArticleArchive(tmp_path / "archive.db"), watermarks=watermarks
+  )
+  parsed = make_feed(range(3), "v1")
+  feed.get_articles.return_value = parsed.articles
+  feed.get_feed.return_value = parsed
+
+  assert len(controller.get_timeline(count=10)) == 3
+  assert len(watermarks.get("example").seen) == 0
+  assert len(controller.get_new_articles(count=10)) == 3
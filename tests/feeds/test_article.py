@@ -0,0 +1,75 @@
+import pickle
+
+import pytest
+
+from biofeed.core.formatter import ArticleFormatter
+from biofeed.feeds.article import Article, ArticleBatch
+
+def make_articles(count=3):
+  return [
+    Article(
+      id=f"id{i}",
+      title=f"Title {i}",
+      link=f"https://example.org/{i}",
+      published="2025-04-11T14:00:00+00:00",
+      author="Smith J" if i % 2 else None,
+      summary=f"Summary {i}",
+      categories=["Genomics", "Bioinformatics"][: i % 3],
+      feed_id="plos"
+    )
+    for i in range(count)
+  ]
+
+def test_article_has_no_instance_dict():
+  article = make_articles(1)[0]
+  assert not hasattr(article, "__dict__")
+  with pytest.raises(AttributeError):
+    article.unknown = 1
+
+def test_article_pickle_round_trip():
+  article = make_articles(2)[1]
+  assert pickle.loads(pickle.dumps(article)) == article
+
+def test_article_interns_author_and_categories():
+  first, second = Article("a", "t", "l", "p", author="".join(["Smith", " J"]),
+                          categories=["".join(["Gen", "omics"])]), \
+                  Article("b", "t", "l", "p", author="".join(["Smith", " J"]),
+                          categories=["".join(["Gen", "omics"])])
+  assert first.author is second.author
+  assert first.categories[0] is second.categories[0]
+
+def test_batch_round_trips_articles():
+  articles = make_articles(5)
+  batch = ArticleBatch(articles)
+  assert len(batch) == 5
+  assert list(batch) == articles
+  assert batch[-1] == articles[-1]
+  assert batch[1:3] == articles[1:3]
+  with pytest.raises(IndexError):
+    batch[5]
+
+def test_batch_lookup_and_columns():
+  articles = make_articles(4)
+  batch = ArticleBatch(articles[:2])
+  assert batch.get("id1") == articles[1]
+  batch.extend(articles[2:])
+  assert batch.get("id3") == articles[3]
+  assert batch.get("missing") is None
+  assert batch.column("title") == [a.title for a in articles]
+  assert batch.column("author") == [a.author for a in articles]
+  with pytest.raises(ValueError):
+    batch.column("nope")
+
+def test_batch_formats_like_a_list():
+  articles = make_articles(3)
+  assert ArticleFormatter.format_article_list(ArticleBatch(articles), show_feed=True) == \
+    ArticleFormatter.format_article_list(articles, show_feed=True)
+
+def test_batch_interleaved_appends_and_reads_copy_text_once():
+  articles = make_articles(50)
+  batch = ArticleBatch()
+  for i, article in enumerate(articles):
+    batch.append(article)
+    assert batch[i] == article and batch[0] == articles[0]
+  titles = batch._text['title']
+  assert sum(len(chunk) for chunk in titles._chunks) == sum(len(a.title) for a in articles)
@@ -0,0 +1,62 @@
+"""Tests for the asyncio-native feed source."""
+import asyncio
+import pathlib
+import pytest
+
+aiohttp = pytest.importorskip("aiohttp")
+from aiohttp import web
+from aiohttp.test_utils import TestServer
+
+from biofeed.feeds.async_source import AsyncFeedSource
+from biofeed.feeds.feed_source import FeedSource
+from biofeed.feeds.article import Article
+
+# Get fixtures directory
+CWD = pathlib.Path(__file__).resolve().parent
+FIXTURES = f"{CWD}/fixtures"
+
+def _make_app(requests_seen):
+  """Serve the PLOS fixture with an ETag and honour If-None-Match."""
+  with open(f"{FIXTURES}/plos_20250413.xml", "rb") as f:
+    body = f.read()
+
+  async def handler(request):
+    requests_seen.append(request)
+    if request.headers.get("If-None-Match") == '"v1"':
+      return web.Response(status=304)
+    return web.Response(body=body, content_type="application/rss+xml", headers={"ETag": '"v1"'})
+
+  app = web.Application()
+  app.router.add_get("/feed.xml", handler)
+  return app
+
+def test_async_get_articles_and_revalidate():
+  """Test fetching, parsing and conditional revalidation without blocking calls."""
+  requests_seen = []
+
+  async def scenario():
+    async with TestServer(_make_app(requests_seen)) as server:
+      feed = FeedSource("PLOS", str(server.make_url("/feed.xml")), cache_duration=0)
+      source = AsyncFeedSource(feed)
+
+      articles = await source.get_articles()
+      assert len(articles) == 4
+      assert all(isinstance(article, Article) for article in articles)
+
+      # An expired entry is revalidated with a 304 instead of re-downloaded
+      again = await source.get_articles(force_refresh=True)
+      assert [a.title for a in again] == [a.title for a in articles]
+
+  asyncio.run(scenario())
+  assert len(requests_seen) == 2
+  assert requests_seen[1].headers["If-None-Match"] == '"v1"'
+
+def test_async_fetch_error_raises_value_error():
+  """Test that HTTP errors surface as ValueError like the sync API."""
+  async def scenario():
+    async with TestServer(web.Application()) as server:
+      source = AsyncFeedSource(FeedSource("Missing", str(server.make_url("/missing.xml"))))
+      with pytest.raises(ValueError):
+        await source.fetch()
+
+  asyncio.run(scenario())
@@ -0,0 +1,134 @@
+"""Tests for the FeedCache class and its persistent backend."""
+from datetime import datetime, timedelta
+from unittest.mock import MagicMock
+
+from biofeed.feeds.cache import FeedCache, SQLiteCacheBackend
+
+def test_memory_cache_get_set():
+  """Test storing and retrieving data without a backend."""
+  cache = FeedCache()
+  cache.set("https://example.com/feed.xml", {"items": []})
+
+  assert cache.get("https://example.com/feed.xml") == {"items": []}
+  assert cache.get("https://example.com/other.xml") is None
+  assert not cache.is_expired("https://example.com/feed.xml")
+
+def test_cache_expiry():
+  """Test that entries older than max_age are not returned."""
+  cache = FeedCache()
+  cache.set("key", "value")
+  cache._timestamps["key"] = datetime.now() - timedelta(seconds=120)
+
+  assert cache.get("key", max_age=60) is None
+  assert cache.get("key", max_age=300) == "value"
+  assert cache.is_expired("key", max_age=60)
+
+def test_persistent_cache_survives_new_instance(tmp_path):
+  """Test that a new cache (i.e. a new process) sees earlier entries."""
+  db_path = tmp_path / "cache.db"
+  first = FeedCache(SQLiteCacheBackend(db_path))
+  first.set("https://example.com/feed.xml", {"items": [{"title": "A"}]})
+  stored_at = first.get_timestamp("https://example.com/feed.xml")
+  first.close()
+
+  second = FeedCache(SQLiteCacheBackend(db_path))
+  assert second.get("https://example.com/feed.xml") == {"items": [{"title": "A"}]}
+  assert second.get_timestamp("https://example.com/feed.xml") == stored_at
+  assert second.get_age("https://example.com/feed.xml") < 60
+  second.close()
+
+def test_persistent_cache_clear(tmp_path):
+  """Test that clearing also removes persisted entries."""
+  db_path = tmp_path / "cache.db"
+  cache = FeedCache(SQLiteCacheBackend(db_path))
+  cache.set("key", "value")
+  cache.clear()
+  cache.close()
+
+  assert FeedCache(SQLiteCacheBackend(db_path)).get("key") is None
+
+def test_unpicklable_data_stays_in_memory(tmp_path):
+  """Test that data which cannot be persisted is still cached in memory."""
+  cache = FeedCache(SQLiteCacheBackend(tmp_path / "cache.db"))
+  data = MagicMock()
+  cache.set("key", data)
+
+  assert cache.get("key") is data
+
+def test_metadata_and_revalidate(tmp_path):
+  """Test that validators persist and revalidation refreshes the timestamp."""
+  db_path = tmp_path / "cache.db"
+  cache = FeedCache(SQLiteCacheBackend(db_path))
+  cache.set("key", "value", {"etag": '"abc"'})
+  cache._timestamps["key"] = datetime.now() - timedelta(hours=2)
+  assert cache.get("key") is None
+
+  assert cache.revalidate("key") == "value"
+  assert cache.get("key") == "value"
+  cache.close()
+
+  reopened = FeedCache(SQLiteCacheBackend(db_path))
+  assert reopened.get_metadata("key") == {"etag": '"abc"'}
+  assert reopened.get("key") == "value"
+  assert reopened.revalidate("missing") is None
+
+def test_lru_eviction_and_stats():
+  """Test that the least recently used entries are evicted first."""
+  cache = FeedCache(max_entries=2, max_bytes=0)
+  cache.set("a", "A")
+  cache.set("b", "B")
+  assert cache.get("a") == "A"  # "b" is now the least recently used
+  cache.set("c", "C")
+
+  assert cache.get("b") is None
+  assert cache.get("a") == "A" and cache.get("c") == "C"
+  stats = cache.stats()
+  assert stats["entries"] == 2
+  assert stats["evictions"] == 1
+  assert stats["hits"] == 3 and stats["misses"] == 1
+  assert stats["bytes"] > 0
+
+def test_byte_budget_reloads_from_backend(tmp_path):
+  """Test that entries over the byte budget leave memory but not the backend."""
+  cache = FeedCache(SQLiteCacheBackend(tmp_path / "cache.db"), max_bytes=1500)
+  cache.set("a", "x" * 1000)
+  cache.set("b", "y" * 1000)
+
+  assert cache.stats()["entries"] == 1
+  assert cache.stats()["bytes"] <= 1500
+  assert cache.get("a") == "x" * 1000  # Loaded again, evicting "b"
+  assert cache.stats()["evictions"] == 2
+
+def test_ttl_sweep(tmp_path):
+  """Test that sweeps drop entries older than the TTL everywhere."""
+  db_path = tmp_path / "cache.db"
+  cache = FeedCache(SQLiteCacheBackend(db_path), ttl=3600)
+  cache.set("old", "value")
+  cache.set("new", "value")
+  cache._timestamps["old"] = datetime.now() - timedelta(hours=2)
+  cache._backend.touch("old", cache._timestamps["old"], {})
+
+  assert cache.sweep() == 1
+  assert cache.stats()["expirations"] == 1
+  assert cache.get("old", max_age=10 ** 6) is None
+  assert cache.get("new") == "value"
+
+def test_replace_keeps_age_and_skips_newer_entries(tmp_path):
+  """Test that updated contents are stored without touching newer entries."""
+  db_path = tmp_path / "cache.db"
+  cache = FeedCache(SQLiteCacheBackend(db_path))
+  data = {"items": []}
+  cache.set("key", data, {"etag": '"v1"'})
+  stored_at = cache.get_timestamp("key")
+  data["items"].append("normalized")
+  assert cache.replace("key", data)
+  assert not cache.replace("key", {"items": []})  # Not the object cached
+
+  other = FeedCache(SQLiteCacheBackend(db_path))
+  assert other.get("key") == {"items": ["normalized"]}
+  assert other.get_timestamp("key") == stored_at and other.get_metadata("key") == {"etag": '"v1"'}
+  # Another process stored a newer version in the meantime
+  other.set("key", {"items": ["newer"]})
+  data["items"].append("stale")
+  assert not cache.replace("key", data)
+  assert FeedCache(SQLiteCacheBackend(db_path)).get("key") == {"items": ["newer"]}
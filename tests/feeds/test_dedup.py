@@ -0,0 +1,127 @@
+"""Tests for cross-feed deduplication."""
+import pathlib
+import random
+from unittest.mock import MagicMock, patch
+
+import fastfeedparser
+import pytest
+
+from biofeed.core.archive import ArticleArchive
+from biofeed.core.controller import ReaderController
+from biofeed.core.search import SearchIndex
+from biofeed.feeds import dedup
+from biofeed.feeds.article import Article
+from biofeed.feeds.dedup import (
+  Deduplicator, canonical_url, deduplicate, find_doi, minhash, normalize_doi, shingles
+)
+from biofeed.feeds.feed_parser import FeedParser
+from biofeed.feeds.feed_source import FeedSource
+from biofeed.feeds.registry import FeedRegistry
+
+FIXTURES = pathlib.Path(__file__).resolve().parent / "fixtures"
+
+TITLE = "GraphBAN: An inductive graph-based approach for enhanced prediction of compound-protein interactions"
+
+def make_article(id, title=TITLE, link=None, feed_id=None, doi=None):
+  return Article(id=id, title=title, link=link or f"https://example.com/{id}", published="",
+                 feed_id=feed_id, doi=doi)
+
+@pytest.mark.parametrize("value,expected", [
+  ("10.1093/bioinformatics/btaf119", "10.1093/bioinformatics/btaf119"),
+  ("http://doi.org/10.1093/Bioinformatics/BTAF119", "10.1093/bioinformatics/btaf119"),
+  ("doi:10.1101/2025.04.07.647590", "10.1101/2025.04.07.647590"),
+  ("https://www.biorxiv.org/content/10.1101/2025.04.07.647590v2?rss=1", "10.1101/2025.04.07.647590"),
+  ("https://journals.plos.org/ploscompbiol/article?id=10.1371%2Fjournal.pcbi.1012994", "10.1371/journal.pcbi.1012994"),
+  ("https://example.com/no-doi", None),
+  (None, None),
+])
+def test_normalize_doi(value, expected):
+  assert normalize_doi(value) == expected
+
+def test_find_doi_prefers_guid_and_knows_publisher_links():
+  assert find_doi("http://doi.org/10.1093/bioinformatics/btaf119",
+                  "https://academic.oup.com/doi/10.1093/bioinformatics/btaf119/8090439") == "10.1093/bioinformatics/btaf119"
+  assert find_doi("https://www.nature.com/articles/s41467-025-57536-9") == "10.1038/s41467-025-57536-9"
+
+def test_feed_entries_get_dois():
+  for name, doi in [("oxford_20250413", "10.1093/bioinformatics/btaf119"),
+                    ("plos_20250413", "10.1371/journal.pcbi.1012994"),
+                    ("biorxiv_20250413", "10.1101/2025.04.07.647590")]:
+    with open(FIXTURES / f"{name}.xml", "rb") as f:
+      assert FeedParser.parse_feed(fastfeedparser.parse(f.read()))[0].doi == doi
+
+def test_canonical_url():
+  assert canonical_url("https://www.Nature.com/articles/x/?utm_source=rss&b=2&a=1#main") == \
+    canonical_url("http://nature.com/articles/x?a=1&b=2") == "nature.com/articles/x?a=1&b=2"
+  assert canonical_url("https://example.com/a?rss=1") != canonical_url("https://example.com/b?rss=1")
+
+def test_merges_copies_and_lists_their_feeds():
+  papers = deduplicate([
+    make_article("1", doi="10.1000/x", feed_id="journal"),
+    make_article("2", title="Something else entirely, at some length", doi="10.1000/X", feed_id="subject"),
+    make_article("3", title="Another paper with a long title", link="https://example.com/p?utm_medium=feed",
+                 feed_id="journal"),
+    make_article("4", title="Another paper, with a long title", link="https://www.example.com/p",
+                 feed_id="aggregator"),
+    # Preprint of the first paper, with a slightly different title
+    make_article("5", title="GraphBAN: an inductive graph-based approach for the enhanced prediction of "
+                            "compound-protein interactions.", feed_id="preprints"),
+    make_article("6", title="Correction", feed_id="journal"),
+    make_article("7", title="Correction", feed_id="subject"),
+  ])
+  assert [(paper.id, paper.feed_id, paper.also_in) for paper in papers] == [
+    ("1", "journal", ["subject", "preprints"]),
+    ("3", "journal", ["aggregator"]),
+    ("6", "journal", []),
+    ("7", "subject", []),
+  ]
+
+def test_does_not_change_the_articles_given():
+  original = make_article("1", doi="10.1000/x", feed_id="journal")
+  deduplicate([original, make_article("2", doi="10.1000/x", feed_id="subject")])
+  assert original.also_in == []
+
+def test_near_duplicates_are_found_without_pairwise_comparison():
+  rng = random.Random(7)
+  words = [f"{rng.choice('bcdfgklmnprst')}{rng.choice('aeiou')}{rng.choice('nrstl')}{i}" for i in range(3000)]
+  titles = [" ".join(rng.sample(words, 8)) for _ in range(2000)]
+  deduplicator = Deduplicator()
+  for i, title in enumerate(titles):
+    assert deduplicator.add(make_article(str(i), title=title))[1]
+
+  # Each lookup only compares the titles sharing an LSH band
+  with patch("biofeed.feeds.dedup.jaccard", wraps=dedup.jaccard) as spy:
+    paper, new = deduplicator.add(make_article("x", title=titles[42] + "."))
+  assert not new and paper.id == "42"
+  assert spy.call_count < 10
+
+def test_minhash_is_stable_and_estimates_similarity():
+  first, second = shingles("single cell atlas of the mouse brain"), shingles("single cell atlas of the rat brain")
+  assert minhash(first) == minhash(set(first))
+  agreement = sum(a == b for a, b in zip(minhash(first), minhash(second))) / len(minhash(first))
+  assert 0.4 < agreement < 0.95
+
+@patch.object(ReaderController, "_initialize")
+def test_timeline_and_search_show_each_paper_once(mock_init, tmp_path):
+  registry = MagicMock(spec=FeedRegistry)
+  registry.feeds = {}
+  for feed_id, link in [("journal", "https://www.nature.com/articles/s41467-025-57536-9"),
+                        ("subject", "https://www.nature.com/articles/s41467-025-57536-9?rss=1")]:
+    feed = MagicMock(spec=FeedSource, url=f"https://{feed_id}.org/feed")
+    feed.get_articles.return_value = [
+      Article(id=f"{feed_id}-1", title=TITLE, link=link, published="2025-03-18", published_ts=1742256000),
+      Article(id=f"{feed_id}-2", title=f"Only in {feed_id}, with a longer title", link=f"https://{feed_id}.org/2",
+              published="2025-03-17", published_ts=1742169600),
+    ]
+    registry.feeds[feed_id] = feed
+  controller = ReaderController(
+    registry=registry, search_index=SearchIndex(tmp_path / "search.db"),
+    archive=ArticleArchive(tmp_path / "archive.db")
+  )
+
+  timeline = controller.get_timeline(count=10)
+  assert [(a.feed_id, a.also_in) for a in timeline] == [("journal", ["subject"]), ("journal", []), ("subject", [])]
+  results = controller.search_articles("graphban", count=1)
+  assert len(results) == 1 and results[0].also_in == ["subject"]
+  archived = controller.get_archived_articles()
+  assert len(archived) == 3 and {archived[0].feed_id, *archived[0].also_in} == {"journal", "subject"}
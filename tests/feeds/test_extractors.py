@@ -0,0 +1,62 @@
+"""Tests for the publisher extractor registry."""
+import pathlib
+import pickle
+from types import SimpleNamespace
+
+import pytest
+
+from biofeed.feeds import extractors
+from biofeed.feeds.extractors import Extractor, class_text, find_extractor, html_text
+from biofeed.feeds.feed_parser import FeedParser, ParsedFeed
+
+PAGES = pathlib.Path(__file__).resolve().parent / "fixtures" / "pages"
+
+def read_page(name):
+  return (PAGES / name).read_bytes()
+
+def test_find_extractor_by_host_or_feed():
+  assert find_extractor("https://journals.plos.org/ploscompbiol/article?id=1").name == "PLOS"
+  assert find_extractor("https://www.nature.com/articles/x").name == "Nature"
+  assert find_extractor("https://example.org/a") is None
+  # Links that don't name the publisher fall back to the feed URL
+  assert find_extractor("https://doi.org/10.1093/x", "https://academic.oup.com/rss/site").name == "Oxford Academic"
+
+def test_register_extractor(monkeypatch):
+  monkeypatch.setattr(extractors, "EXTRACTORS", dict(extractors.EXTRACTORS))
+  extractors.register_extractor(Extractor("Example", ("Example.org",), clean_content=str.upper))
+  assert extractors.clean_content("text", "https://www.example.org/a") == "TEXT"
+  assert extractors.clean_content("text", "https://example.com/a") == "text"
+
+@pytest.mark.parametrize("parser", extractors.PARSERS)
+def test_parsers_extract_the_same_text(parser):
+  oxford = read_page("oxford_abstract.html").decode()
+  text = html_text(oxford, parser)
+  assert text.startswith("Abstract Motivation Accurately predicting RNA")
+  assert text == html_text(oxford, "bs4")
+
+  nature = read_page("nature_article.html")
+  text = class_text(nature, "c-article-section__content", parser=parser)
+  assert text.startswith("Sample abstract stored for the extractor tests.")
+  assert "window.track" not in text and "Introduction" not in text
+  assert text == class_text(nature, "c-article-section__content", parser="bs4")
+  assert class_text(nature, "no-such-class", parser=parser) is None
+
+def test_publisher_cleaning():
+  plos = extractors.clean_plos_content(read_page("plos_abstract.html").decode())
+  assert plos.startswith("Human affective experience") and "Jin Ke" not in plos
+  oxford = extractors.clean_oxford_content(read_page("oxford_abstract.html").decode())
+  assert oxford.startswith("Accurately predicting RNA") and "<div" not in oxford
+
+def test_content_is_cleaned_once_when_normalized():
+  entry = SimpleNamespace(
+    id="10.1093/x", title="T", link="https://academic.oup.com/bioinformatics/x",
+    published="2025-03-22", content=read_page("oxford_abstract.html").decode()
+  )
+  parsed = ParsedFeed.from_raw(SimpleNamespace(entries=[entry]), source="https://academic.oup.com/rss")
+  assert parsed.articles[0].content.startswith("Accurately predicting RNA")
+
+  # The cleaned text is what the cache keeps
+  restored = pickle.loads(pickle.dumps(parsed))
+  assert restored.articles[0].content == parsed.articles[0].content
+  assert restored.source == "https://academic.oup.com/rss"
+  assert FeedParser.normalize_entry(entry).content == parsed.articles[0].content
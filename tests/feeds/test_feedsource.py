@@ -1,10 +1,13 @@
 """Tests for the FeedSource and FeedParser classes."""
 import pathlib
 import pytest
-from unittest.mock import patch, MagicMock
+from itertools import islice
+from types import SimpleNamespace
+from unittest.mock import call, patch, MagicMock
 
-from biofeed.feeds.feed_source import FeedSource
-from biofeed.feeds.feed_parser import FeedParser
+from biofeed.feeds.cache import FeedCache, SQLiteCacheBackend
+from biofeed.feeds.feed_source import FeedSource, sniff_format
+from biofeed.feeds.feed_parser import FeedParser, ParsedFeed
 from biofeed.feeds.article import Article
 
 # Get fixtures directory
@@ -118,26 +121,82 @@ def test_feed_source_init():
     assert feed.category == "test"
     assert feed._last_fetched is None
 
+def _mock_response(status_code=200, content=b"<rss></rss>", headers=None):
+    """Build a mock HTTP response."""
+    response = MagicMock(status_code=status_code, content=content)
+    response.headers = headers or {}
+    return response
+
+@patch("biofeed.utils.http_client.get")
 @patch("biofeed.feeds.feed_source.fastfeedparser")
-@patch("biofeed.feeds.feed_source.FeedParser")
-def test_feed_source_get_articles(mock_parser, mock_fastfeedparser):
+@patch.object(FeedParser, "normalize_entry")
+def test_feed_source_get_articles(mock_normalize, mock_fastfeedparser, mock_get):
     """Test getting articles from a feed."""
     # Set up mocks
-    mock_feed_data = MagicMock()
-    mock_fastfeedparser.parse.return_value = mock_feed_data
+    mock_get.return_value = _mock_response()
+    mock_fastfeedparser.parse.return_value = SimpleNamespace(entries=["e0", "e1", "e2"])
     
-    mock_articles = [MagicMock(spec=Article) for _ in range(3)]
-    mock_parser.parse_feed.return_value = mock_articles
+    mock_articles = [MagicMock(spec=Article, id=str(i)) for i in range(3)]
+    mock_normalize.side_effect = mock_articles
     
     # Create feed and get articles
     feed = FeedSource("Test Feed", "https://example.com/feed.xml")
     articles = feed.get_articles()
 
     # Verify results
-    mock_fastfeedparser.parse.assert_called_once_with("https://example.com/feed.xml")
-    mock_parser.parse_feed.assert_called_once_with(mock_feed_data)
+    mock_get.assert_called_once_with("https://example.com/feed.xml", headers={})
+    mock_fastfeedparser.parse.assert_called_once_with(b"<rss></rss>")
+    url = "https://example.com/feed.xml"
+    mock_normalize.assert_has_calls([call("e0", "rss", url), call("e1", "rss", url), call("e2", "rss", url)])
     assert articles == mock_articles
 
+@patch("biofeed.utils.http_client.get")
+def test_feed_source_iter_articles_is_lazy(mock_get):
+    """Test that iterating stops normalizing entries when the caller stops."""
+    with open(f"{FIXTURES}/nature_20250319.xml", "rb") as f:
+        mock_get.return_value = _mock_response(content=f.read())
+    
+    feed = FeedSource("Test Feed", "https://example.com/feed.xml")
+    with patch.object(FeedParser, "normalize_entry", wraps=FeedParser.normalize_entry) as spy:
+        first = list(islice(feed.iter_articles(), 3))
+        assert spy.call_count == 3
+        
+        # Positional reads only normalize up to the requested entry
+        assert feed.get_article("4").title
+        assert spy.call_count == 5
+        
+        assert len(feed.get_articles()) == 30
+        assert spy.call_count == 30
+    assert feed.get_articles()[:3] == first
+
+@patch("biofeed.utils.http_client.get")
+def test_feed_source_conditional_get(mock_get):
+    """Test that an expired feed is revalidated with its stored validators."""
+    with open(f"{FIXTURES}/plos_20250413.xml", "rb") as f:
+        body = f.read()
+    mock_get.return_value = _mock_response(
+        content=body,
+        headers={"ETag": '"abc"', "Last-Modified": "Sun, 13 Apr 2025 10:00:00 GMT"}
+    )
+    
+    feed = FeedSource("Test Feed", "https://example.com/feed.xml", cache_duration=0)
+    data = feed.fetch()
+    
+    # The second fetch gets a 304 and reuses the cached data without parsing
+    mock_get.reset_mock()
+    mock_get.return_value = _mock_response(status_code=304, content=b"")
+    with patch("biofeed.feeds.feed_source.fastfeedparser") as mock_fastfeedparser:
+        assert feed.fetch(force_refresh=True) is data
+        mock_fastfeedparser.parse.assert_not_called()
+    
+    mock_get.assert_called_once_with(
+        "https://example.com/feed.xml",
+        headers={
+            "If-None-Match": '"abc"',
+            "If-Modified-Since": "Sun, 13 Apr 2025 10:00:00 GMT"
+        }
+    )
+
 @patch("biofeed.feeds.feed_source.FeedParser")
 @patch.object(FeedSource, "fetch")
 def test_feed_source_get_article_by_id(mock_fetch, mock_parser):
@@ -190,3 +249,137 @@ def test_feed_source_integration(file_path, expected_count):
             for article in articles:
                 assert article.title
                 assert article.link
+
+@pytest.mark.parametrize("content,content_type,expected", [
+    (b'<?xml version="1.0"?><rss></rss>', "", "xml"),
+    (b'\xef\xbb\xbf\n  <feed></feed>', "application/octet-stream", "xml"),
+    (b'{"version": "https://jsonfeed.org/version/1.1", "items": []}', "text/plain", "json"),
+    (b'', "application/feed+json", "json"),
+    (b'', "", "xml"),
+])
+def test_sniff_format(content, content_type, expected):
+    """Test that the feed format is guessed from leading bytes and Content-Type."""
+    assert sniff_format(content, content_type) == expected
+
+@patch("biofeed.utils.http_client.get")
+def test_feed_source_json_feed_single_download(mock_get):
+    """Test that a JSON Feed is downloaded once and never handed to fastfeedparser."""
+    mock_get.return_value = _mock_response(
+        content=b'{"items": [{"title": "A", "url": "https://example.com/a"}]}',
+        headers={"Content-Type": "application/feed+json"}
+    )
+    
+    feed = FeedSource("Test Feed", "https://example.com/feed.json")
+    with patch("biofeed.feeds.feed_source.fastfeedparser") as mock_fastfeedparser:
+        articles = feed.get_articles()
+        mock_fastfeedparser.parse.assert_not_called()
+    
+    assert mock_get.call_count == 1
+    assert [article.title for article in articles] == ["A"]
+    assert set(feed.timings) == {"download", "parse"}
+
+def test_stable_article_ids():
+    """Test that article IDs don't shift when a publisher adds an entry."""
+    with open(f"{FIXTURES}/nature_20250319.xml", "rb") as f:
+        import fastfeedparser
+        feed_data = fastfeedparser.parse(f.read())
+    
+    articles = FeedParser.parse_feed(feed_data)
+    assert len({article.id for article in articles}) == len(articles)
+    
+    # Drop the newest entry, as if the feed window had moved
+    feed_data.entries = feed_data.entries[1:]
+    assert [a.id for a in FeedParser.parse_feed(feed_data)] == [a.id for a in articles[1:]]
+    
+    assert FeedParser.make_article_id(None, "https://example.com/1") == \
+        FeedParser.make_article_id(None, "https://example.com/1 ")
+    assert FeedParser.make_article_id(None, None, "Title", "2025-05-01") != \
+        FeedParser.make_article_id(None, None, "Title", "2025-05-02")
+
+def test_feed_parser_normalizes_dates_to_epoch():
+    """Test that entry dates are converted to epoch seconds at ingest."""
+    entry = SimpleNamespace(
+        title="RSS entry", link="https://example.com/rss",
+        published="Tue, 14 May 2024 10:00:00 GMT", updated="2024-05-15T10:00:00Z"
+    )
+    article = FeedParser.normalize_entry(entry)
+    assert article.published_ts == 1715680800
+    assert article.updated_ts == 1715767200
+    
+    item = {"id": "1", "title": "JSON item", "date_published": "not a date"}
+    assert FeedParser.normalize_entry(item, "json").published_ts is None
+
+@patch("biofeed.feeds.feed_source.FeedParser")
+@patch.object(FeedSource, "fetch")
+def test_feed_source_get_article_parses_once(mock_fetch, mock_parser):
+    """Test that lookups reuse the parsed feed and its ID index."""
+    mock_articles = [
+        Article(id="a1b2c3", title="Article 1", link="https://example.com/1", published=""),
+        Article(id="d4e5f6", title="Article 2", link="https://example.com/2", published=""),
+    ]
+    mock_fetch.return_value = MagicMock()
+    mock_parser.parse_feed.return_value = mock_articles
+    
+    feed = FeedSource("Test Feed", "https://example.com/feed.xml")
+    assert feed.get_article("d4e5f6").title == "Article 2"
+    assert feed.get_article("1").title == "Article 2"
+    with pytest.raises(ValueError, match="out of range"):
+        feed.get_article("5")
+    mock_parser.parse_feed.assert_called_once()
+
+@patch("biofeed.utils.http_client.get")
+def test_feed_source_caches_normalized_articles(mock_get):
+    """Test that the cache holds normalized articles, re-parsed only on new content."""
+    with open(f"{FIXTURES}/plos_20250413.xml", "rb") as f:
+        body = f.read()
+    mock_get.return_value = _mock_response(content=body)
+    
+    feed = FeedSource("Test Feed", "https://example.com/feed.xml")
+    articles = feed.get_articles()
+    cached = feed._cache.get(feed.url)
+    assert isinstance(cached, ParsedFeed)
+    assert cached.articles is articles
+    
+    with patch("biofeed.feeds.feed_source.fastfeedparser") as mock_fastfeedparser:
+        # Cache hits and unchanged bodies (without validators) are not re-parsed
+        assert feed.get_articles() is articles
+        assert feed.get_articles(force_refresh=True) is articles
+        mock_fastfeedparser.parse.assert_not_called()
+    
+    # A changed body is a new version
+    mock_get.return_value = _mock_response(content=body.replace(b"Virtual", b"Real"))
+    changed = feed.get_articles(force_refresh=True)
+    assert changed[2].title.startswith("Real")
+    assert feed._cache.get_metadata(feed.url)["version"] != cached.version
+
+@patch("biofeed.utils.http_client.get")
+def test_normalized_articles_are_written_back_to_the_cache(mock_get, tmp_path):
+    """Test that a new process loads the articles normalized by an earlier one."""
+    with open(f"{FIXTURES}/plos_20250413.xml", "rb") as f:
+        mock_get.return_value = _mock_response(content=f.read())
+    
+    feed = FeedSource("Test Feed", "https://example.com/feed.xml")
+    feed._cache = FeedCache(SQLiteCacheBackend(tmp_path / "cache.db"))
+    first = list(islice(feed.iter_articles(), 2))
+    feed._cache.close()
+    
+    # Only the first two entries were normalized, and only they are stored as articles
+    feed._cache = FeedCache(SQLiteCacheBackend(tmp_path / "cache.db"))
+    with patch.object(FeedParser, "normalize_entry", wraps=FeedParser.normalize_entry) as normalize:
+        assert list(islice(feed.iter_articles(), 2)) == first
+        assert normalize.call_count == 0
+        assert len(feed.get_articles()) == 4 and normalize.call_count == 2
+    feed._cache.close()
+    
+    feed._cache = FeedCache(SQLiteCacheBackend(tmp_path / "cache.db"))
+    assert not feed._cache.get(feed.url)._pending
+    feed._cache.close()
+
+@patch("biofeed.utils.http_client.get")
+def test_empty_feed_is_a_cache_hit(mock_get):
+    """Test that a cached feed without entries is not downloaded again."""
+    mock_get.return_value = _mock_response(content=b"<rss><channel></channel></rss>")
+    feed = FeedSource("Empty", "https://example.com/empty.xml")
+    assert feed.get_articles() == []
+    assert feed.get_articles() == []
+    assert mock_get.call_count == 1
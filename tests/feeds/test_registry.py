@@ -0,0 +1,85 @@
+"""Tests for the FeedRegistry class."""
+from unittest.mock import patch
+
+from biofeed.feeds.registry import FeedRegistry
+
+def test_refresh_intervals_are_persisted():
+  registry = FeedRegistry()
+  assert registry.update_refresh_intervals() is False
+
+  registry.get_feed("nature").cache_duration = 7200
+  assert registry.update_refresh_intervals() is True
+  assert registry.update_refresh_intervals() is False
+
+  reloaded = FeedRegistry()
+  assert reloaded.get_feed("nature").cache_duration == 7200
+  assert reloaded.get_feed("nature").base_cache_duration == 3600
+  assert reloaded.get_feed("bmc").cache_duration == 3600
+
+def test_reload_picks_up_other_processes_changes():
+  registry = FeedRegistry()
+  nature = registry.get_feed("nature")
+  other = FeedRegistry()
+  other.add_feed("new", "New Feed", "https://example.com/feed.xml")
+  other.remove_feed("bmc")
+
+  registry.reload()
+  assert "new" in registry.feeds and "bmc" not in registry.feeds
+  assert registry.get_feed("nature") is nature
+
+def test_feeds_json_is_imported_once(isolated_config, caplog):
+  registry = FeedRegistry()
+  assert "nature" in registry.feeds and (isolated_config / "feeds.db").exists()
+  assert "feeds.json is no longer read" in caplog.text
+  caplog.clear()
+  FeedRegistry()
+  assert "feeds.json" not in caplog.text
+  registry.remove_feeds(list(registry.feeds))
+  # Removing every feed doesn't bring back the imported ones
+  assert FeedRegistry().feeds == {}
+  assert "nature" in FeedRegistry("feeds.json").feeds
+
+def test_batches_and_indexed_lookups(isolated_config):
+  registry = FeedRegistry()
+  before = (isolated_config / "feeds.json").read_text()
+  registry.add_feeds(
+    (f"journal_{i}", f"Journal {i}", f"https://host{i % 10}.org/{i}.xml", "Journals" if i % 2 else "subjects")
+    for i in range(2000)
+  )
+  registry.remove_feeds([f"journal_{i}" for i in range(0, 2000, 4)] + ["unknown"])
+
+  assert len(FeedRegistry().feeds) == len(registry.feeds)
+  assert len(registry.get_feeds_by_category("journals")) == 1000
+  assert len(registry.get_feeds_by_category("SUBJECTS")) == 500
+  assert len(registry.get_feeds_by_host("host2.org")) == 100
+  assert list(registry.backend.find(category="Journals", host="host1.org"))[:2] == ["journal_1", "journal_11"]
+  # The legacy file is left alone
+  assert (isolated_config / "feeds.json").read_text() == before
+
+def test_removed_feeds_leave_the_indexes():
+  registry = FeedRegistry()
+  registry.add_feed("extra", "Extra", "https://www.nature.com/extra.rss", "Genomics")
+  assert [feed.name for feed in registry.get_feeds_by_category("genomics")] == ["Extra"]
+  registry.remove_feed("extra")
+  assert registry.get_feeds_by_category("genomics") == []
+  assert "Extra" not in [feed.name for feed in registry.get_feeds_by_host("www.nature.com")]
+
+def test_lookups_use_the_database_indexes():
+  registry = FeedRegistry()
+  registry.add_feed("extra", "Extra", "https://www.nature.com/extra.rss", "Genomics")
+  conn = registry.backend._connect()
+  for column, value in (("category_key", "genomics"), ("host", "www.nature.com")):
+    plan = conn.execute(f"EXPLAIN QUERY PLAN SELECT id FROM feeds WHERE {column} = ?", (value,)).fetchall()
+    assert "USING INDEX" in plan[0][-1]
+  # Lookups are answered by the backend, with the registry's own feed sources
+  with patch.object(registry.backend, "find", wraps=registry.backend.find) as find:
+    assert registry.get_feeds_by_category("Genomics") == [registry.feeds["extra"]]
+    assert registry.feeds["extra"] in registry.get_feeds_by_host("www.nature.com")
+  assert find.call_count == 2
+  assert FeedRegistry("feeds.json").get_feeds_by_category("genomics") == []
+
+def test_json_lookups_do_not_copy_the_config(isolated_config):
+  registry = FeedRegistry("feeds.json")
+  with patch("biofeed.utils.config.copy.deepcopy") as deepcopy:
+    assert [feed.name for feed in registry.get_feeds_by_host("www.nature.com")] == [registry.get_feed("nature").name]
+  deepcopy.assert_not_called()
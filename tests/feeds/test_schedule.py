@@ -0,0 +1,67 @@
+"""Tests for adaptive per-feed refresh intervals."""
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from biofeed.feeds.feed_source import FeedSource
+from biofeed.feeds.schedule import feed_hints, header_max_age, publish_cadence, refresh_interval
+
+@pytest.mark.parametrize("headers,expected", [
+  ({"Cache-Control": "public, max-age=1800"}, 1800),
+  ({"Cache-Control": "max-age=60, s-maxage=900"}, 60),
+  ({"Cache-Control": "no-cache"}, 0),
+  ({"Expires": "Fri, 11 Apr 2025 15:00:00 GMT", "Date": "Fri, 11 Apr 2025 14:00:00 GMT"}, 3600),
+  ({"Expires": "0"}, 0),
+  ({}, None),
+])
+def test_header_max_age(headers, expected):
+  assert header_max_age(headers) == expected
+
+def test_feed_hints():
+  rss = (b"<rss><channel><title>T</title><ttl>120</ttl>"
+         b"<skipHours><hour>1</hour><hour>2</hour></skipHours><item/></channel></rss>")
+  assert feed_hints(rss) == {"ttl": 7200, "skip_hours": [1, 2]}
+  rdf = b"<rdf:RDF><channel><sy:updatePeriod>daily</sy:updatePeriod><sy:updateFrequency>4</sy:updateFrequency>"
+  assert feed_hints(rdf) == {"ttl": 21600}
+  assert feed_hints(b"<feed></feed>") == {}
+
+def test_publish_cadence_groups_batches():
+  day = 86400
+  # Three daily issues of several articles each, published within seconds
+  timestamps = [0, 5, 10, day, day + 30, 2 * day, 2 * day + 1, None]
+  assert publish_cadence(timestamps) == day
+  assert publish_cadence([100, 110]) is None
+
+def test_refresh_interval_bounds_and_hints():
+  assert refresh_interval(default=3600) == 3600
+  # Poll about twice per publishing interval, within the bounds
+  assert refresh_interval(cadence=4 * 3600) == 2 * 3600
+  assert refresh_interval(cadence=60) == 300
+  assert refresh_interval(cadence=30 * 86400) == 86400
+  # Publisher hints are the least time to wait
+  assert refresh_interval(max_age=7200, cadence=600) == 7200
+  assert refresh_interval(ttl=3 * 3600, max_age=0) == 3 * 3600
+
+def test_refresh_interval_skips_hours():
+  midnight = 1744329600  # 2025-04-11T00:00:00Z
+  # Due at 01:30, but hours 1-3 are skipped: wait until 04:00
+  assert refresh_interval(max_age=5400, skip_hours=[1, 2, 3], now=midnight) == 4 * 3600
+
+@patch("biofeed.utils.http_client.get")
+def test_feed_source_adapts_cache_duration(mock_get):
+  with open("tests/feeds/fixtures/plos_20250413.xml", "rb") as f:
+    content = f.read()
+  mock_get.return_value = MagicMock(
+    status_code=200, content=content,
+    headers={"Content-Type": "application/atom+xml", "Cache-Control": "max-age=7200"}
+  )
+  feed = FeedSource("PLOS", "https://example.com/plos.xml")
+  feed.fetch()
+  assert feed.cache_duration >= 7200
+  assert "cadence" in feed._cache.get_metadata(feed.url)
+
+  # A 304 with a shorter lifetime still keeps the observed cadence
+  mock_get.return_value = MagicMock(status_code=304, headers={"Cache-Control": "max-age=10"})
+  cadence = feed._cache.get_metadata(feed.url)["cadence"]
+  feed.fetch(force_refresh=True)
+  assert feed.cache_duration == refresh_interval(max_age=10, cadence=cadence)
@@ -0,0 +1,75 @@
+"""Tests for the configuration store."""
+import json
+import multiprocessing
+import os
+from unittest.mock import patch
+
+from biofeed.core.controller import ReaderController
+from biofeed.feeds.registry import FeedRegistry
+from biofeed.utils import config
+from biofeed.utils.config import ConfigStore, get_config_dir, load_config, save_config, update_config
+
+def test_reads_are_cached_until_the_file_changes(isolated_config):
+  store = ConfigStore()
+  path = isolated_config / "settings.json"
+  path.write_text('{"last_feed": "nature"}')
+
+  with patch("builtins.open", wraps=open) as opened:
+    assert store.read(path)["last_feed"] == "nature"
+    store.read(path)["last_feed"] = "changed by the caller"
+    assert store.read(path)["last_feed"] == "nature"
+  assert opened.call_count == 1
+
+  # Another process replacing the file is noticed
+  other = isolated_config / "other.json"
+  other.write_text('{"last_feed": "plos"}')
+  os.replace(other, path)
+  assert store.read(path)["last_feed"] == "plos"
+
+def test_reads_never_write(isolated_config):
+  assert load_config("missing.json", default={"a": 1}) == {"a": 1}
+  (isolated_config / "corrupt.json").write_text("{not json")
+  assert load_config("corrupt.json", default={"a": 1}) == {"a": 1}
+  assert not (isolated_config / "missing.json").exists()
+  assert (isolated_config / "corrupt.json").read_text() == "{not json"
+
+def test_config_dir_is_created_once(tmp_path, monkeypatch):
+  monkeypatch.setenv("XDG_CONFIG_HOME", str(tmp_path / "fresh"))
+  with patch("pathlib.Path.mkdir") as mkdir:
+    get_config_dir()
+    get_config_dir()
+  assert mkdir.call_count == 1
+
+def test_writes_are_atomic_and_skipped_when_unchanged(isolated_config):
+  save_config("settings.json", {"last_feed": "nature"})
+  assert update_config("settings.json", lambda settings: settings.update(last_feed="nature")) is False
+  assert update_config("settings.json", lambda settings: settings.update(last_feed="plos")) is True
+  assert json.loads((isolated_config / "settings.json").read_text()) == {"last_feed": "plos"}
+  # No temporary files are left behind
+  assert not [name for name in os.listdir(isolated_config) if name.endswith(".tmp")]
+
+@patch.object(ReaderController, "_active_feed_id", return_value="nature")
+def test_selecting_the_same_feed_writes_nothing(mock_feed_id):
+  controller = ReaderController()
+  controller.select_feed("nature")
+  with patch.object(config.ConfigStore, "_write") as write:
+    controller.select_feed("nature")
+  write.assert_not_called()
+
+def _add_feeds(config_home, worker):
+  os.environ["XDG_CONFIG_HOME"] = config_home
+  config.config_store.clear()
+  for i in range(10):
+    FeedRegistry("feeds.json").add_feed(f"feed_{worker}_{i}", f"Feed {i}", f"https://example.com/{worker}/{i}.xml")
+
+def test_concurrent_processes_keep_each_others_feeds(isolated_config):
+  context = multiprocessing.get_context("spawn")
+  workers = [context.Process(target=_add_feeds, args=(str(isolated_config.parent), worker)) for worker in range(4)]
+  for worker in workers:
+    worker.start()
+  for worker in workers:
+    worker.join(30)
+  assert all(worker.exitcode == 0 for worker in workers)
+
+  feed_ids = set(FeedRegistry("feeds.json").feeds)
+  assert all(f"feed_{worker}_{i}" in feed_ids for worker in range(4) for i in range(10))
@@ -0,0 +1,24 @@
+"""Tests for the date helpers."""
+import pytest
+
+from biofeed.utils.dates import format_timestamp, parse_timestamp, to_epoch
+
+@pytest.mark.parametrize("date_str,expected", [
+  ("2025-04-11T14:00:00+00:00", 1744380000.0),
+  ("2025-04-11T14:00:00Z", 1744380000.0),
+  ("2025-04-11T16:00:00+02:00", 1744380000.0),
+  ("Fri, 11 Apr 2025 14:00:00 GMT", 1744380000.0),
+  ("Fri, 11 Apr 2025 10:00:00 -0400", 1744380000.0),
+  ("2025-04-11", 1744329600.0),
+  ("", None),
+  (None, None),
+  ("not a date", None),
+  ("April 11, 2025 14:00 UTC", 1744380000.0),
+])
+def test_parse_timestamp(date_str, expected):
+  assert parse_timestamp(date_str) == expected
+
+def test_to_epoch_and_format():
+  assert to_epoch("Fri, 11 Apr 2025 14:00:30 GMT") == 1744380030
+  assert to_epoch("2 days ago") is None
+  assert format_timestamp(1744380000) == "2025-04-11"
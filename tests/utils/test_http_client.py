@@ -0,0 +1,31 @@
+"""Tests for the shared HTTP transport."""
+from unittest.mock import patch
+
+from biofeed.utils import http_client
+
+def test_session_is_shared():
+  """Test that every caller gets the same pooled session."""
+  http_client.close()
+  session = http_client.get_session()
+  assert http_client.get_session() is session
+
+  adapter = session.get_adapter("https://www.nature.com/")
+  assert adapter is session.get_adapter("https://academic.oup.com/")
+  assert adapter._pool_maxsize == 10
+  http_client.close()
+
+def test_configure_rebuilds_session():
+  """Test that new settings apply to a fresh session."""
+  session = http_client.get_session()
+  http_client.configure(pool_maxsize=4, timeout=3)
+  try:
+    new_session = http_client.get_session()
+    assert new_session is not session
+    assert new_session.get_adapter("https://plos.org/")._pool_maxsize == 4
+
+    with patch.object(new_session, "get") as mock_get:
+      http_client.get("https://plos.org/feed")
+      mock_get.assert_called_once_with("https://plos.org/feed", timeout=3)
+  finally:
+    http_client.configure(pool_maxsize=10, timeout=10)
+    http_client.close()